@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Streaming Analysis Script
+Analyzes a very large CSV or text file in bounded micro-batches, with
+translation of one batch overlapping detection and scoring of its
+neighbours, writing results to CSV or JSON as they finish and printing
+the overall summary
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from config import Config
+from pipeline.orchestrator import run_pipelined
+from pipeline.streaming import run_streaming
+from utils.exporter import CsvStreamExporter, JsonStreamExporter
+from utils.file_handler import iter_reviews_from_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a large review file with bounded memory")
+    parser.add_argument('input', help="CSV file with a review column, or a text file with one review per line")
+    parser.add_argument('--output', default='sentiment_analysis_results.csv', help="Results file (.csv or .json)")
+    parser.add_argument('--batch-size', type=int, default=Config.STREAM_BATCH_SIZE, help="Reviews per micro-batch")
+    parser.add_argument('--sequential', action='store_true', help="Run one micro-batch at a time instead of overlapping stages")
+    parser.add_argument('--summary', default='', help="Optional JSON file for the summary")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    if not os.path.isfile(args.input):
+        print(f"❌ Input file not found: {args.input}")
+        return 1
+
+    try:
+        f = open(args.output, 'w', encoding='utf-8', newline='')
+    except OSError as e:
+        print(f"❌ Cannot write results: {e}")
+        return 1
+
+    with f:
+        exporter = (JsonStreamExporter if args.output.lower().endswith('.json') else CsvStreamExporter)(f)
+        run = run_streaming if args.sequential else run_pipelined
+        summary = run(
+            iter_reviews_from_path(args.input),
+            exporter,
+            batch_size=args.batch_size,
+            progress=lambda done: print(f"   {done} reviews analyzed", end='\r')
+        )
+        exporter.close()
+
+    print()
+    print(f"✅ {summary['total_reviews']} reviews written to {args.output}")
+    print(f"   Overall sentiment: {summary['overall_sentiment']} {summary['distribution']}")
+    print(f"   Languages: {', '.join(summary['languages_detected'])}")
+    print(f"   {summary['insights']}")
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        print(f"✅ Summary saved to {args.summary}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
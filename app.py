@@ -4,10 +4,11 @@ import json
 import pandas as pd
 from werkzeug.utils import secure_filename
 from config import Config
-from pipeline.detect import detect_language
-from pipeline.translate import translate_text
-from pipeline.sentiment import analyze_sentiment
+from pipeline.engine import create_engine
+from pipeline.translate import fill_translations
 from pipeline.summarize import generate_summary
+from pipeline.preload import preload_models, get_readiness
+from pipeline.circuit import get_breaker_status
 from utils.file_handler import process_csv_file, validate_file
 from utils.exporter import export_to_csv, export_to_json
 
@@ -16,6 +17,12 @@ from utils.exporter import export_to_csv, export_to_json
 app = Flask(__name__)
 app.config.from_object(Config)
 
+# Load models at import so `gunicorn --preload` shares them across workers.
+# Spawned detection workers re-import this script as __mp_main__ and must
+# not load the models again.
+if Config.PRELOAD_MODELS and __name__ != '__mp_main__':
+    preload_models()
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
@@ -24,6 +31,18 @@ def allowed_file(filename):
 def index():
     return render_template('index.html')
 
+@app.route('/ready')
+def ready():
+    readiness = get_readiness()
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+@app.route('/status')
+def status():
+    return jsonify({
+        'gemini_configured': bool(Config.GEMINI_API_KEY),
+        'translation_backends': get_breaker_status()
+    })
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     try:
@@ -49,31 +68,9 @@ def analyze():
         if not reviews:
             return render_template('index.html', error="Please provide reviews either through file upload or text input.")
         
-        # Process reviews through pipeline
-        results = []
-        for i, review in enumerate(reviews):
-            if not review.strip():
-                continue
-                
-            # Detect language
-            detected_lang = detect_language(review)
-            
-            # Translate if needed
-            translated_text = review
-            if detected_lang != 'en':
-                translated_text = translate_text(review, detected_lang)
-            
-            # Analyze sentiment
-            sentiment_result = analyze_sentiment(translated_text)
-            
-            results.append({
-                'id': i + 1,
-                'original_text': review,
-                'detected_language': detected_lang,
-                'translated_text': translated_text if detected_lang != 'en' else None,
-                'sentiment_label': sentiment_result['label'],
-                'confidence': sentiment_result['confidence']
-            })
+        # Dedup -> detect -> triage -> translate -> sentiment -> fan-out
+        # (direct mode defers translation to export)
+        results = create_engine().run(reviews).results
         
         # Generate overall summary
         summary = generate_summary(results)
@@ -92,6 +89,10 @@ def download(format):
         
         data = json.loads(results)
         
+        # Direct mode skipped translation during analysis
+        if Config.PIPELINE_MODE == 'direct':
+            fill_translations(data)
+        
         if format == 'csv':
             output = export_to_csv(data)
             return send_file(
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Inference Autotune Script
+Benchmarks the sentiment and translation models across thread counts and
+batch sizes and saves the fastest settings as the inference profile
+"""
+
+import argparse
+import logging
+import os
+import sys
+from config import Config
+from pipeline.detect import detect_language
+from pipeline.tuning import autotune, save_inference_profile
+
+def parse_grid(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+def default_thread_grid():
+    cores = os.cpu_count() or 1
+    grid = [1]
+    while grid[-1] * 2 <= cores:
+        grid.append(grid[-1] * 2)
+    if grid[-1] != cores:
+        grid.append(cores)
+    return ','.join(str(threads) for threads in grid)
+
+def main():
+    parser = argparse.ArgumentParser(description="Autotune CPU inference settings")
+    parser.add_argument('--sample', default='test_data/sample_reviews.txt', help="Corpus with one review per line")
+    parser.add_argument('--threads', default=default_thread_grid(), help="Intra-op thread counts, comma separated")
+    parser.add_argument('--interop-threads', default='1,2', help="Inter-op thread counts, comma separated")
+    parser.add_argument('--batch-sizes', default='1,8,16,32,64', help="Batch sizes, comma separated")
+    parser.add_argument('--langs', default='', help="Only benchmark translation for these languages (default: all detected)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per setting")
+    parser.add_argument('--output', default=Config.INFERENCE_PROFILE_PATH, help="Where to write the profile")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    try:
+        with open(args.sample, encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+    except OSError as e:
+        print(f"❌ Cannot read sample corpus: {e}")
+        return 1
+    if not texts:
+        print(f"❌ Sample corpus {args.sample} is empty")
+        return 1
+    
+    wanted_langs = {lang.strip() for lang in args.langs.split(',') if lang.strip()}
+    texts_by_lang = {}
+    for text in texts:
+        lang = detect_language(text)
+        if lang != 'en' and (not wanted_langs or lang in wanted_langs):
+            texts_by_lang.setdefault(lang, []).append(text)
+    
+    print(f"🔧 Autotuning on {len(texts)} reviews, translation languages: {sorted(texts_by_lang) or 'none'}")
+    profile = autotune(
+        texts,
+        texts_by_lang,
+        parse_grid(args.threads),
+        parse_grid(args.interop_threads),
+        parse_grid(args.batch_sizes),
+        repeat=args.repeat
+    )
+    save_inference_profile(profile, args.output)
+    
+    print(f"✅ Best: {profile['intra_op_threads']} intra-op / {profile['inter_op_threads']} inter-op threads, "
+          f"sentiment batch {profile['sentiment_batch_size']}, translation batch {profile['translation_batch_size']}")
+    print(f"✅ Profile saved to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
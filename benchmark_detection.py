@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Language Detection Benchmark Script
+Compares per-review langdetect with the vectorised batch detector on the
+sample corpus and reports speed and language agreement
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pipeline.tuning import benchmark_language_detection, benchmark_parallel_detection
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark langdetect against the batch language detector")
+    parser.add_argument('--sample', default='test_data/sample_reviews.txt', help="Corpus with one review per line")
+    parser.add_argument('--size', type=int, default=0, help="Repeat the corpus up to this many reviews (default: as is)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs of the batch detector")
+    parser.add_argument('--workers', default='', help="Also time the process pool with these worker counts, e.g. 1,2,4")
+    parser.add_argument('--output', default='', help="Optional JSON file for the full report")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR, format='%(message)s')
+
+    try:
+        with open(args.sample, encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+    except OSError as e:
+        print(f"❌ Cannot read sample corpus: {e}")
+        return 1
+
+    if not texts:
+        print("❌ The sample corpus is empty")
+        return 1
+    if args.size > len(texts):
+        texts = (texts * (args.size // len(texts) + 1))[:args.size]
+
+    report = benchmark_language_detection(texts, args.repeat)
+
+    print(f"🌍 {report['texts']} reviews")
+    for detector in ('langdetect', 'batch'):
+        stats = report[detector]
+        print(f"   {detector:10s} {stats['seconds']:8.3f}s  {stats['texts_per_second']} texts/s")
+    print(f"   speedup x{report['speedup']}, agreement {report['agreement']['overall']:.0%}")
+    for lang, stats in report['agreement']['by_language'].items():
+        print(f"   {lang:6s} {stats['texts']:6d} reviews  {stats['agreement']:.0%}")
+    for confusion, count in report['agreement']['confusions'].items():
+        print(f"   ⚠️  {confusion}: {count}")
+
+    if args.workers:
+        worker_counts = [int(count) for count in args.workers.split(',') if count.strip()]
+        report['parallel'] = benchmark_parallel_detection(texts, worker_counts)
+        print(f"⚙️  Process pool ({report['parallel']['engine']}, {os.cpu_count()} cores)")
+        for workers, stats in report['parallel']['workers'].items():
+            print(f"   {workers:3d} workers {stats['seconds']:8.3f}s  {stats['texts_per_second']} texts/s  x{stats['scaling']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report saved to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
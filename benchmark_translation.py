@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Translation Profile Benchmark Script
+Compares the default and fast (int8, greedy) Marian translation profiles
+on the sample corpus and reports speed and output agreement
+"""
+
+import argparse
+import json
+import logging
+import sys
+from config import Config
+from pipeline.detect import detect_language
+from pipeline.tuning import benchmark_translation_profiles
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the default and fast translation profiles")
+    parser.add_argument('--sample', default='test_data/sample_reviews.txt', help="Corpus with one review per line")
+    parser.add_argument('--langs', default='', help="Only benchmark these languages (default: all detected)")
+    parser.add_argument('--batch-size', type=int, default=Config.TRANSLATION_BATCH_SIZE, help="Texts per batch")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per profile")
+    parser.add_argument('--output', default='', help="Optional JSON file for the full report")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    try:
+        with open(args.sample, encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+    except OSError as e:
+        print(f"❌ Cannot read sample corpus: {e}")
+        return 1
+
+    wanted_langs = {lang.strip() for lang in args.langs.split(',') if lang.strip()}
+    texts_by_lang = {}
+    for text in texts:
+        lang = detect_language(text)
+        if lang != 'en' and (not wanted_langs or lang in wanted_langs):
+            texts_by_lang.setdefault(lang, []).append(text)
+
+    if not texts_by_lang:
+        print("❌ No non-English reviews to translate in the sample corpus")
+        return 1
+
+    reports = {}
+    for lang, lang_texts in sorted(texts_by_lang.items()):
+        try:
+            report = benchmark_translation_profiles(lang_texts, lang, args.batch_size, args.repeat)
+        except Exception as e:
+            print(f"⚠️  Skipping {lang}: {e}")
+            continue
+
+        reports[lang] = report
+        print(f"🌍 {lang} ({report['texts']} reviews, {report['model']})")
+        for profile in ('default', 'fast'):
+            stats = report[profile]
+            print(f"   {profile:8s} {stats['seconds']:8.3f}s  {stats['tokens_per_second']} tok/s  {stats['model_mb']} MB")
+        print(f"   speedup x{report['speedup']}, exact match {report['agreement']['exact_match']:.0%}, "
+              f"word similarity {report['agreement']['word_similarity']:.0%}")
+
+    if not reports:
+        print("❌ No translation model could be benchmarked")
+        return 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+        print(f"✅ Report saved to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
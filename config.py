@@ -9,7 +9,84 @@ class Config:
     
     # Model configurations
     SENTIMENT_MODEL = 'cardiffnlp/twitter-roberta-base-sentiment-latest'
+    MULTILINGUAL_SENTIMENT_MODEL = 'cardiffnlp/twitter-xlm-roberta-base-sentiment'
     TRANSLATION_MODEL = 'Helsinki-NLP/opus-mt-{}-en'
+    GEMINI_MODEL = os.environ.get('GEMINI_MODEL', 'gemini-1.5-flash-latest')
+    SENTIMENT_BACKEND = os.environ.get('SENTIMENT_BACKEND', 'torch')  # torch | onnx | onnx-int8
+    ONNX_MODEL_DIR = os.environ.get('ONNX_MODEL_DIR', 'models/sentiment-onnx')
+    
+    # Inference settings
+    SENTIMENT_BATCH_SIZE = int(os.environ.get('SENTIMENT_BATCH_SIZE', 32))
+    MAX_BATCH_TOKENS = int(os.environ.get('MAX_BATCH_TOKENS', 4096))  # Padded tokens per forward pass
+    TRANSLATION_BATCH_SIZE = int(os.environ.get('TRANSLATION_BATCH_SIZE', 16))
+    TRANSLATION_PROFILE = os.environ.get('TRANSLATION_PROFILE', 'default')  # default | fast (int8 weights, greedy decoding)
+    TRANSLATION_NUM_BEAMS = int(os.environ.get('TRANSLATION_NUM_BEAMS', 1))  # Beams in the fast profile
+    TRANSLATION_LENGTH_RATIO = float(os.environ.get('TRANSLATION_LENGTH_RATIO', 1.5))  # max_new_tokens per input token in the fast profile
+    TRANSLATION_SPLIT_SENTENCES = os.environ.get('TRANSLATION_SPLIT_SENTENCES', 'True').lower() == 'true'  # Translate long reviews sentence by sentence with Marian
+    TRANSLATION_SPLIT_MIN_CHARS = int(os.environ.get('TRANSLATION_SPLIT_MIN_CHARS', 300))  # Longer texts are translated sentence by sentence
+    TRANSLATION_SEGMENT_MAX_CHARS = int(os.environ.get('TRANSLATION_SEGMENT_MAX_CHARS', 400))  # Over-long sentences are wrapped at this length
+    TRANSLATION_MODEL_MEMORY_MB = int(os.environ.get('TRANSLATION_MODEL_MEMORY_MB', 1200))  # Budget for resident Marian models
+    SENTIMENT_CHUNKING = os.environ.get('SENTIMENT_CHUNKING', 'True').lower() == 'true'
+    SENTIMENT_WINDOW_TOKENS = int(os.environ.get('SENTIMENT_WINDOW_TOKENS', 512))
+    SENTIMENT_WINDOW_OVERLAP = int(os.environ.get('SENTIMENT_WINDOW_OVERLAP', 64))
+    
+    # Cascade: lexicon classifier first, transformer only below this confidence
+    SENTIMENT_CASCADE = os.environ.get('SENTIMENT_CASCADE', 'False').lower() == 'true'
+    CASCADE_THRESHOLD = float(os.environ.get('CASCADE_THRESHOLD', 0.7))
+    
+    # CPU threading (0 keeps the library default); autotune.py writes a profile that overrides these
+    INTRA_OP_THREADS = int(os.environ.get('INTRA_OP_THREADS', 0))
+    INTER_OP_THREADS = int(os.environ.get('INTER_OP_THREADS', 0))
+    INFERENCE_PROFILE_PATH = os.environ.get('INFERENCE_PROFILE_PATH', 'inference_profile.json')
+    
+    # Gemini client settings
+    GEMINI_API_BASE = os.environ.get('GEMINI_API_BASE', 'https://generativelanguage.googleapis.com')
+    GEMINI_MAX_CONCURRENCY = int(os.environ.get('GEMINI_MAX_CONCURRENCY', 8))
+    GEMINI_REQUESTS_PER_MINUTE = int(os.environ.get('GEMINI_REQUESTS_PER_MINUTE', 60))  # 0 disables rate limiting
+    GEMINI_TIMEOUT = float(os.environ.get('GEMINI_TIMEOUT', 30))  # Seconds per call
+    GEMINI_MAX_RETRIES = int(os.environ.get('GEMINI_MAX_RETRIES', 3))  # Retries on timeouts, 429 and 5xx
+    GEMINI_PACK_SIZE = int(os.environ.get('GEMINI_PACK_SIZE', 10))  # Reviews per request; 1 sends one prompt per review
+    GEMINI_PACK_TOKENS = int(os.environ.get('GEMINI_PACK_TOKENS', 2000))  # Estimated prompt tokens per packed request
+    
+    # Circuit breakers around translation backends
+    BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', 5))  # Consecutive failures before opening
+    BREAKER_COOLDOWN = float(os.environ.get('BREAKER_COOLDOWN', 60))  # Seconds before a half-open probe
+    
+    # Result cache settings
+    SENTIMENT_CACHE_SIZE = int(os.environ.get('SENTIMENT_CACHE_SIZE', 50000))  # 0 disables the cache
+    SENTIMENT_CACHE_DB = os.environ.get('SENTIMENT_CACHE_DB', '')  # SQLite path for a persistent tier
+    TRANSLATION_CACHE_SIZE = int(os.environ.get('TRANSLATION_CACHE_SIZE', 100000))  # 0 disables the translation memory
+    TRANSLATION_CACHE_DB = os.environ.get('TRANSLATION_CACHE_DB', '')  # SQLite path; in-memory when empty
+    TRANSLATION_CACHE_TTL = int(os.environ.get('TRANSLATION_CACHE_TTL', 30 * 24 * 3600))  # Seconds; 0 never expires
+    
+    # Streaming mode: reviews per micro-batch (bounds memory for very large inputs)
+    STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 1000))
+    STREAM_QUEUE_SIZE = int(os.environ.get('STREAM_QUEUE_SIZE', 2))  # Micro-batches buffered between overlapped stages
+    
+    # Pipeline mode: 'translate' (detect -> translate -> English sentiment) or
+    # 'direct' (score the original text with the multilingual model; translate only for display/export)
+    PIPELINE_MODE = os.environ.get('PIPELINE_MODE', 'translate')
+    
+    # Language detection: scripts used by a single language skip the statistical detector
+    DETECT_SCRIPT_FAST_PATH = os.environ.get('DETECT_SCRIPT_FAST_PATH', 'True').lower() == 'true'
+    DETECT_SCRIPT_SHARE = float(os.environ.get('DETECT_SCRIPT_SHARE', 0.5))  # Share of letters a script must exceed to decide the language
+    DETECT_ENGINE = os.environ.get('DETECT_ENGINE', 'langdetect')  # 'langdetect' or 'batch' (vectorised n-gram engine)
+    DETECT_WORKERS = int(os.environ.get('DETECT_WORKERS', 0))  # Detection processes per web worker; 0 shares the cores between WEB_CONCURRENCY workers, at most 2 each
+    DETECT_CHUNK_SIZE = int(os.environ.get('DETECT_CHUNK_SIZE', 500))  # Texts sent to a worker at a time
+    DETECT_PARALLEL_MIN_TEXTS = int(os.environ.get('DETECT_PARALLEL_MIN_TEXTS', 2000))  # Smaller uploads are detected in process
+    
+    # Pre-translation triage: pass mislabeled English through, skip languages no backend can translate
+    TRIAGE_ENABLED = os.environ.get('TRIAGE_ENABLED', 'True').lower() == 'true'
+    TRIAGE_MIN_CONFIDENCE = float(os.environ.get('TRIAGE_MIN_CONFIDENCE', 0.8))  # Detector probability below which short ASCII text counts as English
+    TRIAGE_ASCII_SHARE = float(os.environ.get('TRIAGE_ASCII_SHARE', 0.95))
+    TRIAGE_ENGLISH_SHARE = float(os.environ.get('TRIAGE_ENGLISH_SHARE', 0.3))  # Share of English function words that marks text as English
+    TRIAGE_ENGLISH_MIN_WORDS = int(os.environ.get('TRIAGE_ENGLISH_MIN_WORDS', 4))  # Confidently detected text needs this many words to count as English
+    TRIAGE_ENGLISH_MIN_MARKERS = int(os.environ.get('TRIAGE_ENGLISH_MIN_MARKERS', 2))  # ...and this many distinct English function words
+    
+    # Model preloading (load before workers fork so they share weights)
+    WEB_CONCURRENCY = max(int(os.environ.get('WEB_CONCURRENCY', 1)), 1)  # Web worker processes (read by gunicorn as its default -w)
+    PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', 'False').lower() == 'true'
+    PRELOAD_TRANSLATION_LANGS = [lang.strip() for lang in os.environ.get('PRELOAD_TRANSLATION_LANGS', '').split(',') if lang.strip()]
     
     # File upload settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
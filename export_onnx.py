@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+ONNX Export Script
+Exports the locally cached sentiment model to ONNX (plus an int8 copy)
+for SENTIMENT_BACKEND=onnx / onnx-int8
+"""
+
+import argparse
+import sys
+from config import Config
+from pipeline.onnx_backend import export_sentiment_model
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the sentiment model to ONNX")
+    parser.add_argument('--model', default=None, help="Model id or path, must be cached locally (default: the model for PIPELINE_MODE)")
+    parser.add_argument('--output-dir', default=Config.ONNX_MODEL_DIR, help="Directory for the exported artefacts")
+    parser.add_argument('--no-quantize', action='store_true', help="Skip writing the int8-quantised model")
+    args = parser.parse_args()
+    
+    print(f"📦 Exporting {args.model or 'the configured sentiment model'} to {args.output_dir}")
+    try:
+        written = export_sentiment_model(args.model, args.output_dir, quantize=not args.no_quantize)
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        return 1
+    
+    for path in written:
+        print(f"✅ Wrote {path}")
+    print("Set SENTIMENT_BACKEND=onnx or SENTIMENT_BACKEND=onnx-int8 to use it.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
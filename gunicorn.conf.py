@@ -0,0 +1,12 @@
+# Gunicorn settings for the Flask app, picked up by `gunicorn app:app`
+import os
+from config import Config
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = Config.WEB_CONCURRENCY
+
+# Import app.py once in the master, so with PRELOAD_MODELS=true the workers share one copy of the weights
+preload_app = True
+
+# Large uploads are analyzed inside the request
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))
@@ -0,0 +1,155 @@
+import logging
+from itertools import islice
+from config import Config
+
+# Token windows read ahead and length-sorted together by schedule_windows
+WINDOW_POOL_SIZE = 256
+
+def token_lengths(texts, tokenizer=None):
+    """
+    Measure the token length of each text.
+
+    Args:
+        texts (list): Texts to measure
+        tokenizer: Hugging Face tokenizer used by the target model (optional)
+
+    Returns:
+        list: Token count per text, in input order
+    """
+    if tokenizer is not None:
+        try:
+            encoded = tokenizer(list(texts), add_special_tokens=True, truncation=False)
+            lengths = [len(ids) for ids in encoded['input_ids']]
+            if len(lengths) == len(texts):
+                return lengths
+        except Exception as e:
+            logging.warning(f"Tokenizer length measurement failed, estimating instead: {e}")
+
+    # Rough estimate: subword tokenizers produce ~1.3 tokens per word
+    return [int(len(text.split()) * 1.3) + 2 for text in texts]
+
+def schedule_batches(lengths, max_tokens=None, max_batch_size=None):
+    """
+    Group items into length-sorted batches under a padded token budget.
+
+    Items are sorted by length so each batch holds texts of similar size,
+    and a batch is closed once padding every member to its longest one
+    would exceed max_tokens. An item longer than the budget gets a batch
+    of its own.
+
+    Args:
+        lengths (list): Token length of each item
+        max_tokens (int): Padded tokens allowed per batch (defaults to Config.MAX_BATCH_TOKENS)
+        max_batch_size (int): Upper bound on items per batch (optional)
+
+    Returns:
+        list: Batches, each a list of indices into lengths
+    """
+    max_tokens = max_tokens or Config.MAX_BATCH_TOKENS
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+
+    batches = []
+    batch = []
+    longest = 0
+    for i in order:
+        length = max(lengths[i], 1)
+        padded_cost = (len(batch) + 1) * max(longest, length)
+        full = max_batch_size is not None and len(batch) >= max_batch_size
+        if batch and (padded_cost > max_tokens or full):
+            batches.append(batch)
+            batch = []
+            longest = 0
+        batch.append(i)
+        longest = max(longest, length)
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+def run_in_batches(items, process_batch, lengths, max_tokens=None, max_batch_size=None):
+    """
+    Run process_batch over token-budgeted batches and restore input order.
+
+    Args:
+        items (list): Items to process
+        process_batch (callable): Takes a list of items, returns one result per item
+        lengths (list): Token length of each item
+        max_tokens (int): Padded tokens allowed per batch
+        max_batch_size (int): Upper bound on items per batch (optional)
+
+    Returns:
+        list: Results in the same order as items
+    """
+    results = [None] * len(items)
+    for batch in schedule_batches(lengths, max_tokens, max_batch_size):
+        outputs = process_batch([items[i] for i in batch])
+        for i, output in zip(batch, outputs):
+            results[i] = output
+    return results
+
+def plan_windows(texts, tokenizer, window_tokens, overlap, max_windows=None, chunk_size=64):
+    """
+    Tokenise texts once and yield their model-ready token windows lazily.
+
+    Texts are tokenised chunk_size at a time, and each text's token ids
+    are sliced into overlapping windows that fit the model's input limit,
+    each wrapped in the special tokens the tokenizer added. Short texts become a single
+    window. Windows are produced as they are consumed, so only one chunk
+    of token ids is held at a time.
+
+    Args:
+        texts (list): Texts to split
+        tokenizer: Hugging Face tokenizer of the target model
+        window_tokens (int): Max tokens per window, special tokens included
+        overlap (int): Tokens shared by consecutive windows
+        max_windows (int): Keep only this many windows per text, e.g. 1 to
+            truncate instead of splitting (default: no limit)
+        chunk_size (int): Texts tokenised per tokenizer call
+
+    Yields:
+        tuple: (text index, input ids) for each window
+    """
+    special = tokenizer.num_special_tokens_to_add()
+    limit = min(window_tokens, tokenizer.model_max_length) - special
+    stride = max(limit - overlap, 1)
+
+    for first in range(0, len(texts), chunk_size):
+        encoded = tokenizer(
+            list(texts[first:first + chunk_size]),
+            add_special_tokens=True, return_special_tokens_mask=True, truncation=False
+        )
+        for i, (ids, mask) in enumerate(zip(encoded['input_ids'], encoded['special_tokens_mask']), first):
+            # The model's own special tokens wrap every window
+            head = next((j for j, flag in enumerate(mask) if not flag), len(ids))
+            tail = next((j for j in range(len(ids), head, -1) if not mask[j - 1]), head)
+            prefix, content, suffix = ids[:head], ids[head:tail], ids[tail:]
+            for count, start in enumerate(range(0, max(len(content), 1), stride), 1):
+                yield i, prefix + content[start:start + limit] + suffix
+                if start + limit >= len(content) or count == max_windows:
+                    break
+
+def schedule_windows(windows, max_tokens=None, max_batch_size=None, pool_size=WINDOW_POOL_SIZE):
+    """
+    Group a stream of token windows into token-budgeted batches.
+
+    Up to pool_size windows are read ahead and grouped with
+    schedule_batches, so batches still hold windows of similar length
+    while memory stays bounded however many windows the stream yields.
+
+    Args:
+        windows (iterable): (text index, input ids) tuples, e.g. from plan_windows
+        max_tokens (int): Padded tokens allowed per batch (defaults to Config.MAX_BATCH_TOKENS)
+        max_batch_size (int): Upper bound on windows per batch (optional)
+        pool_size (int): Windows read ahead for length sorting
+
+    Yields:
+        list: Next batch of (text index, input ids) tuples
+    """
+    windows = iter(windows)
+    while True:
+        pool = list(islice(windows, pool_size))
+        if not pool:
+            return
+        for batch in schedule_batches([len(ids) for _, ids in pool], max_tokens, max_batch_size):
+            yield [pool[i] for i in batch]
@@ -0,0 +1,336 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+def normalize_text(text):
+    """
+    Normalise text for cache keys.
+
+    Unicode is NFC-normalised and whitespace is collapsed; case is kept
+    because the sentiment model is case-sensitive.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        str: Normalised text
+    """
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+def cache_key(text, namespace):
+    """
+    Build a content-addressed key for a text under a namespace.
+
+    Args:
+        text (str): Input text
+        namespace (str): Model identity the result belongs to
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    payload = f"{namespace}\0{normalize_text(text)}".encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+class ResultCache:
+    """
+    Two-tier cache of per-text model results.
+
+    Results live in a size-bounded in-process LRU and, when db_path is
+    set, in a SQLite table that survives restarts. Entries belong to a
+    namespace (the model identity); binding a different namespace drops
+    everything cached for the previous one.
+    """
+
+    def __init__(self, max_size=10000, db_path=None, table='results'):
+        self.max_size = max_size
+        self.table = table
+        self.namespace = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if db_path:
+            try:
+                directory = os.path.dirname(db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    "(key TEXT PRIMARY KEY, namespace TEXT NOT NULL, value TEXT NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Result cache database unavailable, using memory only: {e}")
+                self._db = None
+
+    def bind(self, namespace):
+        """Switch to a namespace, invalidating entries from any other one."""
+        with self._lock:
+            if namespace == self.namespace:
+                return
+            self.namespace = namespace
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self.table} WHERE namespace != ?", (namespace,))
+                self._db.commit()
+
+    def get_many(self, texts):
+        """
+        Look up cached results for many texts.
+
+        Args:
+            texts (list): Texts to look up
+
+        Returns:
+            dict: Index into texts -> cached result, for hits only
+        """
+        found = {}
+        missing = {}
+        with self._lock:
+            for i, text in enumerate(texts):
+                key = cache_key(text, self.namespace)
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[i] = json.loads(self._memory[key])
+                else:
+                    missing.setdefault(key, []).append(i)
+
+            if missing and self._db is not None:
+                keys = list(missing)
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, value in rows:
+                        self._remember(key, value)
+                        for i in missing.pop(key):
+                            found[i] = json.loads(value)
+                            self.disk_hits += 1
+
+            self.hits += len(found)
+            self.misses += sum(len(indices) for indices in missing.values())
+
+        return found
+
+    def put_many(self, texts, results):
+        """
+        Store results for many texts.
+
+        Args:
+            texts (list): Texts that were scored
+            results (list): Result per text
+        """
+        rows = []
+        with self._lock:
+            for text, result in zip(texts, results):
+                key = cache_key(text, self.namespace)
+                value = json.dumps(result)
+                self._remember(key, value)
+                rows.append((key, self.namespace, value))
+
+            if rows and self._db is not None:
+                self._db.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, namespace, value) VALUES (?, ?, ?)", rows
+                )
+                self._db.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the current LRU size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'size': len(self._memory)
+            }
+
+    def clear(self):
+        """Drop all cached entries and reset counters."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.misses = self.disk_hits = 0
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self.table}")
+                self._db.commit()
+
+    def _remember(self, key, value):
+        # Values are kept serialised so callers never share a mutable result
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+class TranslationMemory:
+    """
+    SQLite store of translations shared by every translation backend.
+
+    Entries are keyed by backend, model, source language and normalised
+    text, so output from one backend or model is never served for
+    another. Entries expire after ttl seconds and, once the store holds
+    more than max_entries, the least recently used ones are evicted.
+    Without a db_path the store lives in memory for the life of the
+    process.
+    """
+
+    def __init__(self, db_path=None, max_entries=100000, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        try:
+            if db_path:
+                directory = os.path.dirname(db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path or ':memory:', check_same_thread=False)
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"Translation memory database unavailable, using memory only: {e}")
+            self._db = sqlite3.connect(':memory:', check_same_thread=False)
+
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS translation_memory "
+            "(key TEXT PRIMARY KEY, backend TEXT NOT NULL, model TEXT NOT NULL, source_lang TEXT NOT NULL, "
+            "translation TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS translation_memory_accessed ON translation_memory (accessed_at)")
+        self._db.commit()
+
+    def get_many(self, texts, source_langs, backend, model):
+        """
+        Look up translations for many texts in one query.
+
+        Args:
+            texts (list): Source texts
+            source_langs (list): Source language code for each text
+            backend (str): Translation backend (e.g. 'gemini', 'huggingface')
+            model (str): Model identity within the backend
+
+        Returns:
+            dict: Index into texts -> cached translation, for hits only
+        """
+        missing = {}
+        for i, (text, lang) in enumerate(zip(texts, source_langs)):
+            missing.setdefault(self._key(text, lang, backend, model), []).append(i)
+
+        found = {}
+        now = time.time()
+        with self._lock:
+            keys = list(missing)
+            hit_keys = []
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, translation, created_at FROM translation_memory WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, translation, created_at in rows:
+                    if self.ttl and now - created_at > self.ttl:
+                        continue
+                    hit_keys.append((now, key))
+                    for i in missing[key]:
+                        found[i] = translation
+
+            if hit_keys:
+                self._db.executemany("UPDATE translation_memory SET accessed_at = ? WHERE key = ?", hit_keys)
+                self._db.commit()
+
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+
+        return found
+
+    def put_many(self, texts, source_langs, translations, backend, model):
+        """
+        Store translations for many texts.
+
+        Args:
+            texts (list): Source texts
+            source_langs (list): Source language code for each text
+            translations (list): Translation per text
+            backend (str): Translation backend
+            model (str): Model identity within the backend
+        """
+        now = time.time()
+        rows = [
+            (self._key(text, lang, backend, model), backend, model, lang, translation, now, now)
+            for text, lang, translation in zip(texts, source_langs, translations)
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO translation_memory "
+                "(key, backend, model, source_lang, translation, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def get(self, text, source_lang, backend, model):
+        """Look up a single translation, or None on a miss."""
+        return self.get_many([text], [source_lang], backend, model).get(0)
+
+    def put(self, text, source_lang, translation, backend, model):
+        """Store a single translation."""
+        self.put_many([text], [source_lang], [translation], backend, model)
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the number of stored entries."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            size = self._db.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'size': size
+            }
+
+    def clear(self):
+        """Drop all stored translations and reset counters."""
+        with self._lock:
+            self._db.execute("DELETE FROM translation_memory")
+            self._db.commit()
+            self.hits = self.misses = self.evictions = 0
+
+    def _key(self, text, source_lang, backend, model):
+        return cache_key(text, f"{backend}\0{model}\0{source_lang}")
+
+    def _evict(self, now):
+        removed = 0
+        if self.ttl:
+            removed += self._db.execute(
+                "DELETE FROM translation_memory WHERE created_at < ?", (now - self.ttl,)
+            ).rowcount
+
+        size = self._db.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+        if size > self.max_entries:
+            # Least recently used first
+            removed += self._db.execute(
+                "DELETE FROM translation_memory WHERE key IN "
+                "(SELECT key FROM translation_memory ORDER BY accessed_at LIMIT ?)",
+                (size - self.max_entries,)
+            ).rowcount
+
+        self.evictions += removed
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from config import Config
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Breakers by backend name, created on first use
+breakers = {}
+_breakers_lock = threading.Lock()
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one translation backend.
+
+    After failure_threshold consecutive failures the circuit opens and
+    callers skip the backend. Once cooldown seconds have passed a single
+    probe request is let through (half-open): success closes the circuit,
+    failure opens it for another cool-down.
+    """
+
+    def __init__(self, name, failure_threshold=None, cooldown=None, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.BREAKER_FAILURE_THRESHOLD
+        self.cooldown = Config.BREAKER_COOLDOWN if cooldown is None else cooldown
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def available(self):
+        """
+        Check whether a request would currently be let through, without claiming it.
+
+        Returns:
+            bool: False while the circuit is open and cooling down or a probe is running
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                return self.clock() - self.opened_at >= self.cooldown
+            return not self.probe_in_flight
+
+    def allow_request(self):
+        """
+        Claim permission for one request.
+
+        Returns:
+            bool: True if the request may go to the backend
+        """
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Record a successful request, closing the circuit."""
+        with self._lock:
+            if self.state != CLOSED:
+                logging.info(f"Translation backend {self.name} recovered, closing circuit")
+            self.state = CLOSED
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        """Record a failed request, opening the circuit at the threshold or after a failed probe."""
+        with self._lock:
+            self.failures += 1
+            self.probe_in_flight = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                if self.state == CLOSED:
+                    self.trips += 1
+                logging.warning(f"Translation backend {self.name} failing, opening circuit for {self.cooldown}s")
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+    def status(self):
+        """Return the breaker state and counters."""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.cooldown - (self.clock() - self.opened_at)), 1)
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'retry_in_seconds': retry_in
+            }
+
+def get_breaker(name):
+    """
+    Get the shared breaker for a backend, creating it on first use.
+
+    Args:
+        name (str): Backend name (e.g. 'gemini' or a Marian model name)
+
+    Returns:
+        CircuitBreaker: Breaker for the backend
+    """
+    with _breakers_lock:
+        if name not in breakers:
+            breakers[name] = CircuitBreaker(name)
+        return breakers[name]
+
+def get_breaker_status():
+    """
+    Report the state of every translation backend breaker.
+
+    Returns:
+        dict: Backend name -> breaker status
+    """
+    with _breakers_lock:
+        current = dict(breakers)
+    return {name: breaker.status() for name, breaker in sorted(current.items())}
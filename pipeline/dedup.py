@@ -0,0 +1,62 @@
+from pipeline.cache import normalize_text
+
+def dedupe_reviews(reviews):
+    """
+    Collapse reviews that are identical after normalisation.
+
+    Args:
+        reviews (list): Review texts
+
+    Returns:
+        tuple: (unique reviews in first-seen order, index into the unique
+            list for every input review)
+    """
+    positions = {}
+    unique = []
+    index_map = []
+
+    for review in reviews:
+        key = normalize_text(review)
+        if key not in positions:
+            positions[key] = len(unique)
+            unique.append(review)
+        index_map.append(positions[key])
+
+    return unique, index_map
+
+def fan_out(unique_results, index_map, row_ids, reviews):
+    """
+    Copy results for unique reviews back to every original row.
+
+    Args:
+        unique_results (list): Result record per unique review
+        index_map (list): Unique index for each row (from dedupe_reviews)
+        row_ids (list): Result id for each row
+        reviews (list): Original review text for each row
+
+    Returns:
+        list: One result record per row, in row order
+    """
+    return [
+        {'id': row_id, **unique_results[unique_index], 'original_text': review}
+        for row_id, unique_index, review in zip(row_ids, index_map, reviews)
+    ]
+
+def get_dedup_stats(reviews):
+    """
+    Measure how many reviews are duplicates.
+
+    Args:
+        reviews (list): Review texts
+
+    Returns:
+        dict: Total, unique and duplicate counts and the duplicate percentage
+    """
+    total = len(reviews)
+    unique = len({normalize_text(review) for review in reviews})
+    return {
+        'total_reviews': total,
+        'unique_reviews': unique,
+        'duplicate_reviews': total - unique,
+        'dedup_ratio': round((total - unique) / total * 100, 1) if total else 0.0
+    }
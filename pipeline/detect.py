@@ -1,9 +1,30 @@
-from langdetect import detect, DetectorFactory
+from langdetect import detect, detect_langs, DetectorFactory
 import logging
+from config import Config
+from pipeline.scripts import classify_script
 
 # Set seed for consistent results
 DetectorFactory.seed = 0
 
+# Vectorised n-gram detector, built on first batch call
+batch_detector = None
+
+def detect_by_script(text):
+    """
+    Decide the language from the text's script when only one language uses it.
+    
+    Args:
+        text (str): Input text to analyze
+        
+    Returns:
+        tuple: (language code, share of letters in that script), or None
+            when the fast path is off or the script is shared (e.g. Latin,
+            Cyrillic, Arabic or Han without kana)
+    """
+    if not Config.DETECT_SCRIPT_FAST_PATH or not text:
+        return None
+    return classify_script(text, Config.DETECT_SCRIPT_SHARE)
+
 def detect_language(text):
     """
     Detect the language of the given text.
@@ -15,6 +36,10 @@ def detect_language(text):
         str: Language code (e.g., 'en', 'es', 'fr')
     """
     try:
+        by_script = detect_by_script(text)
+        if by_script:
+            return by_script[0]
+        
         if not text or len(text.strip()) < 3:
             return 'en'  # Default to English for very short texts
         
@@ -24,6 +49,108 @@ def detect_language(text):
         logging.warning(f"Language detection failed for text: {text[:50]}... Error: {e}")
         return 'en'  # Default to English if detection fails
 
+def detect_language_probabilities(text):
+    """
+    Detect the candidate languages of the given text with their probabilities.
+    
+    Args:
+        text (str): Input text to analyze
+        
+    Returns:
+        list: (language code, probability) pairs, most likely first (as
+            langdetect's detect_langs); [('en', 0.0)] when the text is too
+            short or detection fails and 'en' is assumed
+    """
+    try:
+        by_script = detect_by_script(text)
+        if by_script:
+            return [by_script]
+        
+        if not text or len(text.strip()) < 3:
+            return [('en', 0.0)]
+        
+        return [(language.lang, language.prob) for language in detect_langs(text)]
+    except Exception as e:
+        logging.warning(f"Language detection failed for text: {text[:50]}... Error: {e}")
+        return [('en', 0.0)]
+
+def detect_language_probability(text):
+    """
+    Detect the language of the given text along with the detector's confidence.
+    
+    Args:
+        text (str): Input text to analyze
+        
+    Returns:
+        tuple: (language code, probability); probability is 0.0 when the
+            text is too short or detection fails and 'en' is assumed
+    """
+    return detect_language_probabilities(text)[0]
+
+def get_batch_detector():
+    """
+    Get the shared vectorised detector, building it on first use.
+    
+    Returns:
+        NgramLanguageDetector: Detector over langdetect's language profiles
+    """
+    global batch_detector
+    if batch_detector is None:
+        from pipeline.langid import NgramLanguageDetector
+        batch_detector = NgramLanguageDetector.from_profiles()
+    return batch_detector
+
+def detect_languages_batch_probability(texts):
+    """
+    Detect the language of many texts, with probabilities, in one vectorised pass.
+    
+    Texts in single-language scripts are decided by the script fast path;
+    the rest are scored against langdetect's n-gram profiles at once with
+    NumPy.
+    
+    Args:
+        texts (list): Input texts to analyze
+        
+    Returns:
+        list: (language code, probability) per text; ('en', 0.0) for very
+            short texts
+    """
+    results = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        results[i] = detect_by_script(text)
+        if results[i] is None:
+            pending.append(i)
+    
+    if not pending:
+        return results
+    
+    try:
+        detector = get_batch_detector()
+        probabilities, counts = detector.probabilities([texts[i] for i in pending])
+        for i, row, count in zip(pending, probabilities, counts):
+            best = row.argmax()
+            results[i] = (detector.languages[best], round(float(row[best]), 3)) if count else ('en', 0.0)
+    except Exception as e:
+        logging.warning(f"Batch language detection failed, detecting one text at a time. Error: {e}")
+        for i in pending:
+            results[i] = detect_language_probability(texts[i])
+    return results
+
+def detect_languages_batch(texts):
+    """
+    Detect the language of many texts in one vectorised pass.
+    
+    Returns the same language codes as detect_language.
+    
+    Args:
+        texts (list): Input texts to analyze
+        
+    Returns:
+        list: Language code per text ('en' for very short texts)
+    """
+    return [lang for lang, _ in detect_languages_batch_probability(texts)]
+
 def get_language_name(lang_code):
     """
     Convert language code to full language name.
@@ -43,6 +170,8 @@ def get_language_name(lang_code):
         'pt': 'Portuguese',
         'ru': 'Russian',
         'zh': 'Chinese',
+        'zh-cn': 'Chinese',
+        'zh-tw': 'Chinese',
         'ja': 'Japanese',
         'ko': 'Korean',
         'ar': 'Arabic',
@@ -0,0 +1,135 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from config import Config
+from pipeline.detect import detect_language_probability, detect_languages_batch_probability, get_batch_detector
+
+# Upper bound on an automatically sized pool, so torch keeps cores for inference
+DEFAULT_MAX_WORKERS = 2
+
+# Worker processes shared by every request, started on the first large upload
+detection_pool = None
+detection_pool_workers = 0
+pool_lock = threading.Lock()
+
+def init_detection_worker(engine):
+    """
+    Load the detector profiles once when a worker process starts.
+
+    Args:
+        engine (str): 'langdetect' or 'batch'
+    """
+    if engine == 'batch':
+        get_batch_detector()
+    else:
+        from langdetect.detector_factory import init_factory
+        init_factory()
+
+def detect_chunk(texts, engine):
+    """
+    Detect the language of one chunk of texts inside a worker.
+
+    Args:
+        texts (list): Texts to analyze
+        engine (str): 'langdetect' or 'batch'
+
+    Returns:
+        list: (language code, probability) per text
+    """
+    if engine == 'batch':
+        return detect_languages_batch_probability(texts)
+    return [detect_language_probability(text) for text in texts]
+
+def default_detection_workers():
+    """
+    Size the pool when Config.DETECT_WORKERS is not set.
+
+    Every web worker process starts its own pool, so the cores are shared
+    out between Config.WEB_CONCURRENCY processes, with at most
+    DEFAULT_MAX_WORKERS each.
+
+    Returns:
+        int: Worker processes for this process's pool
+    """
+    return max(1, min(DEFAULT_MAX_WORKERS, (os.cpu_count() or 1) // Config.WEB_CONCURRENCY))
+
+def get_detection_pool(workers):
+    """
+    Get the shared detection pool, starting it on first use.
+
+    Args:
+        workers (int): Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor: Pool whose workers have the profiles loaded
+    """
+    global detection_pool, detection_pool_workers
+    with pool_lock:
+        if detection_pool is None or detection_pool_workers != workers:
+            if detection_pool is not None:
+                detection_pool.shutdown(wait=False, cancel_futures=True)
+            detection_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_detection_worker,
+                initargs=(Config.DETECT_ENGINE,)
+            )
+            detection_pool_workers = workers
+        return detection_pool
+
+def shutdown_detection_pool():
+    """Stop the shared detection pool's worker processes."""
+    global detection_pool, detection_pool_workers
+    with pool_lock:
+        if detection_pool is not None:
+            detection_pool.shutdown(wait=False, cancel_futures=True)
+        detection_pool = None
+        detection_pool_workers = 0
+
+atexit.register(shutdown_detection_pool)
+
+def detect_languages_parallel(texts, workers=None, chunk_size=None, progress=None):
+    """
+    Detect the language of many texts across worker processes.
+
+    Language detection is CPU-bound Python that holds the GIL, so large
+    uploads are cut into chunks and spread over a process pool whose
+    workers each load the detector profiles once. Small uploads, or a
+    pool of one, run in this process instead.
+
+    Args:
+        texts (list): Texts to analyze
+        workers (int): Worker processes (defaults to Config.DETECT_WORKERS,
+            or default_detection_workers() when that is 0)
+        chunk_size (int): Texts per task (defaults to Config.DETECT_CHUNK_SIZE)
+        progress (callable): Called with (texts done, total) as chunks finish (optional)
+
+    Returns:
+        list: (language code, probability) per text, in input order
+    """
+    workers = workers or Config.DETECT_WORKERS or default_detection_workers()
+    chunk_size = chunk_size or Config.DETECT_CHUNK_SIZE
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+
+    results = []
+    if workers > 1 and len(chunks) > 1 and len(texts) >= Config.DETECT_PARALLEL_MIN_TEXTS:
+        try:
+            pool = get_detection_pool(workers)
+            for chunk_results in pool.map(detect_chunk, chunks, [Config.DETECT_ENGINE] * len(chunks)):
+                results.extend(chunk_results)
+                if progress:
+                    progress(len(results), len(texts))
+            return results
+        except Exception as e:
+            logging.warning(f"Parallel language detection failed, detecting in process. Error: {e}")
+            shutdown_detection_pool()
+            results = []
+
+    for chunk in chunks:
+        results.extend(detect_chunk(chunk, Config.DETECT_ENGINE))
+        if progress:
+            progress(len(results), len(texts))
+    return results
@@ -0,0 +1,254 @@
+import time
+from config import Config
+from pipeline.dedup import dedupe_reviews, fan_out
+from pipeline.detect_pool import detect_languages_parallel
+from pipeline.sentiment import analyze_sentiment_batch
+from pipeline.translate import gemini_available
+from pipeline.triage import triage_reviews, translate_triaged
+
+class PipelineBatch:
+    """
+    Reviews moving through the pipeline together, with each stage's output.
+    """
+
+    def __init__(self, reviews, first_id=1):
+        """
+        Args:
+            reviews (list): Review texts, one per input row
+            first_id (int): Result id of the first row
+        """
+        self.reviews = reviews
+        self.first_id = first_id
+        self.rows = []
+        self.unique_reviews = []
+        self.index_map = []
+        self.detections = []
+        self.decisions = []
+        self.translations = []
+        self.records = []
+        self.results = []
+        self.timings = {}
+
+class Stage:
+    """
+    One step of the pipeline, run over a whole batch at once.
+
+    Subclasses set name and implement run(batch), reading earlier stages'
+    fields from the batch and writing their own.
+    """
+
+    name = 'stage'
+
+    def run(self, batch):
+        """
+        Args:
+            batch (PipelineBatch): Batch to process in place
+        """
+        raise NotImplementedError
+
+class DedupStage(Stage):
+    """Drop blank rows and collapse duplicate reviews."""
+
+    name = 'dedup'
+
+    def run(self, batch):
+        batch.rows = [
+            (batch.first_id + i, review) for i, review in enumerate(batch.reviews) if review.strip()
+        ]
+        batch.unique_reviews, batch.index_map = dedupe_reviews([review for _, review in batch.rows])
+
+class DetectStage(Stage):
+    """Detect the language of every unique review."""
+
+    name = 'detect'
+
+    def __init__(self, progress=None):
+        """
+        Args:
+            progress (callable): Called with (texts done, total) (optional)
+        """
+        self.progress = progress
+
+    def run(self, batch):
+        batch.detections = detect_languages_parallel(batch.unique_reviews, progress=self.progress)
+
+class TriageStage(Stage):
+    """Decide which reviews need translation."""
+
+    name = 'triage'
+
+    def run(self, batch):
+        batch.decisions = triage_reviews(batch.unique_reviews, batch.detections, gemini_available())
+
+class TranslateStage(Stage):
+    """Translate the reviews triaged for translation and build result records."""
+
+    name = 'translate'
+
+    def __init__(self, enabled=None):
+        """
+        Args:
+            enabled (bool): Whether to translate (defaults to every mode but 'direct')
+        """
+        self.enabled = Config.PIPELINE_MODE != 'direct' if enabled is None else enabled
+
+    def run(self, batch):
+        batch.translations = [None] * len(batch.unique_reviews)
+        if self.enabled:
+            batch.translations = translate_triaged(batch.unique_reviews, batch.decisions)
+
+        batch.records = [
+            {
+                'original_text': review,
+                'detected_language': 'en' if decision['action'] == 'passthrough' else decision['detected_language'],
+                'translated_text': translated_text,
+                'triage': decision
+            }
+            for review, decision, translated_text in zip(batch.unique_reviews, batch.decisions, batch.translations)
+        ]
+
+class SentimentStage(Stage):
+    """Score sentiment for every record in one batched call."""
+
+    name = 'sentiment'
+
+    def run(self, batch):
+        sentiment_results = analyze_sentiment_batch([
+            record['original_text'] if Config.PIPELINE_MODE == 'direct' else record['translated_text'] or record['original_text']
+            for record in batch.records
+        ])
+        for record, sentiment_result in zip(batch.records, sentiment_results):
+            record['sentiment_label'] = sentiment_result['label']
+            record['confidence'] = sentiment_result['confidence']
+            if 'tier' in sentiment_result:
+                record['sentiment_tier'] = sentiment_result['tier']
+
+class FanOutStage(Stage):
+    """Copy each unique review's record back to every row with that review."""
+
+    name = 'fan_out'
+
+    def run(self, batch):
+        batch.results = fan_out(
+            batch.records, batch.index_map,
+            [row_id for row_id, _ in batch.rows], [review for _, review in batch.rows]
+        )
+
+class PipelineEngine:
+    """
+    Run reviews through a list of stages, each over the whole batch.
+
+    Stages can be swapped by name, and hooks run before or after any stage
+    (e.g. to report progress or inspect a stage's output).
+    """
+
+    def __init__(self, stages):
+        """
+        Args:
+            stages (list): Stage objects in run order
+        """
+        self.stages = list(stages)
+        self.hooks = {'before': [], 'after': []}
+
+    def stage(self, name):
+        """
+        Get a stage by name.
+
+        Args:
+            name (str): Stage name
+
+        Returns:
+            Stage: The stage, or None if there is none by that name
+        """
+        return next((stage for stage in self.stages if stage.name == name), None)
+
+    def replace_stage(self, name, stage):
+        """
+        Swap in another implementation of a stage.
+
+        Args:
+            name (str): Name of the stage to replace
+            stage (Stage): Replacement stage
+        """
+        for i, current in enumerate(self.stages):
+            if current.name == name:
+                self.stages[i] = stage
+                return
+        raise KeyError(f"No pipeline stage named {name}")
+
+    def add_hook(self, when, hook, stage=None):
+        """
+        Register a hook around stages.
+
+        Args:
+            when (str): 'before' or 'after'
+            hook (callable): Called with (stage, batch)
+            stage (str): Only run around this stage (default: every stage)
+        """
+        self.hooks[when].append((stage, hook))
+
+    def run_hooks(self, when, stage, batch):
+        """
+        Call the hooks registered for a stage.
+
+        Args:
+            when (str): 'before' or 'after'
+            stage (Stage): Stage being run
+            batch (PipelineBatch): Batch being processed
+        """
+        for name, hook in self.hooks[when]:
+            if name is None or name == stage.name:
+                hook(stage, batch)
+
+    def run(self, reviews, first_id=1):
+        """
+        Run reviews through every stage.
+
+        Args:
+            reviews (list): Review texts, one per input row
+            first_id (int): Result id of the first row
+
+        Returns:
+            PipelineBatch: Batch with one result record per non-blank row
+                in batch.results and seconds per stage in batch.timings
+        """
+        return self.run_stages(PipelineBatch(reviews, first_id))
+
+    def run_stages(self, batch, stages=None):
+        """
+        Run some or all stages over a batch, with hooks and timings.
+
+        Args:
+            batch (PipelineBatch): Batch to process in place
+            stages (list): Stages to run, in order (default: every stage)
+
+        Returns:
+            PipelineBatch: The same batch
+        """
+        for stage in self.stages if stages is None else stages:
+            self.run_hooks('before', stage, batch)
+            start = time.perf_counter()
+            stage.run(batch)
+            batch.timings[stage.name] = round(time.perf_counter() - start, 4)
+            self.run_hooks('after', stage, batch)
+        return batch
+
+def create_engine(translate=None, detect_progress=None):
+    """
+    Build the standard dedup -> detect -> triage -> translate -> sentiment -> fan-out engine.
+
+    Args:
+        translate (bool): Whether to translate (defaults to every mode but 'direct')
+        detect_progress (callable): Called with (texts done, total) during detection (optional)
+
+    Returns:
+        PipelineEngine: Engine with the default stages
+    """
+    return PipelineEngine([
+        DedupStage(),
+        DetectStage(detect_progress),
+        TriageStage(),
+        TranslateStage(translate),
+        SentimentStage(),
+        FanOutStage()
+    ])
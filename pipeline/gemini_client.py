@@ -0,0 +1,234 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from config import Config
+from pipeline.circuit import get_breaker
+
+# Shared client, created on first use
+gemini_client = None
+_client_lock = threading.Lock()
+
+class GeminiError(Exception):
+    """Gemini request failure, with the HTTP status when there was one."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self):
+        return self.status is None or self.status == 429 or self.status >= 500
+
+class CircuitOpenError(GeminiError):
+    """Request skipped because the Gemini circuit breaker is open."""
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting requests per minute.
+
+    Holds up to capacity tokens and refills at rate_per_minute; acquire()
+    blocks until a token is free. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate_per_minute, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, waiting for the bucket to refill if it is empty."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+class GeminiClient:
+    """
+    Thread-pooled client for the Gemini generateContent REST endpoint.
+
+    At most max_concurrency requests are in flight across all callers and
+    request starts are limited by a token bucket. Timeouts, connection
+    errors, 429 and 5xx responses are retried with exponential backoff
+    (honouring Retry-After); other errors fail immediately. With a circuit
+    breaker, calls that exhaust their retries count as backend failures and
+    requests are skipped while the circuit is open. base_url can point at a
+    local stub server for testing.
+    """
+
+    def __init__(self, api_key, model, base_url=None, max_concurrency=None, requests_per_minute=None,
+                 timeout=None, max_retries=None, backoff=1.0, max_backoff=30.0, breaker=None):
+        self.api_key = api_key
+        self.breaker = breaker
+        self.model = model
+        self.base_url = (base_url or Config.GEMINI_API_BASE).rstrip('/')
+        self.max_concurrency = max_concurrency or Config.GEMINI_MAX_CONCURRENCY
+        self.timeout = timeout or Config.GEMINI_TIMEOUT
+        self.max_retries = Config.GEMINI_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        rpm = Config.GEMINI_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+        self.bucket = TokenBucket(rpm, capacity=self.max_concurrency)
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+
+    def generate(self, prompt, generation_config=None):
+        """
+        Send one prompt and return the generated text.
+
+        Args:
+            prompt (str): Prompt text
+            generation_config (dict): Optional Gemini generationConfig
+
+        Returns:
+            str: Generated text
+
+        Raises:
+            GeminiError: When the request fails after all retries
+            CircuitOpenError: When the circuit breaker is open
+        """
+        if self.breaker is not None and not self.breaker.allow_request():
+            raise CircuitOpenError("Gemini circuit open, request skipped")
+
+        url = f"{self.base_url}/v1beta/models/{self.model}:generateContent"
+        body = {'contents': [{'parts': [{'text': prompt}]}]}
+        if generation_config:
+            body['generationConfig'] = generation_config
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            retry_after = None
+            with self._slots:
+                self._count('requests')
+                try:
+                    response = self._session().post(
+                        url, json=body, headers={'x-goog-api-key': self.api_key}, timeout=self.timeout
+                    )
+                except requests.RequestException as e:
+                    error = GeminiError(f"Gemini request failed: {e}")
+                else:
+                    if response.status_code == 200:
+                        try:
+                            text = self._extract_text(response.json())
+                        except ValueError as e:
+                            # e.g. an HTML page from a proxy; worth another attempt
+                            error = GeminiError(f"Gemini returned a non-JSON response: {e}")
+                        except GeminiError as e:
+                            error = e
+                        else:
+                            self._record(None)
+                            return text
+                    else:
+                        error = GeminiError(f"Gemini returned HTTP {response.status_code}: {response.text[:200]}", response.status_code)
+                        retry_after = response.headers.get('Retry-After')
+
+            if not error.retryable or attempt == self.max_retries:
+                self._count('failures')
+                self._record(error)
+                raise error
+
+            self._count('retries')
+            time.sleep(self._retry_delay(attempt, retry_after))
+
+    def map(self, prompts, generation_config=None):
+        """
+        Send many prompts concurrently.
+
+        Args:
+            prompts (list): Prompt texts
+            generation_config (dict): Optional Gemini generationConfig
+
+        Returns:
+            list: Generated text per prompt, in input order, or None where the request failed
+        """
+        def run(prompt):
+            try:
+                return self.generate(prompt, generation_config)
+            except CircuitOpenError:
+                return None
+            except GeminiError as e:
+                logging.warning(f"Gemini request failed: {e}")
+                return None
+
+        if len(prompts) <= 1:
+            return [run(prompt) for prompt in prompts]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(prompts))) as executor:
+            return list(executor.map(run, prompts))
+
+    def stats(self):
+        """Return request, retry and failure counters."""
+        with self._stats_lock:
+            return {'requests': self.requests, 'retries': self.retries, 'failures': self.failures}
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _record(self, error):
+        # Only errors that point at backend health count against the circuit
+        if self.breaker is None:
+            return
+        if error is not None and error.retryable:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _session(self):
+        # requests sessions are not guaranteed thread-safe; keep one per thread
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _retry_delay(self, attempt, retry_after):
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        delay = self.backoff * 2 ** attempt
+        return min(delay * (1 + random.random() * 0.25), self.max_backoff)
+
+    @staticmethod
+    def _extract_text(payload):
+        try:
+            parts = payload['candidates'][0]['content']['parts']
+            return ''.join(part.get('text', '') for part in parts)
+        except (KeyError, IndexError, TypeError):
+            reason = payload.get('promptFeedback', {}).get('blockReason') if isinstance(payload, dict) else None
+            raise GeminiError(f"Gemini returned no text (block reason: {reason})", status=400)
+
+def get_gemini_client():
+    """
+    Get the shared Gemini client, creating it on first use.
+
+    Returns:
+        GeminiClient: Shared client, or None when no API key is configured
+    """
+    global gemini_client
+
+    if not Config.GEMINI_API_KEY:
+        return None
+    with _client_lock:
+        if gemini_client is None:
+            gemini_client = GeminiClient(Config.GEMINI_API_KEY, Config.GEMINI_MODEL, breaker=get_breaker('gemini'))
+        return gemini_client
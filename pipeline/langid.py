@@ -0,0 +1,232 @@
+import json
+import os
+import re
+import numpy as np
+from langdetect.utils.ngram import NGram
+
+# langdetect's smoothing: each n-gram multiplies a language's probability
+# by (ALPHA / BASE_FREQ + p(n-gram | language))
+ALPHA = 0.5
+BASE_FREQ = 10000
+MAX_TEXT_LENGTH = 10000
+
+# Same clean-up langdetect applies before extracting n-grams
+URL_PATTERN = re.compile(r'https?://[-_.?&~;+=/#0-9A-Za-z]{1,2076}')
+MAIL_PATTERN = re.compile(r'[-_.0-9A-Za-z]{1,64}@[-_0-9A-Za-z]{1,255}[-_.0-9A-Za-z]{1,255}')
+LATIN_PATTERN = re.compile(r'[A-z]')
+NON_LATIN_PATTERN = re.compile(r'[^\u0000-\u02ff\u1e00-\u1eff]')
+
+class NgramLanguageDetector:
+    """
+    Naive Bayes language detector over langdetect's character n-gram profiles.
+
+    The profiles are held as one float32 matrix of log-probabilities (one
+    row per n-gram, one column per language), so a batch of texts is scored
+    with a single gather and segmented sum instead of langdetect's
+    per-text random sampling in pure Python.
+    """
+
+    def __init__(self, languages, vocabulary, weights):
+        """
+        Args:
+            languages (list): Language code per weight column
+            vocabulary (dict): N-gram to weight row
+            weights (np.ndarray): log(ALPHA / BASE_FREQ + p(n-gram | language)),
+                shape (len(vocabulary), len(languages))
+        """
+        self.languages = list(languages)
+        self.vocabulary = vocabulary
+        self.weights = weights
+        self.normalize_table = build_normalize_table()
+
+    @classmethod
+    def from_profiles(cls, profile_dir=None):
+        """
+        Build the detector from langdetect's bundled language profiles.
+
+        Args:
+            profile_dir (str): Directory of langdetect JSON profiles (optional)
+
+        Returns:
+            NgramLanguageDetector: Detector covering every profile found
+        """
+        if profile_dir is None:
+            import langdetect
+            profile_dir = os.path.join(os.path.dirname(langdetect.__file__), 'profiles')
+
+        profiles = []
+        for name in sorted(os.listdir(profile_dir)):
+            with open(os.path.join(profile_dir, name), encoding='utf-8') as f:
+                profiles.append(json.load(f))
+
+        vocabulary = {}
+        for profile in profiles:
+            for gram in profile['freq']:
+                if 1 <= len(gram) <= NGram.N_GRAM:
+                    vocabulary.setdefault(gram, len(vocabulary))
+
+        probabilities = np.zeros((len(vocabulary), len(profiles)), dtype=np.float32)
+        for column, profile in enumerate(profiles):
+            n_words = profile['n_words']
+            for gram, count in profile['freq'].items():
+                if 1 <= len(gram) <= NGram.N_GRAM:
+                    probabilities[vocabulary[gram], column] = count / n_words[len(gram) - 1]
+
+        weights = np.log(probabilities + ALPHA / BASE_FREQ).astype(np.float32)
+        return cls([profile['name'] for profile in profiles], vocabulary, weights)
+
+    def clean(self, text):
+        """
+        Apply langdetect's text clean-up and character normalisation.
+
+        Args:
+            text (str): Raw text
+
+        Returns:
+            str: Normalised text ready for n-gram extraction
+        """
+        text = MAIL_PATTERN.sub(' ', URL_PATTERN.sub(' ', text))
+        text = NGram.normalize_vi(text)[:MAX_TEXT_LENGTH]
+        # Drop stray Latin words from text mostly written in another script
+        if len(LATIN_PATTERN.findall(text)) * 2 < len(NON_LATIN_PATTERN.findall(text)):
+            text = LATIN_PATTERN.sub('', text)
+        return text.translate(self.normalize_table)
+
+    def ngram_ids(self, text):
+        """
+        Extract the known 1- to 3-gram rows for a text.
+
+        Args:
+            text (str): Raw text
+
+        Returns:
+            list: Weight row per n-gram occurrence found in the profiles
+        """
+        vocabulary = self.vocabulary
+        ids = []
+        for word in self.clean(text).split():
+            if word != word.lower() and has_capital_run(word):
+                grams = capital_word_ngrams(word)
+            else:
+                padded = f" {word} "
+                grams = list(word)
+                grams += [padded[i:i + 2] for i in range(len(word) + 1)]
+                grams += [padded[i:i + 3] for i in range(len(word))]
+            ids.extend(vocabulary[gram] for gram in grams if gram in vocabulary)
+        return ids
+
+    def score(self, texts, chunk_size=512):
+        """
+        Compute per-language log-likelihoods for many texts.
+
+        Args:
+            texts (list): Texts to score
+            chunk_size (int): Texts gathered per NumPy pass (bounds memory)
+
+        Returns:
+            tuple: (scores array of shape (len(texts), languages), number of
+                n-grams found per text)
+        """
+        scores = np.zeros((len(texts), len(self.languages)), dtype=np.float32)
+        counts = np.zeros(len(texts), dtype=np.int64)
+
+        for start in range(0, len(texts), chunk_size):
+            ids = []
+            for i, text in enumerate(texts[start:start + chunk_size], start):
+                text_ids = self.ngram_ids(text) if text and len(text.strip()) >= 3 else []
+                counts[i] = len(text_ids)
+                ids.extend(text_ids)
+
+            chunk_counts = counts[start:start + chunk_size]
+            found = np.flatnonzero(chunk_counts)
+            if not len(found):
+                continue
+            # Segment start of each text with n-grams in the flat id array
+            offsets = np.concatenate(([0], np.cumsum(chunk_counts[found])[:-1]))
+            scores[start + found] = np.add.reduceat(self.weights[np.asarray(ids)], offsets, axis=0)
+
+        return scores, counts
+
+    def probabilities(self, texts):
+        """
+        Compute per-language posterior probabilities for many texts.
+
+        Args:
+            texts (list): Texts to score
+
+        Returns:
+            tuple: (probability array of shape (len(texts), languages), number
+                of n-grams found per text); rows without n-grams are all zero
+        """
+        scores, counts = self.score(texts)
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        probabilities[counts == 0] = 0.0
+        return probabilities, counts
+
+    def detect(self, texts, default='en'):
+        """
+        Detect the most likely language of many texts.
+
+        Args:
+            texts (list): Texts to analyze
+            default (str): Code returned for texts that are too short or
+                have no known n-grams
+
+        Returns:
+            list: Language code per text
+        """
+        scores, counts = self.score(texts)
+        best = scores.argmax(axis=1)
+        return [self.languages[column] if count else default for column, count in zip(best, counts)]
+
+def has_capital_run(word):
+    """
+    Check whether a word has two capital letters in a row.
+
+    Args:
+        word (str): Normalised word
+
+    Returns:
+        bool: True if langdetect would treat part of it as a capital word
+    """
+    return any(a.isupper() and b.isupper() for a, b in zip(word, word[1:]))
+
+def capital_word_ngrams(word):
+    """
+    Extract n-grams from a word the way langdetect does, which skips
+    n-grams while inside a run of capital letters.
+
+    Args:
+        word (str): Normalised word without spaces
+
+    Returns:
+        list: N-grams of the word
+    """
+    ngram = NGram()
+    grams = []
+    for char in word + ' ':
+        ngram.add_char(char)
+        if ngram.capitalword:
+            continue
+        for n in range(1, NGram.N_GRAM + 1):
+            gram = ngram.get(n)
+            if gram and gram != ' ':
+                grams.append(gram)
+    return grams
+
+def build_normalize_table():
+    """
+    Precompute langdetect's per-character normalisation for str.translate.
+
+    Returns:
+        dict: Code point to replacement for every BMP character it changes
+    """
+    table = {}
+    for codepoint in range(0x10000):
+        char = chr(codepoint)
+        normalized = NGram.normalize(char)
+        if normalized != char:
+            table[codepoint] = normalized
+    return table
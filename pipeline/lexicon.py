@@ -0,0 +1,76 @@
+import re
+
+POSITIVE_WORDS = {
+    'amazing', 'awesome', 'beautiful', 'best', 'brilliant', 'comfortable', 'delighted', 'easy',
+    'excellent', 'exceptional', 'fantastic', 'fast', 'favorite', 'favourite', 'flawless',
+    'glad', 'good', 'gorgeous', 'great', 'happy', 'helpful', 'impressed', 'impressive', 'incredible',
+    'love', 'loved', 'lovely', 'loves', 'nice', 'outstanding', 'perfect', 'perfectly', 'pleasant',
+    'pleased', 'quick', 'recommend', 'recommended', 'reliable', 'satisfied', 'smooth', 'solid',
+    'sturdy', 'superb', 'terrific', 'thanks', 'useful', 'wonderful', 'worth'
+}
+
+NEGATIVE_WORDS = {
+    'awful', 'bad', 'broke', 'broken', 'cheap', 'complaint', 'damaged', 'defective', 'disappointed',
+    'disappointing', 'disappointment', 'dislike', 'faulty', 'flimsy', 'garbage', 'hate', 'hated',
+    'horrible', 'junk', 'late', 'mediocre', 'missing', 'noisy', 'overpriced', 'poor', 'poorly',
+    'problem', 'problems', 'refund', 'returned', 'rude', 'scam', 'slow', 'terrible',
+    'trash', 'ugly', 'unhappy', 'unreliable', 'unusable', 'useless', 'waste', 'worse', 'worst',
+    'wrong'
+}
+
+NEGATIONS = {'not', 'no', 'never', 'nothing', 'hardly', 'without', 'nor', 'cannot'}
+
+# Words that signal the review changes direction part-way through
+CONTRAST_WORDS = {'but', 'however', 'although', 'though', 'yet', 'except'}
+
+TOKEN_PATTERN = re.compile(r"[a-z']+")
+
+def score_lexicon(text):
+    """
+    Score English text with a word lexicon.
+
+    Sentiment words flip polarity when one of the three preceding words is
+    a negation. Confidence grows with the net number of sentiment words and
+    drops when the review has mixed polarity or a contrast word, so only
+    clear-cut reviews score high.
+
+    Args:
+        text (str): English text
+
+    Returns:
+        dict: Sentiment result with label and confidence (0 when undecided)
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    positive = 0
+    negative = 0
+
+    for i, token in enumerate(tokens):
+        if token in POSITIVE_WORDS:
+            polarity = 1
+        elif token in NEGATIVE_WORDS:
+            polarity = -1
+        else:
+            continue
+
+        window = tokens[max(0, i - 3):i]
+        if any(word in NEGATIONS or word.endswith("n't") for word in window):
+            polarity = -polarity
+
+        if polarity > 0:
+            positive += 1
+        else:
+            negative += 1
+
+    hits = positive + negative
+    if hits == 0 or positive == negative:
+        return {'label': 'Neutral', 'confidence': 0.0}
+
+    net = abs(positive - negative)
+    confidence = (net / hits) * (1 - 0.25 ** net)
+    if CONTRAST_WORDS.intersection(tokens):
+        confidence *= 0.5
+
+    return {
+        'label': 'Positive' if positive > negative else 'Negative',
+        'confidence': round(confidence, 3)
+    }
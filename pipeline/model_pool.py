@@ -0,0 +1,136 @@
+import logging
+import threading
+from collections import OrderedDict
+
+def model_size_bytes(model_pipeline):
+    """
+    Measure the resident size of a pipeline's weights.
+
+    Args:
+        model_pipeline: Hugging Face pipeline or bare torch model
+
+    Returns:
+        int: Bytes held by parameters and buffers (0 if unknown)
+    """
+    model = getattr(model_pipeline, 'model', model_pipeline)
+    try:
+        values = list(model.state_dict(keep_vars=True).values())
+    except Exception:
+        return 0
+
+    # Quantised layers keep their weights in packed tuples rather than
+    # parameters; tied weights appear under several keys but count once
+    total = 0
+    seen = set()
+    while values:
+        value = values.pop()
+        if isinstance(value, (tuple, list)):
+            values.extend(value)
+        elif hasattr(value, 'numel') and hasattr(value, 'element_size'):
+            pointer = value.data_ptr()
+            if pointer in seen:
+                continue
+            seen.add(pointer)
+            total += value.numel() * value.element_size()
+    return total
+
+class ModelPool:
+    """
+    LRU pool of loaded models bounded by a memory budget.
+
+    Models are loaded on first use by the loader callable. Each model name
+    has its own lock, so concurrent requests for the same model wait for a
+    single load while other models load in parallel. When the resident
+    size exceeds max_bytes, least recently used models are evicted (the
+    model just requested is always kept).
+    """
+
+    def __init__(self, loader, max_bytes, size_of=model_size_bytes):
+        self.loader = loader
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.loads = 0
+        self.evictions = 0
+        self.hits = 0
+        self._models = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def get(self, name):
+        """
+        Get a model, loading it if it is not resident.
+
+        Args:
+            name (str): Model name passed to the loader
+
+        Returns:
+            Loaded model
+        """
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                self.hits += 1
+                return self._models[name]
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            # Another request may have finished loading while we waited
+            with self._lock:
+                if name in self._models:
+                    self._models.move_to_end(name)
+                    self.hits += 1
+                    return self._models[name]
+
+            model = self.loader(name)
+            size = self.size_of(model)
+
+            with self._lock:
+                self._models[name] = model
+                self._sizes[name] = size
+                self.loads += 1
+                self._evict(keep=name)
+
+            return model
+
+    def names(self):
+        """Return the resident model names, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def stats(self):
+        """Return load/eviction counters and resident sizes."""
+        with self._lock:
+            return {
+                'loads': self.loads,
+                'evictions': self.evictions,
+                'hits': self.hits,
+                'resident_bytes': sum(self._sizes.values()),
+                'max_bytes': self.max_bytes,
+                'models': dict(self._sizes)
+            }
+
+    def clear(self):
+        """Drop every resident model."""
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._models
+
+    def __len__(self):
+        with self._lock:
+            return len(self._models)
+
+    def _evict(self, keep):
+        while sum(self._sizes.values()) > self.max_bytes and len(self._models) > 1:
+            name = next(iter(self._models))
+            if name == keep:
+                self._models.move_to_end(name)
+                continue
+            del self._models[name]
+            size = self._sizes.pop(name)
+            self.evictions += 1
+            logging.info(f"Evicted model {name} ({size / 1024 ** 2:.0f} MB) to stay within the memory budget")
@@ -0,0 +1,164 @@
+import os
+import logging
+import numpy as np
+from transformers import AutoConfig, AutoTokenizer
+from config import Config
+
+ONNX_MODEL_FILES = {
+    'onnx': 'model.onnx',
+    'onnx-int8': 'model.int8.onnx'
+}
+
+class OnnxSentimentPipeline:
+    """
+    Sentiment classifier running an exported ONNX graph through onnxruntime.
+
+    Called the same way as the transformers sentiment pipeline with
+    return_all_scores=True, so analyze_sentiment and analyze_sentiment_batch
+    work unchanged: a string returns [scores], a list returns one score
+    list per text.
+    """
+
+    def __init__(self, model_dir, backend='onnx'):
+        import onnxruntime as ort
+
+        model_path = os.path.join(model_dir, ONNX_MODEL_FILES[backend])
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"No exported model at {model_path}, run export_onnx.py first")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if Config.INTRA_OP_THREADS:
+            options.intra_op_num_threads = Config.INTRA_OP_THREADS
+        if Config.INTER_OP_THREADS:
+            options.inter_op_num_threads = Config.INTER_OP_THREADS
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        config = AutoConfig.from_pretrained(model_dir)
+        self.id2label = config.id2label
+
+        # Re-exporting changes size/mtime, which invalidates cached results
+        stat = os.stat(model_path)
+        self.model_id = f"{backend}:{config._name_or_path}:{stat.st_size}-{int(stat.st_mtime)}"
+
+    def __call__(self, texts, batch_size=None, **kwargs):
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        batch_size = batch_size or len(texts)
+
+        scores = []
+        for start in range(0, len(texts), batch_size):
+            scores.extend(self._score(texts[start:start + batch_size]))
+
+        return scores
+
+    def _score(self, texts):
+        encoded = self.tokenizer(
+            list(texts),
+            padding=True,
+            truncation=True,
+            max_length=self.tokenizer.model_max_length,
+            return_tensors='np'
+        )
+        return self.score_encoded(encoded)
+
+    def score_encoded(self, encoded):
+        """
+        Score input that is already tokenised and padded.
+
+        Args:
+            encoded (dict): input_ids and attention_mask arrays, one row per text
+
+        Returns:
+            list: Label/score dicts per row
+        """
+        feed = {name: np.asarray(array).astype(np.int64) for name, array in encoded.items() if name in self.input_names}
+        if 'token_type_ids' in self.input_names and 'token_type_ids' not in feed:
+            feed['token_type_ids'] = np.zeros_like(feed['input_ids'])
+        logits = self.session.run(None, feed)[0]
+
+        # Softmax over labels, stabilised by the row max
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probabilities = exp / exp.sum(axis=1, keepdims=True)
+
+        return [
+            [{'label': self.id2label[j], 'score': float(row[j])} for j in range(len(row))]
+            for row in probabilities
+        ]
+
+def load_onnx_sentiment_pipeline(backend=None, model_dir=None):
+    """
+    Load the exported sentiment model for an ONNX backend.
+
+    Args:
+        backend (str): 'onnx' or 'onnx-int8' (defaults to Config.SENTIMENT_BACKEND)
+        model_dir (str): Directory written by export_onnx.py (defaults to Config.ONNX_MODEL_DIR)
+
+    Returns:
+        OnnxSentimentPipeline: Callable sentiment classifier
+    """
+    backend = backend or Config.SENTIMENT_BACKEND
+    model_dir = model_dir or Config.ONNX_MODEL_DIR
+    logging.info(f"Loading {backend} sentiment model from {model_dir}")
+    return OnnxSentimentPipeline(model_dir, backend)
+
+def export_sentiment_model(model_name=None, output_dir=None, quantize=True):
+    """
+    Export a locally cached sentiment model to ONNX.
+
+    Writes model.onnx (and model.int8.onnx when quantize is set) together
+    with the tokenizer and config, so the runtime never needs the
+    PyTorch weights.
+
+    Args:
+        model_name (str): Hugging Face model id or path (defaults to the model for Config.PIPELINE_MODE)
+        output_dir (str): Where to write the artefacts (defaults to Config.ONNX_MODEL_DIR)
+        quantize (bool): Also write a dynamically int8-quantised graph
+
+    Returns:
+        list: Paths of the written model files
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    if model_name is None:
+        model_name = Config.MULTILINGUAL_SENTIMENT_MODEL if Config.PIPELINE_MODE == 'direct' else Config.SENTIMENT_MODEL
+    output_dir = output_dir or Config.ONNX_MODEL_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, local_files_only=True)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, local_files_only=True)
+    model.eval()
+
+    sample = tokenizer(["This is a sample review."], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['logits'] = {0: 'batch'}
+
+    model_path = os.path.join(output_dir, ONNX_MODEL_FILES['onnx'])
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=['logits'],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            dynamo=False
+        )
+
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    written = [model_path]
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        int8_path = os.path.join(output_dir, ONNX_MODEL_FILES['onnx-int8'])
+        quantize_dynamic(model_path, int8_path, weight_type=QuantType.QInt8)
+        written.append(int8_path)
+
+    return written
@@ -0,0 +1,153 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from pipeline.engine import PipelineBatch, create_engine
+from pipeline.streaming import iter_micro_batches, SummaryAggregator
+from pipeline.translate import gemini_available
+
+# Stages that mostly wait on the network (Gemini) and get a phase of their own
+IO_STAGES = ('translate',)
+
+def split_phases(engine, io_stages=None):
+    """
+    Group an engine's stages into phases that can overlap.
+
+    Each I/O-bound stage becomes its own phase, and the CPU-bound stages
+    around it are grouped, e.g. [dedup, detect, triage], [translate],
+    [sentiment, fan_out]. Translation only waits on the network when
+    Gemini is available; otherwise it is Marian competing with sentiment
+    for the same cores, so every stage stays in one phase.
+
+    Args:
+        engine (PipelineEngine): Engine whose stages to split
+        io_stages (tuple): Names of the I/O-bound stages (defaults to
+            IO_STAGES when Gemini is available, none otherwise)
+
+    Returns:
+        list: Phases, each a list of stages in run order
+    """
+    if io_stages is None:
+        io_stages = IO_STAGES if gemini_available() else ()
+
+    phases = []
+    current = []
+    for stage in engine.stages:
+        if stage.name in io_stages:
+            if current:
+                phases.append(current)
+            phases.append([stage])
+            current = []
+        else:
+            current.append(stage)
+    if current:
+        phases.append(current)
+    return phases
+
+async def orchestrate(reviews, engine=None, batch_size=None, queue_size=None, executor=None):
+    """
+    Run micro-batches through overlapping pipeline phases.
+
+    Each phase runs in an executor thread and takes batches from a bounded
+    queue, so while batch k waits on its translations, batch k+1 is being
+    detected and batch k-1 scored. When a queue is full the phase before it
+    waits, and reviews are only read from the input as fast as the slowest
+    phase drains them. Reading (e.g. parsing CSV rows) also runs in the
+    executor, so it never blocks the event loop. Each phase handles one
+    batch at a time in arrival order, so batches come out in input order.
+
+    Args:
+        reviews (iterable): Review texts, one per input row
+        engine (PipelineEngine): Engine to run (defaults to create_engine())
+        batch_size (int): Reviews per micro-batch (defaults to Config.STREAM_BATCH_SIZE)
+        queue_size (int): Batches buffered between phases (defaults to Config.STREAM_QUEUE_SIZE)
+        executor (Executor): Runs the phases and the reader (defaults to a
+            thread pool with one thread per phase and one for reading)
+
+    Yields:
+        PipelineBatch: Each processed micro-batch, in input order
+    """
+    engine = engine or create_engine()
+    batch_size = batch_size or Config.STREAM_BATCH_SIZE
+    queue_size = queue_size or Config.STREAM_QUEUE_SIZE
+    phases = split_phases(engine)
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    executor = executor or ThreadPoolExecutor(max_workers=len(phases) + 1, thread_name_prefix='pipeline')
+    queues = [asyncio.Queue(queue_size) for _ in range(len(phases) + 1)]
+
+    async def feed(outbox):
+        try:
+            next_id = 1
+            batches = iter_micro_batches(reviews, batch_size)
+            while True:
+                reviews_batch = await loop.run_in_executor(executor, next, batches, None)
+                if reviews_batch is None:
+                    break
+                await outbox.put(PipelineBatch(reviews_batch, next_id))
+                next_id += len(reviews_batch)
+            await outbox.put(None)
+        except Exception as e:
+            await outbox.put(e)
+
+    async def work(stages, inbox, outbox):
+        while True:
+            batch = await inbox.get()
+            if batch is None or isinstance(batch, Exception):
+                await outbox.put(batch)
+                return
+            try:
+                await loop.run_in_executor(executor, engine.run_stages, batch, stages)
+            except Exception as e:
+                await outbox.put(e)
+                return
+            await outbox.put(batch)
+
+    tasks = [asyncio.create_task(feed(queues[0]))] + [
+        asyncio.create_task(work(stages, queues[i], queues[i + 1])) for i, stages in enumerate(phases)
+    ]
+    try:
+        while True:
+            batch = await queues[-1].get()
+            if batch is None:
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_executor:
+            executor.shutdown(wait=False)
+
+def run_pipelined(reviews, exporter=None, engine=None, batch_size=None, queue_size=None, progress=None):
+    """
+    Analyze reviews with overlapping phases, handing results to an exporter in order.
+
+    Same contract as streaming.run_streaming, but reading the input
+    overlaps the analysis, and with Gemini available translation of one
+    micro-batch overlaps detection of the next and scoring of the previous.
+
+    Args:
+        reviews (iterable): Review texts, one per input row
+        exporter: Object with write(results), e.g. a CsvStreamExporter (optional)
+        engine (PipelineEngine): Engine to run (defaults to create_engine())
+        batch_size (int): Reviews per micro-batch (defaults to Config.STREAM_BATCH_SIZE)
+        queue_size (int): Batches buffered between phases (defaults to Config.STREAM_QUEUE_SIZE)
+        progress (callable): Called with the number of results so far after each micro-batch (optional)
+
+    Returns:
+        dict: Summary of all results (see SummaryAggregator.summary)
+    """
+    async def consume():
+        aggregator = SummaryAggregator()
+        async for batch in orchestrate(reviews, engine, batch_size, queue_size):
+            aggregator.add_batch(batch)
+            if exporter:
+                exporter.write(batch.results)
+            if progress:
+                progress(aggregator.total_reviews)
+        return aggregator
+
+    # The summary may call Gemini, so it is built outside the event loop
+    return asyncio.run(consume()).summary()
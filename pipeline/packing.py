@@ -0,0 +1,118 @@
+import json
+import logging
+import re
+
+# Instructions sent ahead of every packed translation request
+PACKED_PROMPT = (
+    "Translate each review below to English. The reviews are a JSON array of objects with "
+    "\"id\", \"lang\" (source language code) and \"text\". Return only a JSON array with one "
+    "object per review, each with the review's \"id\" and its English \"translation\". "
+    "Do not merge, skip or add reviews.\n\n"
+)
+
+FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+def estimate_prompt_tokens(text):
+    """
+    Estimate how many LLM tokens a text costs.
+
+    UTF-8 bytes / 3 tracks both Latin text (~4 characters per token) and
+    CJK or Thai text (~1 character per token) closely enough for budgeting.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        int: Estimated token count
+    """
+    return len(text.encode('utf-8')) // 3 + 1
+
+def pack_items(indices, texts, max_items, max_tokens):
+    """
+    Group texts into packets under an item limit and a token budget.
+
+    Packets keep input order. A text over the budget on its own still gets
+    a packet of its own.
+
+    Args:
+        indices (list): Indices into texts to pack
+        texts (list): All texts
+        max_items (int): Max texts per packet
+        max_tokens (int): Estimated prompt tokens allowed per packet
+
+    Returns:
+        list: Packets, each a list of indices
+    """
+    packets = []
+    current = []
+    current_tokens = 0
+
+    for i in indices:
+        # Each review is wrapped in a JSON object, which adds a few tokens
+        tokens = estimate_prompt_tokens(texts[i]) + 8
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            packets.append(current)
+            current = []
+            current_tokens = 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        packets.append(current)
+    return packets
+
+def build_packed_prompt(packet, texts, source_langs):
+    """
+    Build a prompt asking for several translations as a JSON array.
+
+    Args:
+        packet (list): Indices of the texts to translate (used as IDs)
+        texts (list): All texts
+        source_langs (list): Source language code for each text
+
+    Returns:
+        str: Prompt text
+    """
+    items = [{'id': i, 'lang': source_langs[i], 'text': texts[i]} for i in packet]
+    return PACKED_PROMPT + json.dumps(items, ensure_ascii=False)
+
+def parse_packed_response(output, packet):
+    """
+    Validate a packed response and pull out the translations.
+
+    Items with unknown IDs or empty translations are ignored, so a partly
+    valid response still yields what it can.
+
+    Args:
+        output (str): Raw model output
+        packet (list): IDs that were sent
+
+    Returns:
+        dict: ID -> translation, for valid items only
+    """
+    if not output:
+        return {}
+
+    try:
+        items = json.loads(FENCE_PATTERN.sub('', output.strip()))
+    except ValueError as e:
+        logging.warning(f"Malformed packed Gemini response: {e}")
+        return {}
+
+    if not isinstance(items, list):
+        logging.warning("Malformed packed Gemini response: expected a JSON array")
+        return {}
+
+    expected = set(packet)
+    translations = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        item_id = item.get('id')
+        translation = item.get('translation')
+        if isinstance(item_id, str) and item_id.isdigit():
+            item_id = int(item_id)
+        if item_id in expected and isinstance(translation, str) and translation.strip():
+            translations[item_id] = translation.strip()
+
+    return translations
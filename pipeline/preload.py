@@ -0,0 +1,94 @@
+import gc
+import logging
+import threading
+from config import Config
+import pipeline.sentiment as sentiment
+import pipeline.translate as translate
+
+# Readiness state, set once all configured models are resident
+models_ready = False
+_preload_lock = threading.Lock()
+
+def preload_models(translation_langs=None):
+    """
+    Load the sentiment model and configured translation models up front.
+
+    Meant to run in the parent process before workers fork (e.g. gunicorn
+    --preload). Weights are switched to inference mode and moved into
+    shared memory, and the loaded objects are frozen out of the garbage
+    collector, so forked workers keep sharing one copy copy-on-write
+    instead of each loading a private one. Safe to call repeatedly.
+
+    Args:
+        translation_langs (list): Source language codes whose Marian models
+            to load (defaults to Config.PRELOAD_TRANSLATION_LANGS)
+
+    Returns:
+        bool: True once the models are ready
+    """
+    global models_ready
+
+    with _preload_lock:
+        if models_ready:
+            return True
+
+        if translation_langs is None:
+            translation_langs = Config.PRELOAD_TRANSLATION_LANGS
+
+        if sentiment.sentiment_analyzer is None:
+            sentiment.initialize_sentiment_analyzer()
+        share_model_weights(sentiment.sentiment_analyzer)
+
+        for lang in translation_langs:
+            try:
+                share_model_weights(translate.load_translator(lang))
+            except Exception as e:
+                logging.warning(f"Failed to preload translation model for {lang}: {e}")
+
+        # Keep the collector from touching (and un-sharing) the loaded objects
+        gc.collect()
+        gc.freeze()
+
+        models_ready = True
+        logging.info("Models preloaded and ready")
+        return True
+
+def share_model_weights(model_pipeline):
+    """
+    Put a pipeline's torch weights into read-only shared memory.
+
+    Args:
+        model_pipeline: Hugging Face pipeline (other backends are left as is)
+    """
+    model = getattr(model_pipeline, 'model', None)
+    if model is None or not hasattr(model, 'share_memory'):
+        return
+
+    model.eval()
+    for parameter in model.parameters():
+        parameter.requires_grad_(False)
+    model.share_memory()
+
+def get_readiness():
+    """
+    Report which models are loaded.
+
+    With Config.PRELOAD_MODELS the process is ready once preload_models()
+    has finished. Without it models load on first use, so the process is
+    ready to serve as soon as it starts.
+
+    Returns:
+        dict: Readiness flag, loaded model names and translation pool counters
+    """
+    pool_stats = translate.translation_cache.stats()
+    return {
+        'ready': models_ready or not Config.PRELOAD_MODELS,
+        'sentiment_model_loaded': sentiment.sentiment_analyzer is not None,
+        'translation_models': sorted(pool_stats['models']),
+        'translation_pool': {
+            'loads': pool_stats['loads'],
+            'evictions': pool_stats['evictions'],
+            'resident_mb': round(pool_stats['resident_bytes'] / 1024 ** 2, 1),
+            'budget_mb': round(pool_stats['max_bytes'] / 1024 ** 2, 1)
+        }
+    }
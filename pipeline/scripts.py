@@ -0,0 +1,108 @@
+import numpy as np
+
+# Letter ranges per script; anything not listed (digits, punctuation,
+# symbols, spaces) is ignored when measuring a text's scripts
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, 'Latin'), (0x0061, 0x007A, 'Latin'), (0x00C0, 0x024F, 'Latin'), (0x1E00, 0x1EFF, 'Latin'),
+    (0x0370, 0x03FF, 'Greek'),
+    (0x0400, 0x052F, 'Cyrillic'),
+    (0x0590, 0x05FF, 'Hebrew'),
+    (0x0600, 0x06FF, 'Arabic'), (0x0750, 0x077F, 'Arabic'),
+    (0x0900, 0x097F, 'Devanagari'),
+    (0x0980, 0x09FF, 'Bengali'),
+    (0x0A00, 0x0A7F, 'Gurmukhi'),
+    (0x0A80, 0x0AFF, 'Gujarati'),
+    (0x0B80, 0x0BFF, 'Tamil'),
+    (0x0C00, 0x0C7F, 'Telugu'),
+    (0x0C80, 0x0CFF, 'Kannada'),
+    (0x0D00, 0x0D7F, 'Malayalam'),
+    (0x0E00, 0x0E7F, 'Thai'),
+    (0x1100, 0x11FF, 'Hangul'), (0x3130, 0x318F, 'Hangul'), (0xAC00, 0xD7AF, 'Hangul'),
+    (0x3040, 0x309F, 'Hiragana'),
+    (0x30A0, 0x30FF, 'Katakana'), (0x31F0, 0x31FF, 'Katakana'), (0xFF66, 0xFF9F, 'Katakana'),
+    (0x3400, 0x4DBF, 'Han'), (0x4E00, 0x9FFF, 'Han'), (0xF900, 0xFAFF, 'Han')
+]
+
+# Scripts that (among the languages we detect) are written in one language
+# only. Latin, Cyrillic, Arabic and Han are shared and need the detector.
+SCRIPT_LANGUAGES = {
+    'Greek': 'el',
+    'Hebrew': 'he',
+    'Devanagari': 'hi',
+    'Bengali': 'bn',
+    'Gurmukhi': 'pa',
+    'Gujarati': 'gu',
+    'Tamil': 'ta',
+    'Telugu': 'te',
+    'Kannada': 'kn',
+    'Malayalam': 'ml',
+    'Thai': 'th',
+    'Hangul': 'ko',
+    'Hiragana': 'ja',
+    'Katakana': 'ja'
+}
+
+# Share of Han characters that must be kana for Han to count as Japanese
+KANA_SHARE = 0.1
+
+SCRIPTS = ['Other'] + sorted({script for _, _, script in SCRIPT_RANGES})
+SCRIPT_IDS = {script: i for i, script in enumerate(SCRIPTS)}
+
+# Script id per BMP code point; the extra last slot catches everything above
+SCRIPT_TABLE = np.zeros(0x10001, dtype=np.uint8)
+for start, end, script in SCRIPT_RANGES:
+    SCRIPT_TABLE[start:end + 1] = SCRIPT_IDS[script]
+
+def script_counts(text):
+    """
+    Count the letters of each script in a text.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        dict: Letter count per script name (scripts with no letters left out)
+    """
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    ids = SCRIPT_TABLE[np.minimum(codepoints, 0x10000)]
+    counts = np.bincount(ids, minlength=len(SCRIPTS))
+    return {SCRIPTS[i]: int(count) for i, count in enumerate(counts) if i and count}
+
+def classify_script(text, min_share=0.5):
+    """
+    Decide a text's language from its script alone, when the script allows it.
+
+    Hangul, Thai, kana, Devanagari and the other single-language scripts
+    decide the language outright once they make up more than min_share of
+    the letters; Han counts towards Japanese when enough kana is present.
+
+    Args:
+        text (str): Input text
+        min_share (float): Share of letters the script must exceed
+
+    Returns:
+        tuple: (language code, share of letters in its script), or None when
+            the text is written in a shared script and needs the detector
+    """
+    counts = script_counts(text)
+    letters = sum(counts.values())
+    if not letters:
+        return None
+
+    languages = {}
+    for script, count in counts.items():
+        lang = SCRIPT_LANGUAGES.get(script)
+        if lang:
+            languages[lang] = languages.get(lang, 0) + count
+
+    han = counts.get('Han', 0)
+    if han and languages.get('ja', 0) >= KANA_SHARE * (han + languages.get('ja', 0)):
+        languages['ja'] += han
+
+    if not languages:
+        return None
+    lang, count = max(languages.items(), key=lambda item: item[1])
+    share = count / letters
+    if share <= min_share:
+        return None
+    return lang, round(share, 3)
@@ -0,0 +1,92 @@
+import re
+
+# Line breaks, whitespace after sentence-final punctuation, or the point
+# right after CJK full-width punctuation (which is not followed by a space)
+SENTENCE_BOUNDARY = re.compile(r"\s*\n+\s*|(?<=[.!?…])\s+|(?<=[。！？])\s*")
+
+def split_sentences(text, max_chars=None):
+    """
+    Split text into sentences, remembering how they were separated.
+
+    Sentences longer than max_chars are wrapped at word boundaries (or
+    every max_chars characters for scripts written without spaces), so
+    no segment grows with the length of the review.
+
+    Args:
+        text (str): Text to split
+        max_chars (int): Longest segment allowed (optional)
+
+    Returns:
+        list: (segment, separator) pairs in order; the separator is '\\n'
+            for paragraph breaks, ' ' between sentences and '' after the
+            last segment
+    """
+    segments = []
+    position = 0
+
+    for match in SENTENCE_BOUNDARY.finditer(text):
+        sentence = text[position:match.start()].strip()
+        separator = '\n' if '\n' in match.group() else ' '
+        position = match.end()
+        if sentence:
+            segments.extend(wrap_segment(sentence, separator, max_chars))
+        elif segments and separator == '\n':
+            segments[-1] = (segments[-1][0], '\n')
+
+    tail = text[position:].strip()
+    if tail:
+        segments.extend(wrap_segment(tail, '', max_chars))
+    elif segments:
+        segments[-1] = (segments[-1][0], '')
+
+    return segments
+
+def wrap_segment(sentence, separator, max_chars):
+    """
+    Break an over-long sentence into pieces of at most max_chars.
+
+    Args:
+        sentence (str): Sentence to wrap
+        separator (str): Separator that follows the sentence
+        max_chars (int): Longest piece allowed (None leaves the sentence whole)
+
+    Returns:
+        list: (piece, separator) pairs; only the last piece keeps separator
+    """
+    if not max_chars or len(sentence) <= max_chars:
+        return [(sentence, separator)]
+
+    pieces = []
+    current = ''
+    for word in sentence.split():
+        while len(word) > max_chars:
+            # No spaces to break on (e.g. CJK or Thai): cut by characters
+            if current:
+                pieces.append(current)
+                current = ''
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        if not word:
+            continue
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+
+    return [(piece, ' ') for piece in pieces[:-1]] + [(pieces[-1], separator)]
+
+def join_segments(segments, separators):
+    """
+    Join translated segments back into one text.
+
+    Args:
+        segments (list): Translated segments in order
+        separators (list): Separator after each segment (from split_sentences)
+
+    Returns:
+        str: Joined text
+    """
+    return ''.join(segment + separator for segment, separator in zip(segments, separators))
@@ -1,17 +1,39 @@
 from transformers import pipeline
 import logging
+import threading
 from config import Config
+from pipeline.batching import token_lengths, run_in_batches, plan_windows, schedule_windows
+from pipeline.onnx_backend import load_onnx_sentiment_pipeline
+from pipeline.cache import ResultCache
+from pipeline.tuning import apply_inference_profile
+from pipeline.lexicon import score_lexicon
 
 # Initialize sentiment analysis pipeline
 sentiment_analyzer = None
 
+# Result cache, created on first use
+sentiment_cache = None
+
+# Reviews handled by each cascade tier
+cascade_stats = {'lexicon': 0, 'transformer': 0, 'default': 0}
+cascade_stats_lock = threading.Lock()
+
 def initialize_sentiment_analyzer():
     """Initialize the sentiment analysis pipeline."""
     global sentiment_analyzer
+    apply_inference_profile()
+    
+    if Config.SENTIMENT_BACKEND in ('onnx', 'onnx-int8'):
+        try:
+            sentiment_analyzer = load_onnx_sentiment_pipeline(Config.SENTIMENT_BACKEND)
+            return
+        except Exception as e:
+            logging.warning(f"Failed to load {Config.SENTIMENT_BACKEND} sentiment model, using torch: {e}")
+    
     try:
         sentiment_analyzer = pipeline(
             "sentiment-analysis",
-            model=Config.SENTIMENT_MODEL,
+            model=get_sentiment_model_name(),
             return_all_scores=True
         )
     except Exception as e:
@@ -22,6 +44,17 @@ def initialize_sentiment_analyzer():
             return_all_scores=True
         )
 
+def get_sentiment_model_name():
+    """
+    Get the sentiment model for the configured pipeline mode.
+    
+    Returns:
+        str: Multilingual model in 'direct' mode, English model otherwise
+    """
+    if Config.PIPELINE_MODE == 'direct':
+        return Config.MULTILINGUAL_SENTIMENT_MODEL
+    return Config.SENTIMENT_MODEL
+
 def analyze_sentiment(text):
     """
     Analyze sentiment of the given text.
@@ -49,21 +82,312 @@ def analyze_sentiment(text):
         else:
             scores = results
         
-        # Find the highest scoring sentiment
-        best_result = max(scores, key=lambda x: x['score'])
+        return best_sentiment(scores)
+        
+    except Exception as e:
+        logging.error(f"Sentiment analysis failed: {e}")
+        return {'label': 'Neutral', 'confidence': 0.5}
+
+def analyze_sentiment_batch(texts, batch_size=None, max_tokens=None, cascade=None):
+    """
+    Analyze sentiment of many texts using batched model calls.
+    
+    Texts are sent to the model in padded mini-batches instead of one
+    forward pass per text. Batches are formed from length-sorted texts
+    under a token budget (see pipeline.batching), so short reviews are not
+    padded out to the longest review in the upload. Short or empty texts
+    get the same neutral fallback as analyze_sentiment, and if a batch
+    fails its items are retried one at a time so a single bad text cannot
+    sink the others. Texts already scored by the same model are served
+    from the result cache without touching the model.
+    
+    With a fast tokenizer each text is tokenised once and fed to the
+    model as token ids. Under Config.SENTIMENT_CHUNKING, texts longer than
+    the model's input limit are split into overlapping token windows
+    scored alongside the other texts; their scores are folded into a
+    running average weighted by window length, so windows are never all
+    held at once.
+    
+    Args:
+        texts (list): Texts to analyze
+        batch_size (int): Max texts per forward pass (defaults to Config.SENTIMENT_BATCH_SIZE)
+        max_tokens (int): Padded tokens per forward pass (defaults to Config.MAX_BATCH_TOKENS)
+        cascade (bool): Route through analyze_sentiment_cascade (defaults to Config.SENTIMENT_CASCADE)
+        
+    Returns:
+        list: Sentiment results with label and confidence, in input order
+    """
+    global sentiment_analyzer
+    
+    if cascade is None:
+        cascade = Config.SENTIMENT_CASCADE
+    if cascade:
+        return analyze_sentiment_cascade(texts, batch_size, max_tokens)
+    
+    batch_size = batch_size or Config.SENTIMENT_BATCH_SIZE
+    results = [{'label': 'Neutral', 'confidence': 0.5} for _ in texts]
+    
+    # Only texts long enough to score go to the model
+    pending = [i for i, text in enumerate(texts) if text and len(text.strip()) >= 3]
+    if not pending:
+        return results
+    
+    if sentiment_analyzer is None:
+        initialize_sentiment_analyzer()
+    
+    # Serve previously scored texts from the cache
+    cache = get_sentiment_cache()
+    if cache is not None:
+        cache.bind(get_model_id())
+        cached = cache.get_many([texts[i] for i in pending])
+        for position, result in cached.items():
+            results[pending[position]] = result
+        pending = [i for position, i in enumerate(pending) if position not in cached]
+        if not pending:
+            return results
+    
+    # Running token-weighted label totals per text; each window is folded
+    # in as soon as it is scored and then dropped
+    combined = [{} for _ in pending]
+    weights = [0] * len(pending)
+    
+    def fold(position, length, scores):
+        if scores is None:
+            return
+        weights[position] += length
+        for score in scores:
+            combined[position][score['label']] = combined[position].get(score['label'], 0.0) + score['score'] * length
+    
+    pending_texts = [texts[i] for i in pending]
+    tokenizer = getattr(sentiment_analyzer, 'tokenizer', None)
+    if getattr(tokenizer, 'is_fast', False) is True:
+        # Each text is tokenised once; its windows go to the model as token
+        # ids, so no forward pass exceeds the model's input limit and long
+        # texts are split (or truncated without SENTIMENT_CHUNKING)
+        windows = plan_windows(
+            pending_texts, tokenizer, Config.SENTIMENT_WINDOW_TOKENS, Config.SENTIMENT_WINDOW_OVERLAP,
+            max_windows=None if Config.SENTIMENT_CHUNKING else 1
+        )
+        for batch in schedule_windows(windows, max_tokens, batch_size):
+            try:
+                outputs = score_windows([ids for _, ids in batch])
+            except Exception as e:
+                logging.warning(f"Batched sentiment analysis failed, retrying items individually: {e}")
+                outputs = [score_window(ids) for _, ids in batch]
+            for (position, ids), scores in zip(batch, outputs):
+                fold(position, len(ids), scores)
+    else:
+        def score_batch(batch_texts):
+            try:
+                return sentiment_analyzer(batch_texts, batch_size=len(batch_texts), truncation=True)
+            except Exception as e:
+                logging.warning(f"Batched sentiment analysis failed, retrying items individually: {e}")
+                return [score_text(text) for text in batch_texts]
+        
+        lengths = token_lengths(pending_texts, tokenizer)
+        outputs = run_in_batches(pending_texts, score_batch, lengths, max_tokens, batch_size)
+        for position, (length, scores) in enumerate(zip(lengths, outputs)):
+            fold(position, length, scores)
+    
+    scored_texts = []
+    scored_results = []
+    for position, totals in enumerate(combined):
+        if not totals:
+            continue
+        result = best_sentiment([
+            {'label': label, 'score': total / weights[position]} for label, total in totals.items()
+        ])
+        results[pending[position]] = result
+        scored_texts.append(pending_texts[position])
+        scored_results.append(result)
+    
+    if cache is not None and scored_texts:
+        cache.put_many(scored_texts, scored_results)
+    
+    return results
+
+def score_windows(windows):
+    """
+    Score token windows with one forward pass.
+    
+    Args:
+        windows (list): Input ids per window, special tokens included
         
-        # Map labels to standardized format
-        label = map_sentiment_label(best_result['label'])
-        confidence = round(best_result['score'], 3)
+    Returns:
+        list: Label/score dicts per window
+    """
+    tokenizer = sentiment_analyzer.tokenizer
+    
+    # The ONNX backend takes the padded arrays directly
+    if hasattr(sentiment_analyzer, 'score_encoded'):
+        return sentiment_analyzer.score_encoded(tokenizer.pad({'input_ids': windows}, return_tensors='np'))
+    
+    import torch
+    
+    model = sentiment_analyzer.model
+    encoded = tokenizer.pad({'input_ids': windows}, return_tensors='pt')
+    with torch.no_grad():
+        logits = model(
+            input_ids=encoded['input_ids'].to(model.device),
+            attention_mask=encoded['attention_mask'].to(model.device)
+        ).logits
+    probabilities = torch.softmax(logits.float(), dim=-1).tolist()
+    return [
+        [{'label': model.config.id2label[j], 'score': score} for j, score in enumerate(row)]
+        for row in probabilities
+    ]
+
+def score_window(ids):
+    """
+    Get the raw label scores for a single token window.
+    
+    Args:
+        ids (list): Input ids, special tokens included
         
-        return {
-            'label': label,
-            'confidence': confidence
-        }
+    Returns:
+        list: Label/score dicts, or None if the model failed
+    """
+    try:
+        return score_windows([ids])[0]
+    except Exception as e:
+        logging.error(f"Sentiment analysis failed: {e}")
+        return None
+
+def score_text(text):
+    """
+    Get the raw label scores for a single text.
+    
+    Args:
+        text (str): Text to score
         
+    Returns:
+        list: Label/score dicts, or None if the model failed
+    """
+    try:
+        results = sentiment_analyzer(text)
+        return results[0] if isinstance(results[0], list) else results
     except Exception as e:
         logging.error(f"Sentiment analysis failed: {e}")
-        return {'label': 'Neutral', 'confidence': 0.5}
+        return None
+
+def analyze_sentiment_cascade(texts, batch_size=None, max_tokens=None, threshold=None):
+    """
+    Analyze sentiment with a lexicon first and the transformer only when unsure.
+    
+    Every text is scored by the lexicon classifier; those at or above the
+    confidence threshold keep that result and the rest go through one
+    batched transformer pass. Each result records the tier that produced
+    it ('lexicon', 'transformer', or 'default' for short/empty texts).
+    
+    Args:
+        texts (list): Texts to analyze
+        batch_size (int): Max texts per forward pass for the transformer tier
+        max_tokens (int): Padded tokens per forward pass for the transformer tier
+        threshold (float): Minimum lexicon confidence (defaults to Config.CASCADE_THRESHOLD)
+        
+    Returns:
+        list: Sentiment results with label, confidence and tier, in input order
+    """
+    threshold = Config.CASCADE_THRESHOLD if threshold is None else threshold
+    results = [None] * len(texts)
+    uncertain = []
+    
+    for i, text in enumerate(texts):
+        if not text or len(text.strip()) < 3:
+            results[i] = {'label': 'Neutral', 'confidence': 0.5, 'tier': 'default'}
+            continue
+        
+        result = score_lexicon(text)
+        if result['confidence'] >= threshold:
+            result['tier'] = 'lexicon'
+            results[i] = result
+        else:
+            uncertain.append(i)
+    
+    if uncertain:
+        model_results = analyze_sentiment_batch([texts[i] for i in uncertain], batch_size, max_tokens, cascade=False)
+        for i, result in zip(uncertain, model_results):
+            result['tier'] = 'transformer'
+            results[i] = result
+    
+    with cascade_stats_lock:
+        for result in results:
+            cascade_stats[result['tier']] += 1
+    
+    return results
+
+def get_cascade_stats():
+    """
+    Report how much traffic each cascade tier has handled.
+    
+    Returns:
+        dict: Per-tier counts and percentages since startup
+    """
+    with cascade_stats_lock:
+        counts = dict(cascade_stats)
+    
+    total = sum(counts.values())
+    return {
+        'counts': counts,
+        'percentages': {
+            tier: round(count / total * 100, 1) if total else 0.0 for tier, count in counts.items()
+        },
+        'total': total
+    }
+
+def get_sentiment_cache():
+    """
+    Get the sentiment result cache, creating it on first use.
+    
+    Returns:
+        ResultCache: Shared cache, or None when Config.SENTIMENT_CACHE_SIZE is 0
+    """
+    global sentiment_cache
+    
+    if sentiment_cache is None and Config.SENTIMENT_CACHE_SIZE > 0:
+        sentiment_cache = ResultCache(
+            max_size=Config.SENTIMENT_CACHE_SIZE,
+            db_path=Config.SENTIMENT_CACHE_DB or None,
+            table='sentiment_cache'
+        )
+    return sentiment_cache
+
+def get_model_id():
+    """
+    Identify the loaded sentiment model for cache keys.
+    
+    Returns:
+        str: Backend, model name and revision of the active analyzer
+    """
+    model_id = getattr(sentiment_analyzer, 'model_id', None)
+    if model_id is None:
+        config = getattr(getattr(sentiment_analyzer, 'model', None), 'config', None)
+        name = getattr(config, '_name_or_path', get_sentiment_model_name())
+        revision = getattr(config, '_commit_hash', None)
+        model_id = f"{Config.SENTIMENT_BACKEND}:{name}@{revision}"
+    return str(model_id)
+
+def best_sentiment(scores):
+    """
+    Pick the highest scoring label from a model's score list.
+    
+    Args:
+        scores (list): Label/score dicts for a single text
+        
+    Returns:
+        dict: Sentiment result with standardized label and confidence
+    """
+    # Find the highest scoring sentiment
+    best_result = max(scores, key=lambda x: x['score'])
+    
+    # Map labels to standardized format
+    label = map_sentiment_label(best_result['label'])
+    confidence = round(best_result['score'], 3)
+    
+    return {
+        'label': label,
+        'confidence': confidence
+    }
 
 def map_sentiment_label(label):
     """
@@ -0,0 +1,187 @@
+from itertools import islice
+from config import Config
+from pipeline.engine import create_engine
+from pipeline.summarize import generate_ai_insights
+
+def iter_micro_batches(reviews, batch_size):
+    """
+    Cut any iterable of reviews into lists of at most batch_size.
+
+    Args:
+        reviews (iterable): Review texts (e.g. a generator reading a file)
+        batch_size (int): Reviews per micro-batch
+
+    Yields:
+        list: Next micro-batch of reviews
+    """
+    reviews = iter(reviews)
+    while True:
+        batch = list(islice(reviews, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def stream_batches(reviews, engine=None, batch_size=None):
+    """
+    Run reviews through the pipeline one bounded micro-batch at a time.
+
+    Only one micro-batch is held in memory at once; result ids continue
+    across micro-batches as if the whole input had been analyzed together.
+    Duplicates are collapsed within each micro-batch, and repeats across
+    micro-batches are served by the sentiment and translation caches.
+
+    Args:
+        reviews (iterable): Review texts, one per input row
+        engine (PipelineEngine): Engine to run (defaults to create_engine())
+        batch_size (int): Reviews per micro-batch (defaults to Config.STREAM_BATCH_SIZE)
+
+    Yields:
+        PipelineBatch: Each processed micro-batch
+    """
+    engine = engine or create_engine()
+    batch_size = batch_size or Config.STREAM_BATCH_SIZE
+    next_id = 1
+
+    for reviews_batch in iter_micro_batches(reviews, batch_size):
+        yield engine.run(reviews_batch, first_id=next_id)
+        next_id += len(reviews_batch)
+
+def stream_results(reviews, engine=None, batch_size=None):
+    """
+    Run reviews through the pipeline and yield result records as they are ready.
+
+    Args:
+        reviews (iterable): Review texts, one per input row
+        engine (PipelineEngine): Engine to run (defaults to create_engine())
+        batch_size (int): Reviews per micro-batch (defaults to Config.STREAM_BATCH_SIZE)
+
+    Yields:
+        dict: Result record per non-blank row, in input order
+    """
+    for batch in stream_batches(reviews, engine, batch_size):
+        yield from batch.results
+
+class SummaryAggregator:
+    """
+    Build the generate_summary report from results seen one batch at a time.
+
+    Only counts and a handful of sample reviews are kept, so memory does
+    not grow with the number of results.
+    """
+
+    SAMPLES_PER_SENTIMENT = 2
+
+    def __init__(self):
+        self.total_reviews = 0
+        self.analyzed_reviews = 0
+        self.labels = {'Positive': 0, 'Negative': 0, 'Neutral': 0}
+        self.languages = set()
+        self.tiers = {}
+        self.triage = {}
+        self.samples = {'Positive': [], 'Negative': [], 'Neutral': []}
+
+    def add(self, results, unique_reviews=None):
+        """
+        Count a batch of results.
+
+        Args:
+            results (list): Result records
+            unique_reviews (int): Distinct reviews the batch was analyzed as
+                (defaults to len(results))
+        """
+        self.total_reviews += len(results)
+        self.analyzed_reviews += len(results) if unique_reviews is None else unique_reviews
+
+        for result in results:
+            label = result.get('sentiment_label', 'Neutral')
+            self.labels[label] += 1
+            self.languages.add(result['detected_language'])
+            if result.get('sentiment_tier'):
+                self.tiers[result['sentiment_tier']] = self.tiers.get(result['sentiment_tier'], 0) + 1
+            if result.get('triage'):
+                action = result['triage']['action']
+                self.triage[action] = self.triage.get(action, 0) + 1
+            if len(self.samples[label]) < self.SAMPLES_PER_SENTIMENT:
+                self.samples[label].append(result)
+
+    def add_batch(self, batch):
+        """
+        Count a processed micro-batch.
+
+        Args:
+            batch (PipelineBatch): Batch from stream_batches
+        """
+        self.add(batch.results, len(batch.unique_reviews))
+
+    def summary(self):
+        """
+        Produce the summary for everything counted so far.
+
+        Returns:
+            dict: Same fields as generate_summary; 'dedup' counts the
+                duplicates collapsed within micro-batches
+        """
+        if not self.total_reviews:
+            return {
+                'overall_sentiment': 'Neutral',
+                'total_reviews': 0,
+                'distribution': {'Positive': 0, 'Negative': 0, 'Neutral': 0},
+                'insights': 'No reviews to analyze.',
+                'languages_detected': []
+            }
+
+        distribution = {
+            label: round(count / self.total_reviews * 100, 1) for label, count in self.labels.items()
+        }
+        if distribution['Positive'] > 50:
+            overall_sentiment = 'Positive'
+        elif distribution['Negative'] > 50:
+            overall_sentiment = 'Negative'
+        else:
+            overall_sentiment = 'Mixed'
+
+        samples = [sample for label in ('Positive', 'Negative', 'Neutral') for sample in self.samples[label]]
+        summary = {
+            'overall_sentiment': overall_sentiment,
+            'total_reviews': self.total_reviews,
+            'distribution': distribution,
+            'insights': generate_ai_insights(samples, distribution, self.total_reviews),
+            'languages_detected': sorted(self.languages)
+        }
+        if self.tiers:
+            summary['sentiment_tiers'] = dict(self.tiers)
+        if self.triage:
+            summary['triage'] = dict(self.triage)
+            summary['triage']['translations_saved'] = self.triage.get('passthrough', 0) + self.triage.get('skip', 0)
+
+        duplicates = self.total_reviews - self.analyzed_reviews
+        summary['dedup'] = {
+            'total_reviews': self.total_reviews,
+            'unique_reviews': self.analyzed_reviews,
+            'duplicate_reviews': duplicates,
+            'dedup_ratio': round(duplicates / self.total_reviews * 100, 1)
+        }
+        return summary
+
+def run_streaming(reviews, exporter=None, engine=None, batch_size=None, progress=None):
+    """
+    Analyze reviews in micro-batches, handing results to an exporter as they finish.
+
+    Args:
+        reviews (iterable): Review texts, one per input row
+        exporter: Object with write(results), e.g. a CsvStreamExporter (optional)
+        engine (PipelineEngine): Engine to run (defaults to create_engine())
+        batch_size (int): Reviews per micro-batch (defaults to Config.STREAM_BATCH_SIZE)
+        progress (callable): Called with the number of results so far after each micro-batch (optional)
+
+    Returns:
+        dict: Summary of all results (see SummaryAggregator.summary)
+    """
+    aggregator = SummaryAggregator()
+    for batch in stream_batches(reviews, engine, batch_size):
+        aggregator.add_batch(batch)
+        if exporter:
+            exporter.write(batch.results)
+        if progress:
+            progress(aggregator.total_reviews)
+    return aggregator.summary()
@@ -3,11 +3,13 @@ import json
 import logging
 from config import Config
 from pipeline.sentiment import get_sentiment_distribution
+from pipeline.dedup import get_dedup_stats
+from pipeline.triage import get_triage_stats
 
 # Configure Gemini
 if Config.GEMINI_API_KEY:
     genai.configure(api_key=Config.GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-1.5-flash-latest')
+    model = genai.GenerativeModel(Config.GEMINI_MODEL)
 
 def generate_summary(results):
     """
@@ -47,7 +49,7 @@ def generate_summary(results):
         # Generate AI insights if Gemini is available
         insights = generate_ai_insights(results, distribution)
         
-        return {
+        summary = {
             'overall_sentiment': overall_sentiment,
             'total_reviews': total_reviews,
             'distribution': distribution,
@@ -55,6 +57,24 @@ def generate_summary(results):
             'languages_detected': languages
         }
         
+        # Count reviews per cascade tier when the cascade is enabled
+        tiers = {}
+        for result in results:
+            if result.get('sentiment_tier'):
+                tiers[result['sentiment_tier']] = tiers.get(result['sentiment_tier'], 0) + 1
+        if tiers:
+            summary['sentiment_tiers'] = tiers
+        
+        # Translation decisions made by the pre-translation triage
+        triage = get_triage_stats(results)
+        if triage:
+            summary['triage'] = triage
+        
+        # Duplicate reviews are analyzed once and fanned out
+        summary['dedup'] = get_dedup_stats([result['original_text'] for result in results])
+        
+        return summary
+        
     except Exception as e:
         logging.error(f"Summary generation failed: {e}")
         return {
@@ -65,13 +85,14 @@ def generate_summary(results):
             'languages_detected': []
         }
 
-def generate_ai_insights(results, distribution):
+def generate_ai_insights(results, distribution, total_reviews=None):
     """
     Generate AI-powered insights using Gemini API.
     
     Args:
-        results (list): Sentiment analysis results
+        results (list): Sentiment analysis results (or a sample of them)
         distribution (dict): Sentiment distribution
+        total_reviews (int): Number of reviews analyzed (defaults to len(results))
         
     Returns:
         str: Generated insights
@@ -91,7 +112,7 @@ def generate_ai_insights(results, distribution):
         prompt = f"""
         Analyze the following sentiment analysis results and provide insights:
         
-        Total Reviews: {len(results)}
+        Total Reviews: {total_reviews or len(results)}
         Sentiment Distribution: {distribution}
         
         Sample Reviews:
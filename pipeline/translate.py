@@ -1,38 +1,259 @@
-import google.generativeai as genai
 from transformers import pipeline
 import logging
 from config import Config
+from pipeline.batching import token_lengths, run_in_batches
+from pipeline.cache import TranslationMemory
+from pipeline.circuit import get_breaker
+from pipeline.gemini_client import get_gemini_client
+from pipeline.model_pool import ModelPool
+from pipeline.packing import pack_items, build_packed_prompt, parse_packed_response
+from pipeline.sentences import split_sentences, join_segments
+from pipeline.tuning import apply_inference_profile
 
-# Configure Gemini
-if Config.GEMINI_API_KEY:
-    genai.configure(api_key=Config.GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-1.5-flash-latest')
+# Translation memory, created on first use
+translation_memory = None
 
-# Fallback translation models
-translation_cache = {}
+def load_translation_model(model_name, profile=None):
+    """
+    Load a Hugging Face translation pipeline.
+    
+    Args:
+        model_name (str): Model name on the Hugging Face Hub
+        profile (str): 'default' or 'fast' (defaults to Config.TRANSLATION_PROFILE)
+        
+    Returns:
+        Pipeline: Translation pipeline
+    """
+    apply_inference_profile()
+    translator = pipeline("translation", model=model_name)
+    if (profile or Config.TRANSLATION_PROFILE) == 'fast':
+        quantize_translator(translator)
+    return translator
 
-def translate_with_gemini(text, source_lang):
+def quantize_translator(translator):
     """
-    Translate text using Gemini API.
+    Switch a translation pipeline's linear layers to dynamic int8 quantisation.
+    
+    Weights are stored as int8 and activations are quantised on the fly,
+    which speeds up CPU decoding and shrinks the model roughly by half.
+    
+    Args:
+        translator (Pipeline): Translation pipeline, modified in place
+    """
+    import torch
+    
+    translator.model.eval()
+    torch.quantization.quantize_dynamic(translator.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+def get_generation_kwargs(translator, texts, profile=None):
+    """
+    Build decoding settings for a batch under the translation profile.
+    
+    The default profile keeps the model's own decoding settings with a
+    fixed length cap. The fast profile decodes greedily (or with
+    Config.TRANSLATION_NUM_BEAMS beams) and caps new tokens in proportion
+    to the longest input, so short reviews stop early.
+    
+    Args:
+        translator (Pipeline): Translation pipeline
+        texts (list): Batch about to be translated
+        profile (str): 'default' or 'fast' (defaults to Config.TRANSLATION_PROFILE)
+        
+    Returns:
+        dict: Keyword arguments for the pipeline call
+    """
+    if (profile or Config.TRANSLATION_PROFILE) != 'fast':
+        return {'max_length': 512}
+    
+    longest = max(token_lengths(texts, getattr(translator, 'tokenizer', None)), default=0)
+    return {
+        'num_beams': Config.TRANSLATION_NUM_BEAMS,
+        'max_new_tokens': min(512, int(longest * Config.TRANSLATION_LENGTH_RATIO) + 8)
+    }
+
+# Fallback translation models, evicted least recently used first when over the memory budget
+translation_cache = ModelPool(load_translation_model, Config.TRANSLATION_MODEL_MEMORY_MB * 1024 ** 2)
+
+def load_translator(source_lang):
+    """
+    Get the Hugging Face translation pipeline for a language, loading it once.
+    
+    Args:
+        source_lang (str): Source language code
+        
+    Returns:
+        Pipeline: Cached {source_lang}->en translation pipeline
+    """
+    # Create model name based on source language
+    model_name = Config.TRANSLATION_MODEL.format(source_lang)
+    
+    # Use cached translator if available
+    return translation_cache.get(model_name)
+
+def get_memory_model(model_name):
+    """
+    Identify a Marian model in the translation memory.
+    
+    The translation profile is part of the identity, since the fast
+    profile (int8 weights, greedy decoding) produces different output
+    from the default one.
+    
+    Args:
+        model_name (str): Model name on the Hugging Face Hub
+        
+    Returns:
+        str: Model identity for TranslationMemory lookups and stores
+    """
+    return f"{model_name}:{Config.TRANSLATION_PROFILE}"
+
+def get_translation_memory():
+    """
+    Get the persistent translation memory, creating it on first use.
+    
+    Returns:
+        TranslationMemory: Shared store, or None when Config.TRANSLATION_CACHE_SIZE is 0
+    """
+    global translation_memory
+    
+    if translation_memory is None and Config.TRANSLATION_CACHE_SIZE > 0:
+        translation_memory = TranslationMemory(
+            db_path=Config.TRANSLATION_CACHE_DB or None,
+            max_entries=Config.TRANSLATION_CACHE_SIZE,
+            ttl=Config.TRANSLATION_CACHE_TTL or None
+        )
+    return translation_memory
+
+def build_translation_prompt(text, source_lang):
+    """Build the Gemini prompt for translating one text to English."""
+    return f"Translate the following text from {source_lang} to English. Return only the translation without any additional text:\n\n{text}"
+
+def request_gemini_translation(text, source_lang):
+    """
+    Call the Gemini API for one translation, bypassing the translation memory.
     
     Args:
         text (str): Text to translate
         source_lang (str): Source language code
         
     Returns:
-        str: Translated text or original if translation fails
+        str: Translated text or None if translation fails
     """
     try:
-        if not Config.GEMINI_API_KEY:
+        client = get_gemini_client()
+        if client is None:
             raise Exception("Gemini API key not configured")
         
-        prompt = f"Translate the following text from {source_lang} to English. Return only the translation without any additional text:\n\n{text}"
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        return client.generate(build_translation_prompt(text, source_lang)).strip() or None
     except Exception as e:
         logging.warning(f"Gemini translation failed: {e}")
         return None
 
+def request_gemini_translations(texts, source_langs):
+    """
+    Call the Gemini API for many translations concurrently.
+    
+    Requests run on the client's thread pool under its concurrency and
+    requests-per-minute limits, so latency is bounded by the slowest
+    requests rather than the sum of all round trips. With
+    Config.GEMINI_PACK_SIZE above 1, several reviews share each request.
+    
+    Args:
+        texts (list): Texts to translate
+        source_langs (list): Source language code for each text
+        
+    Returns:
+        list: Translated text per input, or None where translation failed
+    """
+    client = get_gemini_client()
+    if client is None:
+        logging.warning("Gemini translation failed: Gemini API key not configured")
+        return [None] * len(texts)
+    
+    if Config.GEMINI_PACK_SIZE > 1 and len(texts) > 1:
+        return request_gemini_translations_packed(client, texts, source_langs)
+    
+    prompts = [build_translation_prompt(text, lang) for text, lang in zip(texts, source_langs)]
+    return [(output or '').strip() or None for output in client.map(prompts)]
+
+def request_gemini_translations_packed(client, texts, source_langs, max_items=None, max_tokens=None):
+    """
+    Translate many texts with several ID-tagged reviews per Gemini request.
+    
+    Packets hold up to max_items reviews within an estimated token budget
+    and ask for a JSON array of translations. When a response is malformed
+    or incomplete, only the missing reviews are retried, split into two
+    smaller packets; a single review that still fails is given up on.
+    Packets whose request failed outright (after the client's retries)
+    are not split, so an outage does not multiply requests.
+    
+    Args:
+        client (GeminiClient): Client to send requests with
+        texts (list): Texts to translate
+        source_langs (list): Source language code for each text
+        max_items (int): Reviews per packet (defaults to Config.GEMINI_PACK_SIZE)
+        max_tokens (int): Estimated prompt tokens per packet (defaults to Config.GEMINI_PACK_TOKENS)
+        
+    Returns:
+        list: Translated text per input, or None where translation failed
+    """
+    results = [None] * len(texts)
+    packets = pack_items(
+        range(len(texts)), texts,
+        max_items or Config.GEMINI_PACK_SIZE,
+        max_tokens or Config.GEMINI_PACK_TOKENS
+    )
+    
+    while packets:
+        prompts = [build_packed_prompt(packet, texts, source_langs) for packet in packets]
+        outputs = client.map(prompts, generation_config={'responseMimeType': 'application/json'})
+        
+        retry = []
+        for packet, output in zip(packets, outputs):
+            if output is None:
+                continue
+            translations = parse_packed_response(output, packet)
+            for i, translation in translations.items():
+                results[i] = translation
+            
+            missing = [i for i in packet if i not in translations]
+            if missing and len(packet) > 1:
+                logging.warning(f"Packed Gemini response missed {len(missing)} of {len(packet)} reviews, retrying them")
+                half = (len(missing) + 1) // 2
+                retry.extend(part for part in (missing[:half], missing[half:]) if part)
+        packets = retry
+    
+    return results
+
+def gemini_available():
+    """Check whether Gemini is configured and its circuit breaker lets requests through."""
+    return bool(Config.GEMINI_API_KEY) and get_breaker('gemini').available()
+
+def translate_with_gemini(text, source_lang):
+    """
+    Translate text using Gemini API.
+    
+    Args:
+        text (str): Text to translate
+        source_lang (str): Source language code
+        
+    Returns:
+        str: Translated text or None if translation fails
+    """
+    if not Config.GEMINI_API_KEY:
+        logging.debug("Gemini translation skipped: Gemini API key not configured")
+        return None
+    
+    memory = get_translation_memory()
+    if memory is not None:
+        cached = memory.get(text, source_lang, 'gemini', Config.GEMINI_MODEL)
+        if cached:
+            return cached
+    
+    translated = request_gemini_translation(text, source_lang)
+    if translated and memory is not None:
+        memory.put(text, source_lang, translated, 'gemini', Config.GEMINI_MODEL)
+    return translated
+
 def translate_with_huggingface(text, source_lang):
     """
     Translate text using Hugging Face transformers.
@@ -42,27 +263,269 @@ def translate_with_huggingface(text, source_lang):
         source_lang (str): Source language code
         
     Returns:
-        str: Translated text or original if translation fails
+        str: Translated text or None if translation fails
     """
+    model_name = Config.TRANSLATION_MODEL.format(source_lang)
+    memory = get_translation_memory()
+    if memory is not None:
+        cached = memory.get(text, source_lang, 'huggingface', get_memory_model(model_name))
+        if cached:
+            return cached
+    
+    # Skip models that keep failing (e.g. no opus-mt model for this language)
+    breaker = get_breaker(model_name)
+    if not breaker.allow_request():
+        return None
+    
     try:
-        # Create model name based on source language
-        model_name = f"Helsinki-NLP/opus-mt-{source_lang}-en"
-        
-        # Use cached translator if available
-        if model_name not in translation_cache:
-            translation_cache[model_name] = pipeline("translation", model=model_name)
+        translator = load_translator(source_lang)
+    except Exception as e:
+        breaker.record_failure()
+        logging.warning(f"HuggingFace translation failed for {source_lang}: {e}")
+        return None
+    
+    translated = run_translator(translator, text, source_lang)
+    if translated is None:
+        breaker.record_failure()
+        return None
+    
+    breaker.record_success()
+    if memory is not None:
+        memory.put(text, source_lang, translated, 'huggingface', get_memory_model(model_name))
+    return translated
+
+def run_translator(translator, text, source_lang):
+    """
+    Translate one text with a loaded Marian pipeline.
+    
+    Leaves the circuit breaker alone, so callers that already hold the
+    breaker's permission can record a single outcome themselves.
+    
+    Args:
+        translator (Pipeline): Translation pipeline for source_lang
+        text (str): Text to translate
+        source_lang (str): Source language code
         
-        translator = translation_cache[model_name]
-        result = translator(text, max_length=512)
+    Returns:
+        str: Translated text or None if translation fails
+    """
+    try:
+        result = translator(text, **get_generation_kwargs(translator, [text]))
         return result[0]['translation_text']
     except Exception as e:
         logging.warning(f"HuggingFace translation failed for {source_lang}: {e}")
         return None
 
+def translate_with_huggingface_batch(texts, source_lang, max_tokens=None, batch_size=None):
+    """
+    Translate many texts from one language using token-budgeted batches.
+    
+    Args:
+        texts (list): Texts to translate, all in source_lang
+        source_lang (str): Source language code
+        max_tokens (int): Padded tokens per forward pass (defaults to Config.MAX_BATCH_TOKENS)
+        batch_size (int): Max texts per forward pass (defaults to Config.TRANSLATION_BATCH_SIZE)
+        
+    Returns:
+        list: Translated text per input, or None where translation failed
+    """
+    results = [None] * len(texts)
+    model_name = Config.TRANSLATION_MODEL.format(source_lang)
+    
+    # Serve known translations with one lookup; only decode the rest
+    memory = get_translation_memory()
+    if memory is not None:
+        for i, translated in memory.get_many(texts, [source_lang] * len(texts), 'huggingface', get_memory_model(model_name)).items():
+            results[i] = translated
+    pending = [i for i, translated in enumerate(results) if translated is None]
+    if not pending:
+        return results
+    
+    breaker = get_breaker(model_name)
+    if not breaker.allow_request():
+        return results
+    
+    try:
+        translator = load_translator(source_lang)
+    except Exception as e:
+        breaker.record_failure()
+        logging.warning(f"HuggingFace translation failed for {source_lang}: {e}")
+        return results
+    
+    def translate_batch(batch_texts):
+        try:
+            outputs = translator(batch_texts, batch_size=len(batch_texts), **get_generation_kwargs(translator, batch_texts))
+            return [output['translation_text'] for output in outputs]
+        except Exception as e:
+            logging.warning(f"Batched HuggingFace translation failed for {source_lang}, retrying items individually: {e}")
+            return [run_translator(translator, text, source_lang) for text in batch_texts]
+    
+    pending_texts = [texts[i] for i in pending]
+    lengths = token_lengths(pending_texts, getattr(translator, 'tokenizer', None))
+    translated = run_in_batches(pending_texts, translate_batch, lengths, max_tokens, batch_size or Config.TRANSLATION_BATCH_SIZE)
+    
+    # One outcome per call, however many batches or per-item retries it took
+    done = []
+    for i, text in zip(pending, translated):
+        results[i] = text
+        if text:
+            done.append(i)
+    if done:
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+    if memory is not None and done:
+        memory.put_many([texts[i] for i in done], [source_lang] * len(done), [results[i] for i in done], 'huggingface', get_memory_model(model_name))
+    
+    return results
+
+def fill_translations(results):
+    """
+    Translate results that were analyzed without translation.
+    
+    Used in 'direct' pipeline mode, where translation is only needed for
+    display or export. Results are updated in place.
+    
+    Args:
+        results (list): Result records with original_text, detected_language and translated_text
+        
+    Returns:
+        list: The same results, with translated_text filled for non-English reviews
+    """
+    pending = [
+        result for result in results
+        if result.get('detected_language', 'en') != 'en' and not result.get('translated_text')
+        and result.get('triage', {}).get('action', 'translate') == 'translate'
+    ]
+    translated = translate_texts(
+        [result['original_text'] for result in pending],
+        [result.get('triage', {}).get('translation_lang', result['detected_language']) for result in pending]
+    )
+    for result, text in zip(pending, translated):
+        result['translated_text'] = text
+    return results
+
+def translate_texts(texts, source_langs):
+    """
+    Translate many texts to English, batching Marian models per language.
+    
+    Gemini is tried first for each text when configured, with whole
+    reviews so each keeps its context and costs one item per request.
+    Whatever is left goes through translate_with_huggingface_texts, so a
+    mixed upload costs a few batched decoder runs per language instead of
+    one run per review.
+    
+    Args:
+        texts (list): Texts to translate
+        source_langs (list): Source language code for each text
+        
+    Returns:
+        list: Translated text per input, or the original text for English
+            input or when all translation methods fail
+    """
+    results = list(texts)
+    pending = [
+        i for i, (text, lang) in enumerate(zip(texts, source_langs))
+        if lang != 'en' and text.strip()
+    ]
+    
+    # Try Gemini first, serving known translations from the translation memory in one lookup
+    if gemini_available():
+        memory = get_translation_memory()
+        cached = {}
+        if memory is not None:
+            cached = memory.get_many([texts[i] for i in pending], [source_langs[i] for i in pending], 'gemini', Config.GEMINI_MODEL)
+        for position, i in enumerate(pending):
+            if position in cached:
+                results[i] = cached[position]
+        
+        # Translate the misses concurrently
+        pending = [i for position, i in enumerate(pending) if position not in cached]
+        translated = request_gemini_translations([texts[i] for i in pending], [source_langs[i] for i in pending])
+        remaining = []
+        translated_now = []
+        for i, text in zip(pending, translated):
+            if text:
+                results[i] = text
+                translated_now.append(i)
+            else:
+                remaining.append(i)
+        pending = remaining
+        
+        if memory is not None and translated_now:
+            memory.put_many(
+                [texts[i] for i in translated_now],
+                [source_langs[i] for i in translated_now],
+                [results[i] for i in translated_now],
+                'gemini', Config.GEMINI_MODEL
+            )
+    
+    # Fallback to HuggingFace
+    translated = translate_with_huggingface_texts([texts[i] for i in pending], [source_langs[i] for i in pending])
+    for i, text in zip(pending, translated):
+        if text:
+            results[i] = text
+        else:
+            logging.warning(f"All translation methods failed for language {source_langs[i]}")
+    
+    return results
+
+def translate_with_huggingface_texts(texts, source_langs):
+    """
+    Translate texts in any mix of languages with Marian, one batched pass per language.
+    
+    Long texts (over Config.TRANSLATION_SPLIT_MIN_CHARS) are split into
+    sentences first, and the sentences of every review are translated
+    together in shared batches before being joined back in order. This
+    keeps each sequence short, so cost grows linearly with review length
+    and Marian never truncates a review.
+    
+    Args:
+        texts (list): Texts to translate, none of them English
+        source_langs (list): Source language code for each text
+        
+    Returns:
+        list: Translated text per input, or None where translation failed
+    """
+    segments = []
+    segment_langs = []
+    layout = []
+    for text, lang in zip(texts, source_langs):
+        parts = [(text, '')]
+        if Config.TRANSLATION_SPLIT_SENTENCES and len(text) > Config.TRANSLATION_SPLIT_MIN_CHARS:
+            parts = split_sentences(text, Config.TRANSLATION_SEGMENT_MAX_CHARS) or parts
+        layout.append((len(segments), [separator for _, separator in parts]))
+        segments.extend(segment for segment, _ in parts)
+        segment_langs.extend([lang] * len(parts))
+    
+    groups = {}
+    for i, lang in enumerate(segment_langs):
+        groups.setdefault(lang, []).append(i)
+    
+    translated = [None] * len(segments)
+    for lang, indices in groups.items():
+        for i, text in zip(indices, translate_with_huggingface_batch([segments[i] for i in indices], lang)):
+            translated[i] = text
+    
+    # Sentences that failed keep their original wording; a text fails only if every sentence did
+    results = []
+    for start, separators in layout:
+        parts = translated[start:start + len(separators)]
+        if not any(parts):
+            results.append(None)
+            continue
+        originals = segments[start:start + len(separators)]
+        results.append(join_segments([part or original for part, original in zip(parts, originals)], separators))
+    return results
+
 def translate_text(text, source_lang):
     """
     Translate text to English using Gemini API with HuggingFace fallback.
     
+    Backends whose circuit breaker is open are skipped, so during an
+    outage new work goes straight to the healthy backend instead of
+    waiting on timeouts.
+    
     Args:
         text (str): Text to translate
         source_lang (str): Source language code
@@ -73,10 +536,15 @@ def translate_text(text, source_lang):
     if source_lang == 'en' or not text.strip():
         return text
     
+    # Long reviews go through the batched path, which splits them into sentences for Marian
+    if Config.TRANSLATION_SPLIT_SENTENCES and len(text) > Config.TRANSLATION_SPLIT_MIN_CHARS:
+        return translate_texts([text], [source_lang])[0]
+    
     # Try Gemini first
-    translated = translate_with_gemini(text, source_lang)
-    if translated:
-        return translated
+    if get_breaker('gemini').available():
+        translated = translate_with_gemini(text, source_lang)
+        if translated:
+            return translated
     
     # Fallback to HuggingFace
     translated = translate_with_huggingface(text, source_lang)
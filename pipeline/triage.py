@@ -0,0 +1,218 @@
+import re
+from config import Config
+from pipeline.circuit import get_breaker
+from pipeline.lexicon import POSITIVE_WORDS, NEGATIVE_WORDS
+from pipeline.translate import translate_texts
+
+# Source languages known to have a Helsinki-NLP/opus-mt-{lang}-en model
+MARIAN_LANGUAGES = {
+    'af', 'ar', 'bg', 'ca', 'cs', 'cy', 'da', 'de', 'es', 'et', 'eu', 'fi', 'fr', 'ga', 'gl', 'hi',
+    'hu', 'hy', 'id', 'is', 'it', 'ja', 'ka', 'ko', 'mk', 'ml', 'mr', 'nl', 'pl', 'ru', 'sk', 'sq',
+    'sv', 'sw', 'th', 'tl', 'tr', 'uk', 'ur', 'vi', 'zh'
+}
+
+# langdetect codes that differ from the opus-mt model codes
+LANGUAGE_ALIASES = {'zh-cn': 'zh', 'zh-tw': 'zh'}
+
+# Common English function words; words that are also common in other
+# Latin-script languages (e.g. 'a', 'i', 'to', 'was', 'my', and Dutch,
+# German or Scandinavian 'is', 'an', 'for', 'had', 'of') are left out
+ENGLISH_MARKERS = {
+    'and', 'are', 'been', 'but', 'could', 'has', 'have', 'it', "it's", 'its', 'not', 'should',
+    'that', 'the', 'their', 'there', 'they', 'this', 'too', 'very', 'were', 'what', 'which',
+    'with', 'would', 'you'
+}
+
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+def ascii_share(text):
+    """
+    Measure the share of non-space characters that are ASCII.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        float: Share between 0 and 1 (1 for empty text)
+    """
+    characters = [char for char in text if not char.isspace()]
+    if not characters:
+        return 1.0
+    return sum(char.isascii() for char in characters) / len(characters)
+
+def english_share(text):
+    """
+    Measure the share of words that are common English function words or
+    English sentiment words from the lexicon.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        float: Share between 0 and 1
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return 0.0
+    english_words = ENGLISH_MARKERS | POSITIVE_WORDS | NEGATIVE_WORDS
+    return sum(word in english_words for word in words) / len(words)
+
+def english_marker_count(text):
+    """
+    Count the distinct English function words in a text.
+
+    Lexicon words are not counted: many of them ('problem', 'super',
+    'perfect') are shared with other languages.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        int: Number of distinct words from ENGLISH_MARKERS
+    """
+    return len(ENGLISH_MARKERS.intersection(WORD_PATTERN.findall(text.lower())))
+
+def looks_english(text, probability):
+    """
+    Decide whether ASCII text is English the detector mislabeled.
+
+    The word share alone is not enough: a confident detection of a short
+    text such as "Dit is slecht" or "Kein Problem" is usually right. So
+    unless the detector was unsure, the text must also be long enough and
+    contain several distinct English function words.
+
+    Args:
+        text (str): Input text
+        probability (float): Detector probability for the detected language
+
+    Returns:
+        bool: Whether the text should be treated as English
+    """
+    if english_share(text) < Config.TRIAGE_ENGLISH_SHARE:
+        return False
+    if probability < Config.TRIAGE_MIN_CONFIDENCE:
+        return True
+    return (len(text.split()) >= Config.TRIAGE_ENGLISH_MIN_WORDS
+            and english_marker_count(text) >= Config.TRIAGE_ENGLISH_MIN_MARKERS)
+
+def triage_translation(text, lang, probability, gemini_ready=False):
+    """
+    Decide whether a review needs translation before sentiment analysis.
+
+    ASCII text full of English words (see looks_english), and short ASCII text that
+    the detector was unsure about or tagged with a language we have no
+    known model for, is passed through as English (langdetect often tags
+    short English reviews as 'so', 'af' or similar). Other languages are
+    translated by Gemini when it is available, otherwise by Marian; once a
+    language's Marian model is known to fail (its circuit breaker is open)
+    its reviews are skipped instead of failing every backend in turn.
+
+    Args:
+        text (str): Review text
+        lang (str): Detected language code
+        probability (float): Detector probability for lang
+        gemini_ready (bool): Whether Gemini can take translations
+
+    Returns:
+        dict: Decision with action ('none', 'passthrough', 'translate' or
+            'skip'), reason, route, the language code to translate from and
+            the signals used
+    """
+    decision = {
+        'action': 'translate',
+        'reason': None,
+        'route': None,
+        'detected_language': lang,
+        'translation_lang': LANGUAGE_ALIASES.get(lang, lang),
+        'probability': round(probability, 3),
+        'ascii_share': round(ascii_share(text), 3)
+    }
+
+    if lang == 'en':
+        decision.update(action='none', reason='english')
+        return decision
+
+    if decision['ascii_share'] >= Config.TRIAGE_ASCII_SHARE:
+        if looks_english(text, probability):
+            decision.update(action='passthrough', reason='english_words')
+            return decision
+        if len(text.split()) <= 3:
+            if probability < Config.TRIAGE_MIN_CONFIDENCE:
+                decision.update(action='passthrough', reason='low_confidence_ascii')
+                return decision
+            if decision['translation_lang'] not in MARIAN_LANGUAGES:
+                decision.update(action='passthrough', reason='unlikely_language')
+                return decision
+
+    marian_known = decision['translation_lang'] in MARIAN_LANGUAGES
+    marian_ready = get_breaker(Config.TRANSLATION_MODEL.format(decision['translation_lang'])).available()
+    if gemini_ready:
+        decision.update(reason='gemini', route='gemini+marian' if marian_ready else 'gemini')
+    elif marian_ready:
+        decision.update(reason='marian' if marian_known else 'marian_unverified', route='marian')
+    else:
+        decision.update(action='skip', reason='no_translation_model')
+    return decision
+
+def triage_reviews(texts, detections, gemini_ready=False):
+    """
+    Triage many reviews.
+
+    Args:
+        texts (list): Review texts
+        detections (list): (language code, probability) per review
+        gemini_ready (bool): Whether Gemini can take translations
+
+    Returns:
+        list: Decision per review (see triage_translation)
+    """
+    if not Config.TRIAGE_ENABLED:
+        return [
+            {'action': 'none' if lang == 'en' else 'translate', 'reason': 'triage_disabled', 'route': None,
+             'detected_language': lang, 'translation_lang': lang, 'probability': round(probability, 3)}
+            for lang, probability in detections
+        ]
+    return [
+        triage_translation(text, lang, probability, gemini_ready)
+        for text, (lang, probability) in zip(texts, detections)
+    ]
+
+def get_triage_stats(results):
+    """
+    Count triage decisions across results.
+
+    Args:
+        results (list): Result records carrying a 'triage' decision
+
+    Returns:
+        dict: Count per action plus how many translations were avoided
+    """
+    counts = {}
+    for result in results:
+        triage = result.get('triage')
+        if triage:
+            counts[triage['action']] = counts.get(triage['action'], 0) + 1
+    if counts:
+        counts['translations_saved'] = counts.get('passthrough', 0) + counts.get('skip', 0)
+    return counts
+
+def translate_triaged(texts, decisions):
+    """
+    Translate only the reviews triaged for translation.
+
+    Args:
+        texts (list): Review texts
+        decisions (list): Triage decision per review
+
+    Returns:
+        list: Translated text per review, or None where no translation was needed
+    """
+    translations = [None] * len(texts)
+    pending = [i for i, decision in enumerate(decisions) if decision['action'] == 'translate']
+    translated = translate_texts(
+        [texts[i] for i in pending],
+        [decisions[i]['translation_lang'] for i in pending]
+    )
+    for i, text in zip(pending, translated):
+        translations[i] = text
+    return translations
@@ -0,0 +1,380 @@
+import difflib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from config import Config
+
+# Whether this process has already applied the saved profile
+profile_applied = False
+
+def load_inference_profile(path=None):
+    """
+    Read a saved autotune profile.
+
+    Args:
+        path (str): Profile file (defaults to Config.INFERENCE_PROFILE_PATH)
+
+    Returns:
+        dict: Profile settings, or None if there is no usable profile
+    """
+    path = path or Config.INFERENCE_PROFILE_PATH
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable inference profile {path}: {e}")
+        return None
+
+def save_inference_profile(profile, path=None):
+    """
+    Write an autotune profile.
+
+    Args:
+        profile (dict): Profile settings
+        path (str): Profile file (defaults to Config.INFERENCE_PROFILE_PATH)
+    """
+    path = path or Config.INFERENCE_PROFILE_PATH
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+
+def apply_inference_profile(path=None):
+    """
+    Apply the saved thread and batch-size profile once per process.
+
+    Called by the pipeline modules before loading a model. Thread counts
+    and batch sizes set explicitly through environment variables take
+    precedence over the profile, and the configured thread counts reach
+    torch even when there is no profile.
+
+    Args:
+        path (str): Profile file (defaults to Config.INFERENCE_PROFILE_PATH)
+    """
+    global profile_applied
+
+    if profile_applied:
+        return
+    profile_applied = True
+
+    profile = load_inference_profile(path)
+    if not profile:
+        # Thread counts from the environment still apply without a profile
+        set_torch_threads(Config.INTRA_OP_THREADS, Config.INTER_OP_THREADS)
+        return
+
+    if 'INTRA_OP_THREADS' not in os.environ and profile.get('intra_op_threads'):
+        Config.INTRA_OP_THREADS = profile['intra_op_threads']
+    if 'INTER_OP_THREADS' not in os.environ and profile.get('inter_op_threads'):
+        Config.INTER_OP_THREADS = profile['inter_op_threads']
+    if 'SENTIMENT_BATCH_SIZE' not in os.environ and profile.get('sentiment_batch_size'):
+        Config.SENTIMENT_BATCH_SIZE = profile['sentiment_batch_size']
+    if 'TRANSLATION_BATCH_SIZE' not in os.environ and profile.get('translation_batch_size'):
+        Config.TRANSLATION_BATCH_SIZE = profile['translation_batch_size']
+
+    set_torch_threads(Config.INTRA_OP_THREADS, Config.INTER_OP_THREADS)
+    logging.info(f"Applied inference profile: {profile}")
+
+def set_torch_threads(intra_op_threads, inter_op_threads):
+    """
+    Set torch's intra-op and inter-op thread pools.
+
+    Args:
+        intra_op_threads (int): Threads inside one operator (0 keeps the default)
+        inter_op_threads (int): Threads across operators (0 keeps the default)
+    """
+    try:
+        import torch
+    except ImportError:
+        return
+
+    if intra_op_threads:
+        torch.set_num_threads(intra_op_threads)
+    if inter_op_threads:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError as e:
+            # Only allowed before the first inter-op parallel work
+            logging.warning(f"Could not set inter-op threads: {e}")
+
+def run_trial(intra_op_threads, inter_op_threads, batch_sizes, texts, texts_by_lang, repeat):
+    """
+    Time the models under one thread setting across batch sizes.
+
+    Runs in a fresh process so the thread pools can be configured before
+    torch does any work.
+
+    Returns:
+        dict: Batch size -> {'sentiment': seconds, 'translation': seconds or None}
+    """
+    global profile_applied
+    import pipeline.sentiment as sentiment
+    import pipeline.translate as translate
+
+    profile_applied = True
+    # Every timed run must reach the models, not the caches
+    Config.SENTIMENT_CACHE_SIZE = 0
+    Config.TRANSLATION_CACHE_SIZE = 0
+    sentiment.sentiment_cache = None
+    translate.translation_memory = None
+    set_torch_threads(intra_op_threads, inter_op_threads)
+
+    sentiment.initialize_sentiment_analyzer()
+    translators = {}
+    for lang in texts_by_lang:
+        try:
+            translators[lang] = translate.load_translator(lang)
+        except Exception as e:
+            logging.warning(f"Skipping translation benchmark for {lang}: {e}")
+
+    def best_time(run):
+        run()  # Warm-up
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    timings = {}
+    for batch_size in batch_sizes:
+        sentiment_time = best_time(lambda: sentiment.analyze_sentiment_batch(texts, batch_size=batch_size))
+        translation_time = None
+        if translators:
+            translation_time = best_time(lambda: [
+                translate.translate_with_huggingface_batch(lang_texts, lang, batch_size=batch_size)
+                for lang, lang_texts in texts_by_lang.items() if lang in translators
+            ])
+        timings[batch_size] = {'sentiment': sentiment_time, 'translation': translation_time}
+
+    return timings
+
+def autotune(texts, texts_by_lang, thread_grid, interop_grid, batch_sizes, repeat=3):
+    """
+    Benchmark the grid of thread and batch settings and pick the fastest.
+
+    Thread settings are process-wide, so for each (intra, inter) pair the
+    best sentiment and translation batch sizes are chosen independently
+    and the pair with the lowest combined time wins.
+
+    Args:
+        texts (list): English texts for the sentiment model
+        texts_by_lang (dict): Source language -> texts for its Marian model
+        thread_grid (list): Intra-op thread counts to try
+        interop_grid (list): Inter-op thread counts to try
+        batch_sizes (list): Batch sizes to try
+        repeat (int): Timed runs per setting (the fastest is kept)
+
+    Returns:
+        dict: Profile with the chosen settings and all measurements
+    """
+    context = multiprocessing.get_context('spawn')
+    best = None
+    measurements = []
+
+    for intra in thread_grid:
+        for inter in interop_grid:
+            with context.Pool(1) as pool:
+                timings = pool.apply(run_trial, (intra, inter, batch_sizes, texts, texts_by_lang, repeat))
+
+            sentiment_batch = min(timings, key=lambda b: timings[b]['sentiment'])
+            translated = {b: t['translation'] for b, t in timings.items() if t['translation'] is not None}
+            translation_batch = min(translated, key=translated.get) if translated else None
+            total = timings[sentiment_batch]['sentiment'] + (translated[translation_batch] if translated else 0.0)
+
+            measurements.append({
+                'intra_op_threads': intra,
+                'inter_op_threads': inter,
+                'timings': {str(b): t for b, t in timings.items()},
+                'total_seconds': round(total, 4)
+            })
+            logging.info(f"threads={intra}/{inter}: {total:.3f}s")
+
+            if best is None or total < best['total_seconds']:
+                best = {
+                    'intra_op_threads': intra,
+                    'inter_op_threads': inter,
+                    'sentiment_batch_size': sentiment_batch,
+                    'translation_batch_size': translation_batch,
+                    'total_seconds': round(total, 4),
+                    'sentiment_texts_per_second': round(len(texts) / timings[sentiment_batch]['sentiment'], 1)
+                }
+
+    best['measurements'] = measurements
+    return best
+
+def benchmark_translation_profiles(texts, source_lang, batch_size=None, repeat=3):
+    """
+    Compare the default and fast translation profiles on one Marian model.
+
+    Both profiles translate the same texts in batches of batch_size. Speed
+    is reported as output tokens per second, and agreement as the share of
+    identical translations and the mean word-level similarity of the fast
+    output to the default output.
+
+    Args:
+        texts (list): Texts in source_lang
+        source_lang (str): Source language code
+        batch_size (int): Texts per batch (defaults to Config.TRANSLATION_BATCH_SIZE)
+        repeat (int): Timed runs per profile (the fastest is kept)
+
+    Returns:
+        dict: Per-profile timings, speedup and agreement
+    """
+    import pipeline.translate as translate
+    from pipeline.batching import token_lengths
+    from pipeline.model_pool import model_size_bytes
+
+    batch_size = batch_size or Config.TRANSLATION_BATCH_SIZE
+    model_name = Config.TRANSLATION_MODEL.format(source_lang)
+    report = {'model': model_name, 'texts': len(texts)}
+    outputs = {}
+
+    for profile in ('default', 'fast'):
+        translator = translate.load_translation_model(model_name, profile)
+
+        def run():
+            results = []
+            for start in range(0, len(texts), batch_size):
+                batch = texts[start:start + batch_size]
+                kwargs = translate.get_generation_kwargs(translator, batch, profile)
+                results.extend(output['translation_text'] for output in translator(batch, batch_size=len(batch), **kwargs))
+            return results
+
+        outputs[profile] = run()  # Warm-up
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+        seconds = min(timings)
+        output_tokens = sum(token_lengths(outputs[profile], getattr(translator, 'tokenizer', None)))
+        report[profile] = {
+            'seconds': round(seconds, 4),
+            'tokens_per_second': round(output_tokens / seconds, 1) if seconds else None,
+            'model_mb': round(model_size_bytes(translator) / 1024 ** 2, 1)
+        }
+        del translator
+
+    pairs = list(zip(outputs['default'], outputs['fast']))
+    report['speedup'] = round(report['default']['seconds'] / report['fast']['seconds'], 2) if report['fast']['seconds'] else None
+    report['agreement'] = {
+        'exact_match': round(sum(a == b for a, b in pairs) / len(pairs), 3) if pairs else None,
+        'word_similarity': round(
+            sum(difflib.SequenceMatcher(None, a.split(), b.split()).ratio() for a, b in pairs) / len(pairs), 3
+        ) if pairs else None
+    }
+    return report
+
+def benchmark_language_detection(texts, repeat=3):
+    """
+    Compare langdetect with the vectorised batch detector.
+
+    Both detectors label the same texts; speed is reported as texts per
+    second and agreement as the share of texts given the same language,
+    overall and per langdetect language, with the most common
+    disagreements.
+
+    Args:
+        texts (list): Texts to detect
+        repeat (int): Timed runs of the batch detector (the fastest is kept)
+
+    Returns:
+        dict: Per-detector timings, speedup and agreement
+    """
+    from pipeline import detect
+
+    report = {'texts': len(texts)}
+
+    # The reference is plain langdetect, without the script fast path
+    fast_path = Config.DETECT_SCRIPT_FAST_PATH
+    Config.DETECT_SCRIPT_FAST_PATH = False
+    try:
+        start = time.perf_counter()
+        reference = [detect.detect_language(text) for text in texts]
+        seconds = time.perf_counter() - start
+    finally:
+        Config.DETECT_SCRIPT_FAST_PATH = fast_path
+    report['langdetect'] = {
+        'seconds': round(seconds, 4),
+        'texts_per_second': round(len(texts) / seconds, 1) if seconds else None
+    }
+
+    detect.get_batch_detector()  # Load the profiles outside the timing
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        batch = detect.detect_languages_batch(texts)
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+    report['batch'] = {
+        'seconds': round(seconds, 4),
+        'texts_per_second': round(len(texts) / seconds, 1) if seconds else None
+    }
+    report['speedup'] = round(report['langdetect']['seconds'] / seconds, 2) if seconds else None
+
+    by_language = {}
+    confusions = {}
+    for expected, found in zip(reference, batch):
+        stats = by_language.setdefault(expected, {'texts': 0, 'agree': 0})
+        stats['texts'] += 1
+        if expected == found:
+            stats['agree'] += 1
+        else:
+            key = f"{expected}->{found}"
+            confusions[key] = confusions.get(key, 0) + 1
+
+    report['agreement'] = {
+        'overall': round(sum(a == b for a, b in zip(reference, batch)) / len(texts), 3) if texts else None,
+        'by_language': {
+            lang: {'texts': stats['texts'], 'agreement': round(stats['agree'] / stats['texts'], 3)}
+            for lang, stats in sorted(by_language.items())
+        },
+        'confusions': dict(sorted(confusions.items(), key=lambda item: -item[1])[:10])
+    }
+    return report
+
+def benchmark_parallel_detection(texts, worker_counts, chunk_size=None):
+    """
+    Measure language detection throughput for several pool sizes.
+
+    Each pool is started and warmed up (profiles loaded in every worker)
+    before it is timed, so the figures show steady-state throughput.
+
+    Args:
+        texts (list): Texts to detect
+        worker_counts (list): Worker process counts to try
+        chunk_size (int): Texts per task (defaults to Config.DETECT_CHUNK_SIZE)
+
+    Returns:
+        dict: Seconds, texts per second and scaling over one worker per count
+    """
+    from pipeline import detect_pool
+
+    chunk_size = chunk_size or Config.DETECT_CHUNK_SIZE
+    min_texts = Config.DETECT_PARALLEL_MIN_TEXTS
+    Config.DETECT_PARALLEL_MIN_TEXTS = 0
+    report = {'texts': len(texts), 'engine': Config.DETECT_ENGINE, 'workers': {}}
+    try:
+        for workers in worker_counts:
+            detect_pool.detect_languages_parallel(texts[:chunk_size * workers], workers, chunk_size)  # Warm-up
+            start = time.perf_counter()
+            detect_pool.detect_languages_parallel(texts, workers, chunk_size)
+            seconds = time.perf_counter() - start
+            report['workers'][workers] = {
+                'seconds': round(seconds, 4),
+                'texts_per_second': round(len(texts) / seconds, 1) if seconds else None
+            }
+    finally:
+        Config.DETECT_PARALLEL_MIN_TEXTS = min_texts
+        detect_pool.shutdown_detection_pool()
+
+    baseline = report['workers'].get(1, {}).get('texts_per_second')
+    for stats in report['workers'].values():
+        stats['scaling'] = round(stats['texts_per_second'] / baseline, 2) if baseline and stats['texts_per_second'] else None
+    return report
+
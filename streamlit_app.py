@@ -4,10 +4,10 @@ import json
 import io
 import time
 from config import Config
-from pipeline.detect import detect_language
-from pipeline.translate import translate_text
-from pipeline.sentiment import analyze_sentiment
+from pipeline.engine import create_engine
+from pipeline.translate import fill_translations
 from pipeline.summarize import generate_summary
+from pipeline.preload import preload_models
 from utils.file_handler import process_csv_file, validate_file
 from utils.exporter import export_to_csv, export_to_json
 
@@ -79,6 +79,11 @@ THEMES = {
     }
 }
 
+@st.cache_resource(show_spinner="Loading models...")
+def load_models():
+    """Preload models once per server process"""
+    return preload_models()
+
 def get_current_theme():
     """Get the current theme based on sentiment"""
     return THEMES.get(st.session_state.current_theme, THEMES['default'])
@@ -356,6 +361,9 @@ def get_css(theme):
     """
 
 def main():
+    if Config.PRELOAD_MODELS:
+        load_models()
+    
     # Get current theme
     theme = get_current_theme()
     
@@ -505,38 +513,22 @@ def process_file_upload(uploaded_file, show_translations, show_confidence):
 
 def analyze_reviews(reviews, show_translations, show_confidence):
     """Analyze sentiment for a list of reviews"""
-    results = []
-    
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for i, review in enumerate(reviews):
-        if not review.strip():
-            continue
-        
-        status_text.text(f"Processing review {i+1}/{len(reviews)}...")
-        
-        # Detect language
-        detected_lang = detect_language(review)
-        
-        # Translate if needed
-        translated_text = review
-        if detected_lang != 'en':
-            translated_text = translate_text(review, detected_lang)
-        
-        # Analyze sentiment
-        sentiment_result = analyze_sentiment(translated_text)
-        
-        results.append({
-            'id': i + 1,
-            'original_text': review,
-            'detected_language': detected_lang,
-            'translated_text': translated_text if detected_lang != 'en' else None,
-            'sentiment_label': sentiment_result['label'],
-            'confidence': sentiment_result['confidence']
-        })
-        
-        progress_bar.progress((i + 1) / len(reviews))
+    def detection_progress(done, total):
+        status_text.text(f"Detecting language {done}/{total}...")
+        progress_bar.progress(done / total)
+    
+    # Direct mode only translates for display
+    engine = create_engine(
+        translate=Config.PIPELINE_MODE != 'direct' or show_translations,
+        detect_progress=detection_progress
+    )
+    engine.add_hook('before', lambda stage, batch: status_text.text("Translating..."), 'translate')
+    engine.add_hook('before', lambda stage, batch: status_text.text("Scoring sentiment..."), 'sentiment')
+    
+    results = engine.run(reviews).results
     
     status_text.text("✅ Analysis complete!")
     progress_bar.empty()
@@ -589,6 +581,13 @@ def display_results(results, show_translations, show_confidence):
         negative_pct = summary['distribution']['Negative']
         st.metric("Negative", f"{negative_pct:.1f}%")
     
+    dedup = summary.get('dedup')
+    if dedup and dedup['duplicate_reviews']:
+        st.caption(f"♻️ {dedup['duplicate_reviews']} duplicate reviews ({dedup['dedup_ratio']}%) were analyzed once")
+    triage = summary.get('triage')
+    if triage and triage['translations_saved']:
+        st.caption(f"⏭️ {triage['translations_saved']} reviews did not need translation")
+    
     # Display AI insights with enhanced styling
     st.markdown(f"""
     <div style="
@@ -650,6 +649,14 @@ def display_results(results, show_translations, show_confidence):
     </div>
     """, unsafe_allow_html=True)
     
+    # Direct mode only translates for export when asked to
+    if Config.PIPELINE_MODE == 'direct' and any(
+        r['detected_language'] != 'en' and not r['translated_text'] for r in results
+    ):
+        if st.checkbox("Include translations in export", value=False):
+            with st.spinner("🌐 Translating for export..."):
+                fill_translations(results)
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -0,0 +1,98 @@
+import pytest
+import re
+from pipeline.batching import schedule_batches, run_in_batches, token_lengths, plan_windows, schedule_windows
+
+class WhitespaceTokenizer:
+    """Fast-tokenizer stand-in with one token per word."""
+    is_fast = True
+    model_max_length = 512
+    
+    def num_special_tokens_to_add(self):
+        return 2
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def __call__(self, texts, **kwargs):
+        self.calls += 1
+        ids = [[-1] + [int(word[1:]) for word in re.findall(r'\S+', text)] + [-2] for text in texts]
+        return {'input_ids': ids, 'special_tokens_mask': [[1] + [0] * (len(i) - 2) + [1] for i in ids]}
+
+def test_schedule_batches_respects_token_budget():
+    """Test padded batch cost stays under the token budget."""
+    lengths = [5, 120, 7, 110, 6, 8, 115]
+    batches = schedule_batches(lengths, max_tokens=256)
+    
+    for batch in batches:
+        assert len(batch) * max(lengths[i] for i in batch) <= 256
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+
+def test_schedule_batches_groups_similar_lengths():
+    """Test short and long texts are not mixed in one batch."""
+    lengths = [5, 500, 6, 480, 7]
+    batches = schedule_batches(lengths, max_tokens=1000)
+    assert [0, 2, 4] in [sorted(batch) for batch in batches]
+
+def test_schedule_batches_oversized_item():
+    """Test an item longer than the budget gets its own batch."""
+    batches = schedule_batches([10, 5000, 10], max_tokens=100)
+    assert [1] in batches
+
+def test_schedule_batches_max_batch_size():
+    """Test the item cap per batch."""
+    batches = schedule_batches([1] * 10, max_tokens=1000, max_batch_size=4)
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+def test_run_in_batches_restores_order():
+    """Test results come back in input order."""
+    items = ['ccc', 'a', 'bb', 'dddd']
+    results = run_in_batches(items, lambda batch: [s.upper() for s in batch], [3, 1, 2, 4], max_tokens=4)
+    assert results == ['CCC', 'A', 'BB', 'DDDD']
+
+def test_token_lengths_estimate():
+    """Test the word-based estimate without a tokenizer."""
+    lengths = token_lengths(['one', 'one two three four'])
+    assert lengths[0] < lengths[1]
+
+
+def test_plan_windows_splits_long_texts():
+    """Test long texts become overlapping token windows within the limit."""
+    long_text = ' '.join(f'w{i}' for i in range(20))
+    windows = list(plan_windows(['w7 w8', long_text], WhitespaceTokenizer(), window_tokens=10, overlap=2))
+    
+    assert windows[0] == (0, [-1, 7, 8, -2])
+    long_windows = [ids for i, ids in windows if i == 1]
+    assert all(len(ids) <= 10 for ids in long_windows)
+    assert long_windows[0][:2] == [-1, 0] and long_windows[-1][-2:] == [19, -2]
+    # Consecutive windows share the overlap tokens
+    assert long_windows[0][-3:-1] == long_windows[1][1:3]
+
+def test_plan_windows_is_lazy():
+    """Test texts are tokenised a chunk at a time as windows are consumed."""
+    tokenizer = WhitespaceTokenizer()
+    windows = plan_windows([f'w{i}' for i in range(10)], tokenizer, window_tokens=10, overlap=2, chunk_size=4)
+    
+    assert next(windows) == (0, [-1, 0, -2])
+    assert tokenizer.calls == 1
+    assert len(list(windows)) == 9
+    assert tokenizer.calls == 3
+
+def test_plan_windows_truncates():
+    """Test max_windows keeps only the start of long texts."""
+    long_text = ' '.join(f'w{i}' for i in range(20))
+    windows = list(plan_windows([long_text], WhitespaceTokenizer(), window_tokens=10, overlap=2, max_windows=1))
+    assert windows == [(0, [-1] + list(range(8)) + [-2])]
+
+def test_schedule_windows_bounds_read_ahead():
+    """Test windows are batched under the budget from a bounded read-ahead pool."""
+    consumed = []
+    def windows():
+        for i in range(10):
+            consumed.append(i)
+            yield i, [0] * (i % 3 + 1)
+    
+    batches = schedule_windows(windows(), max_tokens=4, pool_size=4)
+    first = next(batches)
+    assert len(consumed) == 4
+    assert len(first) * max(len(ids) for _, ids in first) <= 4
+    assert sorted(i for batch in [first] + list(batches) for i, _ in batch) == list(range(10))
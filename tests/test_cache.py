@@ -0,0 +1,112 @@
+import pytest
+from unittest.mock import patch
+from pipeline.cache import ResultCache, TranslationMemory, cache_key, normalize_text
+
+def test_normalize_text():
+    """Test whitespace and unicode normalisation."""
+    assert normalize_text("  Great \n product  ") == "Great product"
+    assert normalize_text("café") == "café"
+
+def test_cache_key_depends_on_namespace():
+    """Test the same text under different models gets different keys."""
+    assert cache_key("Great", "model-a") == cache_key(" Great ", "model-a")
+    assert cache_key("Great", "model-a") != cache_key("Great", "model-b")
+
+def test_memory_hits_and_misses():
+    """Test lookups against the in-process tier."""
+    cache = ResultCache(max_size=10)
+    cache.bind('model-a')
+    cache.put_many(["Great product"], [{'label': 'Positive', 'confidence': 0.9}])
+    
+    found = cache.get_many(["Great  product", "Unknown text"])
+    assert found == {0: {'label': 'Positive', 'confidence': 0.9}}
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+def test_lru_eviction():
+    """Test the in-process tier stays within its size bound."""
+    cache = ResultCache(max_size=2)
+    cache.bind('model-a')
+    cache.put_many(["one", "two"], [1, 2])
+    cache.get_many(["one"])
+    cache.put_many(["three"], [3])
+    
+    assert cache.get_many(["one", "two", "three"]) == {0: 1, 2: 3}
+    assert cache.stats()['size'] == 2
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    """Test results persist across cache instances."""
+    db_path = str(tmp_path / 'cache.db')
+    cache = ResultCache(db_path=db_path)
+    cache.bind('model-a')
+    cache.put_many(["Great product"], [{'label': 'Positive', 'confidence': 0.9}])
+    
+    restarted = ResultCache(db_path=db_path)
+    restarted.bind('model-a')
+    assert restarted.get_many(["Great product"]) == {0: {'label': 'Positive', 'confidence': 0.9}}
+    assert restarted.stats()['disk_hits'] == 1
+
+def test_model_change_invalidates(tmp_path):
+    """Test binding a new model drops results from the old one."""
+    db_path = str(tmp_path / 'cache.db')
+    cache = ResultCache(db_path=db_path)
+    cache.bind('model-a')
+    cache.put_many(["Great product"], ['Positive'])
+    
+    cache.bind('model-b')
+    assert cache.get_many(["Great product"]) == {}
+    cache.bind('model-a')
+    assert cache.get_many(["Great product"]) == {}
+
+def test_translation_memory_keys_by_backend_and_model():
+    """Test translations are only served for the backend and model that produced them."""
+    memory = TranslationMemory()
+    memory.put('Hola', 'es', 'Hello', 'gemini', 'gemini-1.5-flash-latest')
+
+    assert memory.get('Hola', 'es', 'gemini', 'gemini-1.5-flash-latest') == 'Hello'
+    assert memory.get('Hola', 'es', 'huggingface', 'Helsinki-NLP/opus-mt-es-en') is None
+    assert memory.get('Hola', 'es', 'gemini', 'gemini-2.0-flash') is None
+    assert memory.get('Hola', 'pt', 'gemini', 'gemini-1.5-flash-latest') is None
+
+def test_translation_memory_bulk_lookup():
+    """Test bulk lookup returns hits by position, including repeated texts."""
+    memory = TranslationMemory()
+    memory.put_many(['Hola', 'Adiós'], ['es', 'es'], ['Hello', 'Goodbye'], 'huggingface', 'opus-mt-es-en')
+
+    found = memory.get_many(['Adiós', 'Gracias', 'Hola', 'Adiós'], ['es'] * 4, 'huggingface', 'opus-mt-es-en')
+    assert found == {0: 'Goodbye', 2: 'Hello', 3: 'Goodbye'}
+    assert memory.stats()['misses'] == 1
+
+def test_translation_memory_ttl():
+    """Test expired translations are not served."""
+    memory = TranslationMemory(ttl=60)
+    with patch('pipeline.cache.time.time', return_value=1000.0):
+        memory.put('Hola', 'es', 'Hello', 'gemini', 'g')
+    with patch('pipeline.cache.time.time', return_value=1030.0):
+        assert memory.get('Hola', 'es', 'gemini', 'g') == 'Hello'
+    with patch('pipeline.cache.time.time', return_value=1100.0):
+        assert memory.get('Hola', 'es', 'gemini', 'g') is None
+
+def test_translation_memory_evicts_least_recently_used():
+    """Test the size cap evicts the least recently used translation."""
+    memory = TranslationMemory(max_entries=2)
+    with patch('pipeline.cache.time.time', return_value=1.0):
+        memory.put('uno', 'es', 'one', 'gemini', 'g')
+    with patch('pipeline.cache.time.time', return_value=2.0):
+        memory.put('dos', 'es', 'two', 'gemini', 'g')
+    with patch('pipeline.cache.time.time', return_value=3.0):
+        memory.get('uno', 'es', 'gemini', 'g')
+    with patch('pipeline.cache.time.time', return_value=4.0):
+        memory.put('tres', 'es', 'three', 'gemini', 'g')
+
+    assert memory.get('dos', 'es', 'gemini', 'g') is None
+    assert memory.get('uno', 'es', 'gemini', 'g') == 'one'
+    assert memory.stats()['evictions'] == 1
+    assert memory.stats()['size'] == 2
+
+def test_translation_memory_persists(tmp_path):
+    """Test translations survive a restart when backed by a database file."""
+    db_path = str(tmp_path / 'translations.db')
+    TranslationMemory(db_path=db_path).put('Hola', 'es', 'Hello', 'gemini', 'g')
+
+    assert TranslationMemory(db_path=db_path).get('Hola', 'es', 'gemini', 'g') == 'Hello'
@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import patch
+from pipeline.circuit import CircuitBreaker, get_breaker, get_breaker_status
+
+def make_breaker(threshold=3, cooldown=10):
+    """Build a breaker driven by a fake clock."""
+    now = [0.0]
+    breaker = CircuitBreaker('test', failure_threshold=threshold, cooldown=cooldown, clock=lambda: now[0])
+    return breaker, now
+
+def test_opens_after_threshold():
+    """Test consecutive failures open the circuit and requests are rejected."""
+    breaker, _ = make_breaker()
+
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.status()['state'] == 'closed'
+
+    breaker.record_failure()
+    assert breaker.status()['state'] == 'open'
+    assert not breaker.available()
+    assert not breaker.allow_request()
+    assert breaker.status()['rejected'] == 1
+
+def test_success_resets_failure_count():
+    """Test a success in between keeps the circuit closed."""
+    breaker, _ = make_breaker()
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.status()['state'] == 'closed'
+
+def test_half_open_probe_closes_on_success():
+    """Test a single probe is allowed after the cool-down and success closes the circuit."""
+    breaker, now = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+
+    now[0] = 5.0
+    assert not breaker.allow_request()
+    assert breaker.status()['retry_in_seconds'] == 5.0
+
+    now[0] = 10.0
+    assert breaker.available()
+    assert breaker.allow_request()
+    assert breaker.status()['state'] == 'half_open'
+    assert not breaker.allow_request()  # Only one probe at a time
+
+    breaker.record_success()
+    assert breaker.status()['state'] == 'closed'
+    assert breaker.allow_request()
+
+def test_half_open_probe_reopens_on_failure():
+    """Test a failed probe opens the circuit for another cool-down."""
+    breaker, now = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+
+    now[0] = 10.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.status()['state'] == 'open'
+
+    now[0] = 15.0
+    assert not breaker.available()
+    now[0] = 20.0
+    assert breaker.available()
+    assert breaker.status()['trips'] == 1
+
+def test_breaker_registry():
+    """Test breakers are shared per backend and reported in the status API."""
+    with patch('pipeline.circuit.breakers', {}):
+        assert get_breaker('gemini') is get_breaker('gemini')
+        get_breaker('Helsinki-NLP/opus-mt-es-en').record_failure()
+
+        status = get_breaker_status()
+        assert list(status) == ['Helsinki-NLP/opus-mt-es-en', 'gemini']
+        assert status['Helsinki-NLP/opus-mt-es-en']['consecutive_failures'] == 1
@@ -0,0 +1,32 @@
+import pytest
+from pipeline.dedup import dedupe_reviews, fan_out, get_dedup_stats
+
+def test_dedupe_reviews():
+    """Test normalised duplicates collapse to the first occurrence."""
+    unique, index_map = dedupe_reviews(["Good", "ok", "Good ", "Bad", "ok"])
+    assert unique == ["Good", "ok", "Bad"]
+    assert index_map == [0, 1, 0, 2, 1]
+
+def test_fan_out_copies_results():
+    """Test every row gets its own copy with its own id and text."""
+    unique_results = [
+        {'original_text': 'Good', 'sentiment_label': 'Positive'},
+        {'original_text': 'Bad', 'sentiment_label': 'Negative'}
+    ]
+    results = fan_out(unique_results, [0, 1, 0], [1, 2, 4], ["Good", "Bad", "Good "])
+    
+    assert [r['id'] for r in results] == [1, 2, 4]
+    assert [r['sentiment_label'] for r in results] == ['Positive', 'Negative', 'Positive']
+    assert results[2]['original_text'] == "Good "
+    assert results[0] is not results[2]
+
+def test_get_dedup_stats():
+    """Test the duplicate ratio."""
+    stats = get_dedup_stats(["Good", "Good", "Bad", "ok"])
+    assert stats['unique_reviews'] == 3
+    assert stats['duplicate_reviews'] == 1
+    assert stats['dedup_ratio'] == 25.0
+
+def test_get_dedup_stats_empty():
+    """Test stats for no reviews."""
+    assert get_dedup_stats([])['dedup_ratio'] == 0.0
@@ -1,5 +1,6 @@
 import pytest
-from pipeline.detect import detect_language, get_language_name
+from unittest.mock import patch
+from pipeline.detect import detect_language, detect_language_probability, detect_language_probabilities, detect_languages_batch, detect_languages_batch_probability, get_language_name
 
 def test_detect_english():
     """Test English language detection."""
@@ -31,6 +32,68 @@ def test_detect_empty_text():
     result = detect_language(text)
     assert result == 'en'  # Should default to English
 
+def test_detect_language_probability():
+    """Test detection returns the language with its probability."""
+    lang, probability = detect_language_probability("Este producto es increíble. Lo recomiendo mucho.")
+    assert lang == 'es'
+    assert 0.5 < probability <= 1.0
+    
+    assert detect_language_probability("Hi") == ('en', 0.0)
+
+@patch('pipeline.detect.detect_langs')
+@patch('pipeline.detect.detect')
+def test_script_fast_path(mock_detect, mock_detect_langs):
+    """Test single-language scripts are decided without langdetect."""
+    assert detect_language("이 제품 정말 좋아요") == 'ko'
+    assert detect_language("좋아") == 'ko'
+    assert detect_language("สินค้าดีมาก") == 'th'
+    assert detect_language_probability("とても良い製品です") == ('ja', 1.0)
+    mock_detect.assert_not_called()
+    mock_detect_langs.assert_not_called()
+
+def test_script_fast_path_disabled():
+    """Test the statistical detector runs when the fast path is off."""
+    with patch('pipeline.detect.Config.DETECT_SCRIPT_FAST_PATH', False), \
+         patch('pipeline.detect.detect', return_value='ko') as mock_detect:
+        assert detect_language("이 제품 정말 좋아요") == 'ko'
+    mock_detect.assert_called_once()
+
+def test_detect_language_probabilities():
+    """Test candidate languages come back most likely first."""
+    candidates = detect_language_probabilities("Dieses Produkt ist wirklich großartig und sehr empfehlenswert.")
+    assert candidates[0][0] == 'de'
+    assert [probability for _, probability in candidates] == sorted((p for _, p in candidates), reverse=True)
+    
+    assert detect_language_probabilities("") == [('en', 0.0)]
+
+def test_detect_languages_batch_probability():
+    """Test batch detection returns a probability per text."""
+    result = detect_languages_batch_probability(["Muy bueno, lo recomiendo.", "สินค้าดีมาก", "OK"])
+    
+    assert result[0][0] == 'es' and 0.5 < result[0][1] <= 1.0
+    assert result[1] == ('th', 1.0)
+    assert result[2] == ('en', 0.0)
+
+def test_detect_languages_batch():
+    """Test batch detection agrees with per-text detection."""
+    texts = [
+        "This product is amazing! I love it so much.",
+        "Este producto es increíble. Lo recomiendo mucho.",
+        "Ce produit est fantastique. Je le recommande vivement.",
+        "Dieses Produkt ist wirklich großartig und sehr empfehlenswert.",
+        "この製品は素晴らしいです。",
+        "OK",
+        ""
+    ]
+    result = detect_languages_batch(texts)
+    assert result == ['en', 'es', 'fr', 'de', 'ja', 'en', 'en']
+    assert result == [detect_language(text) for text in texts]
+
+def test_detect_languages_batch_fallback():
+    """Test batch detection falls back to langdetect if the engine fails."""
+    with patch('pipeline.detect.get_batch_detector', side_effect=OSError("no profiles")):
+        assert detect_languages_batch(["Este producto es increíble. Lo recomiendo mucho."]) == ['es']
+
 def test_get_language_name():
     """Test language name mapping."""
     assert get_language_name('en') == 'English'
@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch
+import pipeline.detect_pool as detect_pool
+from pipeline.detect import detect_language_probability
+
+TEXTS = [
+    "This product is amazing! I love it so much.",
+    "Este producto es increíble. Lo recomiendo mucho.",
+    "Ce produit est fantastique. Je le recommande vivement.",
+    "이 제품 정말 좋아요",
+    "OK"
+]
+
+@pytest.fixture(autouse=True)
+def stop_pool():
+    """Stop any pool a test started."""
+    yield
+    detect_pool.shutdown_detection_pool()
+
+def test_small_uploads_stay_in_process():
+    """Test uploads under the threshold do not start worker processes."""
+    with patch('pipeline.detect_pool.get_detection_pool') as mock_pool:
+        result = detect_pool.detect_languages_parallel(TEXTS, workers=4, chunk_size=2)
+
+    mock_pool.assert_not_called()
+    assert result == [detect_language_probability(text) for text in TEXTS]
+
+@patch('pipeline.detect_pool.Config.DETECT_PARALLEL_MIN_TEXTS', 0)
+def test_parallel_results_keep_input_order():
+    """Test chunks detected in worker processes come back in input order."""
+    texts = TEXTS * 4
+    done = []
+    result = detect_pool.detect_languages_parallel(texts, workers=2, chunk_size=3, progress=lambda n, total: done.append(n))
+
+    assert [lang for lang, _ in result] == ['en', 'es', 'fr', 'ko', 'en'] * 4
+    assert result == [detect_language_probability(text) for text in texts]
+    assert done == [3, 6, 9, 12, 15, 18, 20]
+
+@patch('pipeline.detect_pool.Config.DETECT_PARALLEL_MIN_TEXTS', 0)
+@patch('pipeline.detect_pool.Config.DETECT_ENGINE', 'batch')
+def test_parallel_batch_engine():
+    """Test workers can run the vectorised engine instead of langdetect."""
+    result = detect_pool.detect_languages_parallel(TEXTS, workers=2, chunk_size=2)
+
+    assert [lang for lang, _ in result] == ['en', 'es', 'fr', 'ko', 'en']
+
+@patch('pipeline.detect_pool.Config.DETECT_PARALLEL_MIN_TEXTS', 0)
+def test_pool_failure_falls_back():
+    """Test detection still completes in process if the pool breaks."""
+    with patch('pipeline.detect_pool.get_detection_pool', side_effect=OSError("cannot fork")):
+        result = detect_pool.detect_languages_parallel(TEXTS, workers=2, chunk_size=2)
+
+    assert [lang for lang, _ in result] == ['en', 'es', 'fr', 'ko', 'en']
+
+@patch('pipeline.detect_pool.os.cpu_count', return_value=16)
+def test_default_workers_share_cores(mock_cpu_count):
+    """Test the default pool size is split between web workers and capped."""
+    with patch('pipeline.detect_pool.Config.WEB_CONCURRENCY', 1):
+        assert detect_pool.default_detection_workers() == detect_pool.DEFAULT_MAX_WORKERS
+    with patch('pipeline.detect_pool.Config.WEB_CONCURRENCY', 16):
+        assert detect_pool.default_detection_workers() == 1
+    with patch('pipeline.detect_pool.Config.WEB_CONCURRENCY', 32):
+        assert detect_pool.default_detection_workers() == 1
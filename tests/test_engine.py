@@ -0,0 +1,97 @@
+import pytest
+from unittest.mock import patch
+from pipeline.engine import PipelineEngine, Stage, DetectStage, create_engine
+
+def fake_detect(texts, progress=None):
+    """Label reviews starting with 'Hola' as Spanish."""
+    return [('es', 0.99) if text.startswith('Hola') else ('en', 0.99) for text in texts]
+
+def fake_sentiment(texts):
+    """Score any text containing 'good' as positive."""
+    return [
+        {'label': 'Positive' if 'good' in text.lower() else 'Negative', 'confidence': 0.9}
+        for text in texts
+    ]
+
+@pytest.fixture
+def stubs():
+    """Replace the model-backed calls the default stages make."""
+    with patch('pipeline.engine.detect_languages_parallel', side_effect=fake_detect) as detect, \
+         patch('pipeline.engine.gemini_available', return_value=False), \
+         patch('pipeline.engine.triage_reviews', side_effect=lambda texts, detections, ready: [
+             {'action': 'none' if lang == 'en' else 'translate', 'detected_language': lang}
+             for lang, _ in detections
+         ]), \
+         patch('pipeline.engine.translate_triaged', side_effect=lambda texts, decisions: [
+             'Hello good' if decision['action'] == 'translate' else None
+             for decision in decisions
+         ]) as translate, \
+         patch('pipeline.engine.analyze_sentiment_batch', side_effect=fake_sentiment) as sentiment:
+        yield {'detect': detect, 'translate': translate, 'sentiment': sentiment}
+
+def test_default_engine_builds_result_records(stubs):
+    """Test the default stages produce one record per non-blank row."""
+    batch = create_engine(translate=True).run(["Good stuff", "", "Hola amigo", "good stuff", "Bad"])
+
+    assert [result['id'] for result in batch.results] == [1, 3, 4, 5]
+    assert batch.results[0] == {
+        'id': 1,
+        'original_text': 'Good stuff',
+        'detected_language': 'en',
+        'translated_text': None,
+        'triage': {'action': 'none', 'detected_language': 'en'},
+        'sentiment_label': 'Positive',
+        'confidence': 0.9
+    }
+    assert batch.results[1]['translated_text'] == 'Hello good'
+    assert batch.results[2]['original_text'] == 'good stuff'
+    assert [result['sentiment_label'] for result in batch.results] == ['Positive', 'Positive', 'Positive', 'Negative']
+    assert set(batch.timings) == {'dedup', 'detect', 'triage', 'translate', 'sentiment', 'fan_out'}
+
+def test_each_stage_runs_once_per_batch(stubs):
+    """Test stages see the whole deduplicated batch in one call."""
+    create_engine(translate=True).run(["Good", "Hola", "Good", "Bad", "Hola"])
+
+    stubs['detect'].assert_called_once()
+    assert stubs['detect'].call_args[0][0] == ["Good", "Hola", "Bad"]
+    stubs['sentiment'].assert_called_once_with(["Good", "Hello good", "Bad"])
+
+def test_translation_can_be_disabled(stubs):
+    """Test a disabled translate stage still builds records."""
+    batch = create_engine(translate=False).run(["Hola amigo"])
+
+    stubs['translate'].assert_not_called()
+    assert batch.results[0]['translated_text'] is None
+    stubs['sentiment'].assert_called_once_with(["Hola amigo"])
+
+def test_hooks_and_stage_replacement(stubs):
+    """Test hooks run around stages and stages can be swapped."""
+    class UppercaseStage(Stage):
+        name = 'fan_out'
+
+        def run(self, batch):
+            batch.results = [record['original_text'].upper() for record in batch.records]
+
+    engine = create_engine(translate=True)
+    engine.replace_stage('fan_out', UppercaseStage())
+    seen = []
+    engine.add_hook('before', lambda stage, batch: seen.append(('before', stage.name)), 'detect')
+    engine.add_hook('after', lambda stage, batch: seen.append(('after', stage.name, len(batch.detections))), 'detect')
+    engine.add_hook('after', lambda stage, batch: seen.append(stage.name))
+
+    assert engine.run(["Good", "Hola"]).results == ["GOOD", "HOLA"]
+    assert seen[:4] == ['dedup', ('before', 'detect'), ('after', 'detect', 2), 'detect']
+    assert isinstance(engine.stage('detect'), DetectStage)
+
+    with pytest.raises(KeyError):
+        engine.replace_stage('missing', UppercaseStage())
+
+def test_custom_engine_stages():
+    """Test an engine runs any list of stages in order."""
+    class CountStage(Stage):
+        name = 'count'
+
+        def run(self, batch):
+            batch.results = [len(review) for review in batch.reviews]
+
+    assert PipelineEngine([CountStage()]).run(["ab", "abc"]).results == [2, 3]
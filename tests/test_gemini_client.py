@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pipeline.circuit import CircuitBreaker
+from pipeline.gemini_client import GeminiClient, GeminiError, CircuitOpenError, TokenBucket
+
+class StubGemini(BaseHTTPRequestHandler):
+    """Local stand-in for the generateContent endpoint, driven by server.script."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['contents'][0]['parts'][0]['text']
+
+        with server.lock:
+            server.calls.append((self.path, self.headers.get('x-goog-api-key'), prompt))
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            status = server.script.pop(0) if server.script else 200
+        try:
+            time.sleep(server.delay)
+            content_type = 'application/json'
+            if status == 'html':
+                # A proxy error page served with 200
+                status = 200
+                content_type = 'text/html'
+                data = b'<html><body>Bad gateway</body></html>'
+            elif status == 200:
+                data = json.dumps({'candidates': [{'content': {'parts': [{'text': f"EN {prompt}"}]}}]}).encode('utf-8')
+            else:
+                data = json.dumps({'error': {'code': status}}).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    """Run the stub Gemini server on a free local port."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubGemini)
+    server.lock = threading.Lock()
+    server.calls = []
+    server.script = []
+    server.delay = 0.0
+    server.active = 0
+    server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def make_client(server, **kwargs):
+    """Build a client pointed at the stub server."""
+    options = {'requests_per_minute': 0, 'timeout': 2, 'max_retries': 2, 'backoff': 0.01}
+    options.update(kwargs)
+    return GeminiClient('test-key', 'gemini-test', base_url=f"http://127.0.0.1:{server.server_port}", **options)
+
+def test_generate_success(stub_server):
+    """Test a prompt is posted to the model endpoint with the API key."""
+    client = make_client(stub_server)
+
+    assert client.generate("Hola") == "EN Hola"
+    path, api_key, prompt = stub_server.calls[0]
+    assert path == '/v1beta/models/gemini-test:generateContent'
+    assert api_key == 'test-key'
+
+def test_generate_retries_rate_limits_and_server_errors(stub_server):
+    """Test 429 and 5xx responses are retried until the call succeeds."""
+    stub_server.script = [429, 503]
+    client = make_client(stub_server)
+
+    assert client.generate("Hola") == "EN Hola"
+    assert len(stub_server.calls) == 3
+    assert client.stats() == {'requests': 3, 'retries': 2, 'failures': 0}
+
+def test_generate_gives_up_after_retries(stub_server):
+    """Test persistent server errors raise once retries are exhausted."""
+    stub_server.script = [500, 500, 500]
+    client = make_client(stub_server)
+
+    with pytest.raises(GeminiError) as excinfo:
+        client.generate("Hola")
+    assert excinfo.value.status == 500
+    assert len(stub_server.calls) == 3
+
+def test_generate_retries_non_json_response(stub_server):
+    """Test a 200 response that is not JSON is retried and only then counts as a success."""
+    stub_server.script = ['html']
+    breaker = CircuitBreaker('gemini', failure_threshold=1, cooldown=60)
+    client = make_client(stub_server, breaker=breaker)
+
+    assert client.generate("Hola") == "EN Hola"
+    assert client.stats() == {'requests': 2, 'retries': 1, 'failures': 0}
+
+def test_map_survives_non_json_responses(stub_server):
+    """Test non-JSON responses become failed items instead of raising, and trip the breaker."""
+    stub_server.script = ['html'] * 2
+    breaker = CircuitBreaker('gemini', failure_threshold=1, cooldown=60)
+    client = make_client(stub_server, max_concurrency=1, max_retries=0, breaker=breaker)
+
+    assert client.map(['a', 'b']) == [None, None]
+    assert breaker.status()['state'] == 'open'
+
+def test_generate_does_not_retry_client_errors(stub_server):
+    """Test 4xx errors other than 429 fail immediately."""
+    stub_server.script = [400]
+    client = make_client(stub_server)
+
+    with pytest.raises(GeminiError):
+        client.generate("Hola")
+    assert len(stub_server.calls) == 1
+
+def test_generate_times_out(stub_server):
+    """Test slow responses hit the per-call timeout."""
+    stub_server.delay = 0.5
+    client = make_client(stub_server, timeout=0.1, max_retries=0)
+
+    with pytest.raises(GeminiError):
+        client.generate("Hola")
+
+def test_map_runs_concurrently_in_order(stub_server):
+    """Test prompts run in parallel up to the concurrency limit and keep input order."""
+    stub_server.delay = 0.05
+    stub_server.script = [200, 400]
+    client = make_client(stub_server, max_concurrency=3)
+    prompts = [f"review {i}" for i in range(9)]
+
+    outputs = client.map(prompts)
+    assert stub_server.peak <= 3
+    assert stub_server.peak > 1
+    assert outputs.count(None) == 1
+    assert [output for output in outputs if output] == [f"EN {p}" for p, o in zip(prompts, outputs) if o]
+
+def test_breaker_skips_requests_during_outage(stub_server):
+    """Test an outage opens the circuit so later calls fail fast without a request."""
+    stub_server.script = [503] * 4
+    breaker = CircuitBreaker('gemini', failure_threshold=2, cooldown=60)
+    client = make_client(stub_server, max_concurrency=1, max_retries=1, breaker=breaker)
+
+    assert client.map(["a", "b", "c", "d"]) == [None] * 4
+    assert breaker.status()['state'] == 'open'
+    assert len(stub_server.calls) == 4
+    with pytest.raises(CircuitOpenError):
+        client.generate("e")
+    assert len(stub_server.calls) == 4
+
+def test_breaker_ignores_client_errors(stub_server):
+    """Test 4xx responses do not count against the backend's health."""
+    stub_server.script = [400, 400]
+    breaker = CircuitBreaker('gemini', failure_threshold=1, cooldown=60)
+    client = make_client(stub_server, breaker=breaker)
+
+    assert client.map(["a", "b"]) == [None, None]
+    assert breaker.status()['state'] == 'closed'
+
+def test_token_bucket_limits_rate():
+    """Test the bucket allows a burst and then spaces requests at the rate."""
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(60, capacity=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        bucket.acquire()
+
+    assert sleeps == [pytest.approx(1.0), pytest.approx(1.0)]
+    assert now[0] == pytest.approx(2.0)
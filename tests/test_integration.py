@@ -117,4 +117,37 @@ def test_download_json(client):
 def test_download_invalid_format(client):
     """Test download with invalid format."""
     response = client.get('/download/invalid')
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
+
+@patch('pipeline.preload.Config.PRELOAD_MODELS', True)
+def test_ready_endpoint(client):
+    """Test readiness reporting before and after preloading."""
+    with patch('pipeline.preload.models_ready', False):
+        response = client.get('/ready')
+        assert response.status_code == 503
+        assert response.get_json()['ready'] is False
+    
+    with patch('pipeline.preload.models_ready', True):
+        response = client.get('/ready')
+        assert response.status_code == 200
+
+@patch('pipeline.preload.Config.PRELOAD_MODELS', False)
+@patch('pipeline.preload.models_ready', False)
+def test_ready_endpoint_without_preload(client):
+    """Test the app is ready from the start when models load on first use."""
+    with patch('pipeline.preload.sentiment.sentiment_analyzer', None):
+        response = client.get('/ready')
+        assert response.status_code == 200
+        assert response.get_json()['sentiment_model_loaded'] is False
+
+def test_status_endpoint(client):
+    """Test translation backend breaker state is reported."""
+    with patch('pipeline.circuit.breakers', {}):
+        from pipeline.circuit import get_breaker
+        get_breaker('gemini').record_failure()
+        
+        response = client.get('/status')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['translation_backends']['gemini']['state'] == 'closed'
+        assert data['translation_backends']['gemini']['consecutive_failures'] == 1
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from pipeline.detect import get_batch_detector
+from pipeline.langid import NgramLanguageDetector, capital_word_ngrams
+
+@pytest.fixture(scope='module')
+def detector():
+    """Share one detector across tests; building it reads every profile."""
+    return get_batch_detector()
+
+def toy_detector():
+    """Build a two-language detector with hand-made weights."""
+    vocabulary = {'a': 0, 'b': 1}
+    weights = np.log(np.array([[0.9, 0.1], [0.1, 0.9]], dtype=np.float32))
+    return NgramLanguageDetector(['xa', 'xb'], vocabulary, weights)
+
+def test_score_sums_ngram_weights():
+    """Test each text's score is the sum of its n-gram weights."""
+    detector = toy_detector()
+    scores, counts = detector.score(["aaa", "bbb", "ab a", ""])
+
+    assert counts.tolist() == [3, 3, 3, 0]
+    assert scores[0] == pytest.approx(3 * np.log([0.9, 0.1]), rel=1e-5)
+    assert scores[3].tolist() == [0.0, 0.0]
+    assert detector.detect(["aaa", "bbb", "ab a", ""]) == ['xa', 'xb', 'xa', 'en']
+
+def test_chunks_do_not_mix_texts():
+    """Test texts are scored independently across chunk boundaries."""
+    detector = toy_detector()
+    texts = ["aaa", "...", "bbb", "abb"] * 3
+    scores, _ = detector.score(texts, chunk_size=3)
+    expected, _ = detector.score(texts, chunk_size=100)
+
+    assert np.allclose(scores, expected)
+
+def test_probabilities(detector):
+    """Test posteriors sum to one and are empty without n-grams."""
+    probabilities, counts = detector.probabilities(["Lo recomiendo mucho, es increíble.", "12345"])
+
+    assert probabilities[0].sum() == pytest.approx(1.0, abs=1e-4)
+    assert detector.languages[probabilities[0].argmax()] == 'es'
+    assert counts[1] == 0
+    assert probabilities[1].sum() == 0
+
+def test_latin_noise_is_dropped(detector):
+    """Test stray Latin words do not outweigh another script."""
+    assert detector.detect(["Это очень хороший товар, рекомендую всем OK"]) == ['ru']
+
+def test_capital_words_follow_langdetect():
+    """Test n-grams inside capital runs are skipped as in langdetect."""
+    grams = capital_word_ngrams("HELLO")
+
+    assert grams == ['H', ' H', 'O ', 'LO ']
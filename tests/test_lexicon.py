@@ -0,0 +1,34 @@
+import pytest
+from pipeline.lexicon import score_lexicon
+
+def test_obvious_positive():
+    """Test clear positive reviews score confidently."""
+    result = score_lexicon("Great product!")
+    assert result['label'] == 'Positive'
+    assert result['confidence'] >= 0.7
+
+def test_obvious_negative():
+    """Test clear negative reviews score confidently."""
+    result = score_lexicon("Terrible")
+    assert result['label'] == 'Negative'
+    assert result['confidence'] >= 0.7
+
+def test_negation_flips_polarity():
+    """Test negated sentiment words flip polarity."""
+    assert score_lexicon("This is not good")['label'] == 'Negative'
+    assert score_lexicon("It isn't bad")['label'] == 'Positive'
+
+def test_mixed_review_is_uncertain():
+    """Test reviews with conflicting words are left undecided."""
+    result = score_lexicon("Great screen but the battery is terrible")
+    assert result['confidence'] == 0.0
+
+def test_contrast_lowers_confidence():
+    """Test contrast words halve the confidence."""
+    plain = score_lexicon("Excellent and reliable")
+    contrasted = score_lexicon("Excellent and reliable, however it arrived in a box")
+    assert contrasted['confidence'] == pytest.approx(plain['confidence'] / 2, abs=0.001)
+
+def test_no_sentiment_words():
+    """Test text without lexicon words is undecided."""
+    assert score_lexicon("It arrived on Tuesday")['confidence'] == 0.0
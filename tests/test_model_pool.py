@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from pipeline.model_pool import ModelPool, model_size_bytes
+
+def make_pool(max_bytes, sizes=None):
+    """Build a pool whose models are plain names with fixed sizes."""
+    sizes = sizes or {}
+    loader = MagicMock(side_effect=lambda name: f"model:{name}")
+    pool = ModelPool(loader, max_bytes, size_of=lambda model: sizes.get(model.split(':')[1], 100))
+    return pool, loader
+
+def test_get_loads_once():
+    """Test a model is loaded on first use and reused afterwards."""
+    pool, loader = make_pool(1000)
+
+    assert pool.get('es') == 'model:es'
+    assert pool.get('es') == 'model:es'
+    loader.assert_called_once_with('es')
+
+    stats = pool.stats()
+    assert stats['loads'] == 1
+    assert stats['hits'] == 1
+    assert stats['resident_bytes'] == 100
+
+def test_evicts_least_recently_used():
+    """Test the least recently used model is evicted when over budget."""
+    pool, loader = make_pool(250)
+
+    pool.get('es')
+    pool.get('fr')
+    pool.get('es')  # fr is now least recently used
+    pool.get('de')
+
+    assert pool.names() == ['es', 'de']
+    assert pool.stats()['evictions'] == 1
+    assert 'fr' not in pool
+
+    pool.get('fr')
+    assert loader.call_count == 4
+
+def test_oversized_model_is_kept():
+    """Test a model larger than the budget still loads and evicts the rest."""
+    pool, _ = make_pool(250, sizes={'ja': 400})
+
+    pool.get('es')
+    assert pool.get('ja') == 'model:ja'
+    assert pool.names() == ['ja']
+    assert pool.stats()['evictions'] == 1
+
+def test_concurrent_requests_load_once():
+    """Test concurrent requests for one model share a single load."""
+    def slow_loader(name):
+        time.sleep(0.05)
+        return f"model:{name}"
+
+    loader = MagicMock(side_effect=slow_loader)
+    pool = ModelPool(loader, 1000, size_of=lambda model: 100)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get('es'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['model:es'] * 8
+    loader.assert_called_once_with('es')
+
+def test_model_size_bytes():
+    """Test resident size counts parameters and buffers."""
+    torch = pytest.importorskip('torch')
+    model = torch.nn.Linear(4, 2)
+    model.register_buffer('scale', torch.zeros(3))
+
+    assert model_size_bytes(model) == (4 * 2 + 2 + 3) * 4
+    assert model_size_bytes(object()) == 0
+
+def test_model_size_bytes_counts_quantized_weights():
+    """Test int8 weights packed by dynamic quantisation are counted."""
+    torch = pytest.importorskip('torch')
+    quantized = torch.nn.Sequential(torch.nn.Linear(64, 32))
+    torch.quantization.quantize_dynamic(quantized, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    assert model_size_bytes(quantized) >= 64 * 32
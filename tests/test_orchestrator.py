@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from pipeline.engine import PipelineEngine, Stage, DedupStage, FanOutStage
+from pipeline.orchestrator import split_phases, orchestrate, run_pipelined
+
+class SlowStage(Stage):
+    """Sleep per batch and track how many stages run at once."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, name, delay=0.02, fail_on=None):
+        self.name = name
+        self.delay = delay
+        self.fail_on = fail_on
+
+    def run(self, batch):
+        with SlowStage.lock:
+            SlowStage.active += 1
+            SlowStage.peak = max(SlowStage.peak, SlowStage.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail_on is not None and batch.first_id == self.fail_on:
+                raise RuntimeError(f"{self.name} failed")
+        finally:
+            with SlowStage.lock:
+                SlowStage.active -= 1
+
+class RecordStage(Stage):
+    """Build minimal records without models."""
+
+    name = 'sentiment'
+
+    def run(self, batch):
+        batch.records = [
+            {'original_text': review, 'detected_language': 'en', 'translated_text': None,
+             'sentiment_label': 'Positive', 'confidence': 0.9}
+            for review in batch.unique_reviews
+        ]
+
+def slow_engine(fail_on=None):
+    """Build a detect -> translate -> score engine with sleeping stages."""
+    return PipelineEngine([
+        DedupStage(), SlowStage('detect'), SlowStage('translate', fail_on=fail_on),
+        RecordStage(), SlowStage('score'), FanOutStage()
+    ])
+
+async def collect(reviews, engine, **kwargs):
+    """Gather every batch the orchestrator yields."""
+    return [batch async for batch in orchestrate(reviews, engine, **kwargs)]
+
+@patch('pipeline.orchestrator.gemini_available', return_value=True)
+def test_split_phases(mock_gemini):
+    """Test I/O-bound stages get a phase of their own."""
+    phases = split_phases(slow_engine())
+    assert [[stage.name for stage in phase] for phase in phases] == [
+        ['dedup', 'detect'], ['translate'], ['sentiment', 'score', 'fan_out']
+    ]
+
+@patch('pipeline.orchestrator.gemini_available', return_value=False)
+def test_split_phases_without_gemini(mock_gemini):
+    """Test Marian translation stays in one phase with the other CPU-bound stages."""
+    phases = split_phases(slow_engine())
+    assert [[stage.name for stage in phase] for phase in phases] == [
+        ['dedup', 'detect', 'translate', 'sentiment', 'score', 'fan_out']
+    ]
+
+def test_results_in_input_order():
+    """Test batches come out in order and match a sequential run."""
+    reviews = [f"review {i}" for i in range(23)]
+    batches = asyncio.run(collect(iter(reviews), slow_engine(), batch_size=5))
+
+    results = [result for batch in batches for result in batch.results]
+    assert [batch.first_id for batch in batches] == [1, 6, 11, 16, 21]
+    assert results == slow_engine().run(reviews).results
+
+@patch('pipeline.orchestrator.gemini_available', return_value=True)
+def test_phases_overlap(mock_gemini):
+    """Test different batches are in different phases at the same time."""
+    SlowStage.peak = 0
+    asyncio.run(collect([f"review {i}" for i in range(40)], slow_engine(), batch_size=4))
+    assert SlowStage.peak >= 2
+
+@patch('pipeline.orchestrator.gemini_available', return_value=True)
+def test_backpressure_bounds_reads(mock_gemini):
+    """Test reviews are read only as fast as the consumer drains results."""
+    read = []
+
+    def source():
+        for i in range(1000):
+            read.append(i)
+            yield f"review {i}"
+
+    async def first_then_wait():
+        batches = orchestrate(source(), slow_engine(), batch_size=10, queue_size=1)
+        await batches.__anext__()
+        await asyncio.sleep(0.3)
+        count = len(read)
+        await batches.aclose()
+        return count
+
+    # At most one batch per queue (4), one per phase (3), one being fed and one delivered
+    assert asyncio.run(first_then_wait()) <= 9 * 10
+
+def test_input_read_off_event_loop():
+    """Test the input is read in the executor, not on the event loop thread."""
+    readers = set()
+
+    def source():
+        for i in range(12):
+            readers.add(threading.current_thread())
+            yield f"review {i}"
+
+    batches = asyncio.run(collect(source(), slow_engine(), batch_size=5))
+    assert len(batches) == 3
+    assert threading.main_thread() not in readers
+
+def test_stage_failure_propagates():
+    """Test an exception in any phase stops the run and is raised."""
+    with pytest.raises(RuntimeError, match="translate failed"):
+        asyncio.run(collect([f"review {i}" for i in range(30)], slow_engine(fail_on=11), batch_size=5))
+
+def test_run_pipelined_exports_in_order():
+    """Test results reach the exporter in order with a summary."""
+    class ListExporter:
+        """Keep exported results in memory."""
+
+        def __init__(self):
+            self.results = []
+
+        def write(self, results):
+            self.results.extend(results)
+
+    exporter = ListExporter()
+    with patch('pipeline.summarize.Config.GEMINI_API_KEY', ''):
+        summary = run_pipelined([f"review {i}" for i in range(12)], exporter, slow_engine(), batch_size=5)
+
+    assert [result['id'] for result in exporter.results] == list(range(1, 13))
+    assert summary['total_reviews'] == 12
+    assert summary['distribution']['Positive'] == 100.0
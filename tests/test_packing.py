@@ -0,0 +1,41 @@
+import json
+import pytest
+from pipeline.packing import pack_items, build_packed_prompt, parse_packed_response, estimate_prompt_tokens
+
+def test_estimate_prompt_tokens_counts_cjk():
+    """Test CJK text is not underestimated by a word count."""
+    assert estimate_prompt_tokens("配送が遅く、箱も壊れていました。") > 10
+    assert estimate_prompt_tokens("Great product") < 10
+
+def test_pack_items_respects_item_limit():
+    """Test packets never exceed the item limit and keep input order."""
+    texts = ["short review"] * 7
+    packets = pack_items(range(7), texts, max_items=3, max_tokens=10000)
+    assert packets == [[0, 1, 2], [3, 4, 5], [6]]
+
+def test_pack_items_respects_token_budget():
+    """Test long texts shrink packets to stay under the token budget."""
+    texts = ["word " * 60, "tiny", "tiny", "word " * 60, "tiny"]
+    packets = pack_items(range(5), texts, max_items=10, max_tokens=130)
+    assert packets == [[0, 1, 2], [3, 4]]
+
+def test_build_packed_prompt_tags_ids():
+    """Test each review is sent with its ID and language."""
+    prompt = build_packed_prompt([2, 5], {2: "Hola", 5: "Adiós"}, {2: 'es', 5: 'es'})
+    items = json.loads(prompt[prompt.index('['):])
+    assert items == [{'id': 2, 'lang': 'es', 'text': 'Hola'}, {'id': 5, 'lang': 'es', 'text': 'Adiós'}]
+
+def test_parse_packed_response_valid():
+    """Test a well-formed response (optionally fenced) is parsed."""
+    output = '```json\n[{"id": 0, "translation": "Hello"}, {"id": "1", "translation": "Bye"}]\n```'
+    assert parse_packed_response(output, [0, 1]) == {0: "Hello", 1: "Bye"}
+
+@pytest.mark.parametrize("output", [None, "", "not json", '{"id": 0}', '[1, 2]'])
+def test_parse_packed_response_malformed(output):
+    """Test malformed responses yield no translations."""
+    assert parse_packed_response(output, [0, 1]) == {}
+
+def test_parse_packed_response_drops_invalid_items():
+    """Test unknown IDs and empty translations are ignored."""
+    output = '[{"id": 0, "translation": "Hello"}, {"id": 7, "translation": "Extra"}, {"id": 1, "translation": " "}]'
+    assert parse_packed_response(output, [0, 1]) == {0: "Hello"}
@@ -0,0 +1,33 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import pipeline.preload as preload
+
+@patch('pipeline.preload.gc')
+@patch('pipeline.preload.translate.load_translator')
+@patch('pipeline.preload.sentiment.initialize_sentiment_analyzer')
+def test_preload_models(mock_initialize, mock_load_translator, mock_gc):
+    """Test preloading loads and shares every configured model once."""
+    translator = MagicMock()
+    mock_load_translator.return_value = translator
+    
+    with patch.object(preload, 'models_ready', False), \
+         patch.object(preload.sentiment, 'sentiment_analyzer', None):
+        assert preload.preload_models(['es', 'fr']) is True
+        assert preload.models_ready is True
+        preload.preload_models(['es', 'fr'])
+    
+    mock_initialize.assert_called_once()
+    assert mock_load_translator.call_count == 2
+    translator.model.share_memory.assert_called()
+    mock_gc.freeze.assert_called_once()
+
+def test_share_model_weights_freezes_parameters():
+    """Test weights are put in inference mode before sharing."""
+    parameter = MagicMock()
+    model_pipeline = MagicMock()
+    model_pipeline.model.parameters.return_value = [parameter]
+    
+    preload.share_model_weights(model_pipeline)
+    model_pipeline.model.eval.assert_called_once()
+    parameter.requires_grad_.assert_called_once_with(False)
+    model_pipeline.model.share_memory.assert_called_once()
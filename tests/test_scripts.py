@@ -0,0 +1,30 @@
+from pipeline.scripts import script_counts, classify_script
+
+def test_script_counts():
+    """Test letters are counted per script and punctuation is ignored."""
+    assert script_counts("Galaxy S23 배터리가 좋아요!") == {'Latin': 7, 'Hangul': 7}
+    assert script_counts("123 !?") == {}
+
+def test_single_language_scripts():
+    """Test single-language scripts decide the language."""
+    assert classify_script("สินค้าดีมาก") == ('th', 1.0)
+    assert classify_script("यह उत्पाद बहुत अच्छा है") == ('hi', 1.0)
+    assert classify_script("배송이 빨라요") == ('ko', 1.0)
+
+def test_japanese_counts_han_with_kana():
+    """Test Han characters count towards Japanese when kana is present."""
+    assert classify_script("この製品は素晴らしいです") == ('ja', 1.0)
+    assert classify_script("这个产品非常好") is None
+
+def test_shared_scripts_need_detector():
+    """Test Latin, Cyrillic and Arabic text is left to the detector."""
+    assert classify_script("Muy bueno") is None
+    assert classify_script("Очень хорошо") is None
+    assert classify_script("منتج رائع") is None
+    assert classify_script("") is None
+
+def test_mixed_scripts_need_majority():
+    """Test a script must hold more than min_share of the letters."""
+    assert classify_script("Samsung Galaxy 좋아요") is None
+    assert classify_script("Galaxy 배터리가 좋아요") == ('ko', 0.538)
+    assert classify_script("Galaxy 배터리가 좋아요", min_share=0.6) is None
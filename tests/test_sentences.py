@@ -0,0 +1,43 @@
+from pipeline.sentences import split_sentences, wrap_segment, join_segments
+
+def test_split_sentences():
+    """Test sentences and paragraph breaks are kept apart."""
+    text = "Muy bueno. ¿Llegó tarde?\n\nVolveré pronto!"
+    segments = split_sentences(text)
+
+    assert segments == [
+        ("Muy bueno.", ' '),
+        ("¿Llegó tarde?", '\n'),
+        ("Volveré pronto!", '')
+    ]
+
+def test_split_sentences_cjk():
+    """Test full-width punctuation splits without following spaces."""
+    segments = split_sentences("とても良い。配送が遅かった！また買います")
+
+    assert [segment for segment, _ in segments] == ["とても良い。", "配送が遅かった！", "また買います"]
+
+def test_split_sentences_empty():
+    """Test empty or blank text gives no segments."""
+    assert split_sentences("") == []
+    assert split_sentences("   \n ") == []
+
+def test_wrap_long_sentence():
+    """Test over-long sentences are wrapped at word boundaries."""
+    pieces = wrap_segment("uno dos tres cuatro cinco", '\n', 10)
+
+    assert pieces == [("uno dos", ' '), ("tres", ' '), ("cuatro", ' '), ("cinco", '\n')]
+    assert all(len(piece) <= 10 for piece, _ in pieces)
+
+def test_wrap_without_spaces():
+    """Test text without spaces is cut by characters."""
+    pieces = wrap_segment("あいうえおかきくけこさ", '', 4)
+
+    assert [piece for piece, _ in pieces] == ["あいうえ", "おかきく", "けこさ"]
+
+def test_join_round_trip():
+    """Test joining the split segments restores normalised text."""
+    text = "First one. Second one!\nThird."
+    segments = split_sentences(text)
+
+    assert join_segments([s for s, _ in segments], [sep for _, sep in segments]) == text
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import patch, MagicMock
-from pipeline.sentiment import analyze_sentiment, map_sentiment_label, get_sentiment_distribution
+from pipeline.sentiment import analyze_sentiment, analyze_sentiment_batch, analyze_sentiment_cascade, map_sentiment_label, get_sentiment_distribution
 
 def test_map_sentiment_labels():
     """Test sentiment label mapping."""
@@ -30,6 +30,156 @@ def test_analyze_sentiment_success(mock_analyzer):
     assert result['label'] == 'Positive'
     assert result['confidence'] == 0.9
 
+@patch('pipeline.sentiment.sentiment_analyzer')
+def test_analyze_sentiment_batch_keeps_order(mock_analyzer):
+    """Test batched analysis returns results in input order."""
+    mock_analyzer.side_effect = lambda texts, **kwargs: [
+        [
+            {'label': 'POSITIVE', 'score': 0.8 if 'great' in text else 0.1},
+            {'label': 'NEGATIVE', 'score': 0.2 if 'great' in text else 0.9}
+        ]
+        for text in texts
+    ]
+    
+    results = analyze_sentiment_batch(["This is great", "", "This is awful", "ok"], batch_size=1)
+    assert [r['label'] for r in results] == ['Positive', 'Neutral', 'Negative', 'Neutral']
+    assert results[0]['confidence'] == 0.8
+    assert results[1]['confidence'] == 0.5
+    # Short texts never reach the model
+    assert mock_analyzer.call_count == 2
+
+@patch('pipeline.sentiment.sentiment_analyzer')
+def test_analyze_sentiment_batch_retries_failed_batch(mock_analyzer):
+    """Test a failing batch falls back to per-item analysis."""
+    def analyzer(texts, **kwargs):
+        if isinstance(texts, list):
+            raise RuntimeError("batch failed")
+        if 'broken' in texts:
+            raise RuntimeError("item failed")
+        return [[{'label': 'POSITIVE', 'score': 0.9}]]
+    mock_analyzer.side_effect = analyzer
+    
+    results = analyze_sentiment_batch(["Nice product", "broken input"])
+    assert results[0] == {'label': 'Positive', 'confidence': 0.9}
+    assert results[1] == {'label': 'Neutral', 'confidence': 0.5}
+
+@patch('pipeline.sentiment.Config.SENTIMENT_BACKEND', 'onnx-int8')
+@patch('pipeline.sentiment.load_onnx_sentiment_pipeline')
+def test_initialize_onnx_backend(mock_load):
+    """Test the ONNX backend is used when configured."""
+    import pipeline.sentiment as sentiment
+    onnx_analyzer = MagicMock()
+    mock_load.return_value = onnx_analyzer
+    
+    with patch.object(sentiment, 'sentiment_analyzer', None):
+        sentiment.initialize_sentiment_analyzer()
+        assert sentiment.sentiment_analyzer is onnx_analyzer
+    mock_load.assert_called_once_with('onnx-int8')
+
+@patch('pipeline.sentiment.sentiment_analyzer')
+def test_analyze_sentiment_batch_uses_cache(mock_analyzer):
+    """Test texts scored once are served from the cache afterwards."""
+    from pipeline.cache import ResultCache
+    mock_analyzer.side_effect = lambda texts, **kwargs: [
+        [{'label': 'POSITIVE', 'score': 0.9}] for text in texts
+    ]
+    
+    with patch('pipeline.sentiment.sentiment_cache', ResultCache(max_size=10)):
+        first = analyze_sentiment_batch(["Great product", "Love it"])
+        second = analyze_sentiment_batch(["Love it", "Great product"])
+    
+    assert first == second[::-1]
+    assert mock_analyzer.call_count == 1
+
+@patch('pipeline.sentiment.Config.SENTIMENT_WINDOW_TOKENS', 6)
+@patch('pipeline.sentiment.Config.SENTIMENT_WINDOW_OVERLAP', 1)
+@patch('pipeline.sentiment.sentiment_cache', None)
+@patch('pipeline.sentiment.Config.SENTIMENT_CACHE_SIZE', 0)
+@patch('pipeline.sentiment.score_windows')
+@patch('pipeline.sentiment.sentiment_analyzer')
+def test_analyze_sentiment_batch_long_text_windows(mock_analyzer, mock_score):
+    """Test long texts are scored as token windows and combined into one result."""
+    vocab = {'good': 1, 'bad': 2, 'not': 3}
+    mock_tokenizer = MagicMock(is_fast=True, model_max_length=512)
+    mock_tokenizer.num_special_tokens_to_add.return_value = 2
+    mock_tokenizer.side_effect = lambda texts, **kwargs: {
+        'input_ids': [[0] + [vocab[word] for word in text.split()] + [0] for text in texts],
+        'special_tokens_mask': [[1] + [0] * len(text.split()) + [1] for text in texts]
+    }
+    mock_analyzer.tokenizer = mock_tokenizer
+    seen = []
+    def score(windows):
+        seen.extend(windows)
+        return [
+            [
+                {'label': 'POSITIVE', 'score': 0.9 if 1 in ids else 0.2},
+                {'label': 'NEGATIVE', 'score': 0.1 if 1 in ids else 0.8}
+            ]
+            for ids in windows
+        ]
+    mock_score.side_effect = score
+    
+    long_text = 'good ' * 10 + 'bad bad'
+    results = analyze_sentiment_batch([long_text, 'not good'])
+    
+    assert all(len(ids) <= 6 for ids in seen)
+    assert results[0]['label'] == 'Positive'
+    assert results[1] == {'label': 'Positive', 'confidence': 0.9}
+    # Token ids go straight to the model; the text pipeline is never called
+    mock_analyzer.assert_not_called()
+    assert mock_tokenizer.call_count == 1
+
+@patch('pipeline.sentiment.sentiment_analyzer')
+def test_score_windows_runs_model_on_token_ids(mock_analyzer):
+    """Test windows are padded and scored with one forward pass."""
+    import torch
+    mock_analyzer.mock_add_spec(['tokenizer', 'model'])
+    mock_analyzer.tokenizer.pad.return_value = {
+        'input_ids': torch.tensor([[0, 5, 0], [0, 0, 1]]),
+        'attention_mask': torch.tensor([[1, 1, 1], [1, 1, 0]])
+    }
+    mock_analyzer.model.device = torch.device('cpu')
+    mock_analyzer.model.config.id2label = {0: 'NEGATIVE', 1: 'POSITIVE'}
+    mock_analyzer.model.return_value = MagicMock(logits=torch.tensor([[0.0, 0.0], [0.0, 10.0]]))
+    
+    from pipeline.sentiment import score_windows
+    scores = score_windows([[0, 5, 0], [0, 0]])
+    
+    mock_analyzer.tokenizer.pad.assert_called_once_with({'input_ids': [[0, 5, 0], [0, 0]]}, return_tensors='pt')
+    assert scores[0] == [{'label': 'NEGATIVE', 'score': 0.5}, {'label': 'POSITIVE', 'score': 0.5}]
+    assert scores[1][1]['label'] == 'POSITIVE' and scores[1][1]['score'] > 0.99
+
+@patch('pipeline.sentiment.sentiment_analyzer')
+def test_analyze_sentiment_cascade(mock_analyzer):
+    """Test only uncertain reviews reach the transformer."""
+    import pipeline.sentiment as sentiment
+    seen = []
+    def analyzer(texts, **kwargs):
+        seen.extend(texts)
+        return [[{'label': 'NEUTRAL', 'score': 0.7}] for text in texts]
+    mock_analyzer.side_effect = analyzer
+    
+    with patch.dict(sentiment.cascade_stats, {'lexicon': 0, 'transformer': 0, 'default': 0}):
+        results = analyze_sentiment_cascade(["Great product!", "It arrived on Tuesday", "ok"], threshold=0.7)
+        stats = sentiment.get_cascade_stats()
+    
+    assert [r['tier'] for r in results] == ['lexicon', 'transformer', 'default']
+    assert results[0]['label'] == 'Positive'
+    assert results[1] == {'label': 'Neutral', 'confidence': 0.7, 'tier': 'transformer'}
+    assert seen == ["It arrived on Tuesday"]
+    assert stats['counts'] == {'lexicon': 1, 'transformer': 1, 'default': 1}
+    assert stats['total'] == 3
+
+def test_sentiment_model_follows_pipeline_mode():
+    """Test direct mode uses the multilingual sentiment model."""
+    from config import Config
+    from pipeline.sentiment import get_sentiment_model_name
+    
+    with patch.object(Config, 'PIPELINE_MODE', 'direct'):
+        assert get_sentiment_model_name() == Config.MULTILINGUAL_SENTIMENT_MODEL
+    with patch.object(Config, 'PIPELINE_MODE', 'translate'):
+        assert get_sentiment_model_name() == Config.SENTIMENT_MODEL
+
 def test_get_sentiment_distribution():
     """Test sentiment distribution calculation."""
     results = [
@@ -0,0 +1,124 @@
+import io
+import json
+import pytest
+from unittest.mock import patch
+from pipeline.engine import PipelineEngine, Stage, DedupStage, FanOutStage
+from pipeline.streaming import iter_micro_batches, stream_batches, stream_results, SummaryAggregator, run_streaming
+from pipeline.summarize import generate_summary
+from utils.exporter import CsvStreamExporter, JsonStreamExporter, export_to_csv, export_to_json
+from utils.file_handler import iter_reviews_from_path
+
+class FakeScoreStage(Stage):
+    """Build records without models: 'good' is positive, anything else negative."""
+
+    name = 'translate'
+
+    def run(self, batch):
+        batch.records = [
+            {
+                'original_text': review,
+                'detected_language': 'es' if review.startswith('Hola') else 'en',
+                'translated_text': None,
+                'sentiment_label': 'Positive' if 'good' in review.lower() else 'Negative',
+                'confidence': 0.9
+            }
+            for review in batch.unique_reviews
+        ]
+
+def fake_engine():
+    """Build an engine that needs no models."""
+    return PipelineEngine([DedupStage(), FakeScoreStage(), FanOutStage()])
+
+def reviews(count):
+    """Generate reviews lazily, like a file reader would."""
+    for i in range(count):
+        yield "Good stuff" if i % 3 else f"Hola {i}"
+
+def test_iter_micro_batches():
+    """Test any iterable is cut into bounded lists."""
+    assert list(iter_micro_batches(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(iter_micro_batches([], 3)) == []
+
+def test_stream_matches_whole_batch():
+    """Test streamed results equal one whole-batch run, ids included."""
+    texts = list(reviews(10)) + ["  ", "Good stuff"]
+    streamed = list(stream_results(iter(texts), fake_engine(), batch_size=4))
+
+    assert streamed == fake_engine().run(texts).results
+    assert [result['id'] for result in streamed] == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 12]
+
+def test_stream_holds_one_micro_batch():
+    """Test the input is consumed one micro-batch at a time."""
+    consumed = []
+
+    def source():
+        for review in reviews(10):
+            consumed.append(review)
+            yield review
+
+    batches = stream_batches(source(), fake_engine(), batch_size=4)
+    first = next(batches)
+    assert len(first.reviews) == 4
+    assert len(consumed) == 4
+
+def test_aggregator_matches_generate_summary():
+    """Test the running summary equals the summary of all results."""
+    results = list(stream_results(reviews(30), fake_engine(), batch_size=7))
+    aggregator = SummaryAggregator()
+    for start in range(0, len(results), 7):
+        aggregator.add(results[start:start + 7])
+
+    with patch('pipeline.summarize.Config.GEMINI_API_KEY', ''):
+        expected = generate_summary(results)
+        summary = aggregator.summary()
+
+    for key in ('overall_sentiment', 'total_reviews', 'distribution', 'insights'):
+        assert summary[key] == expected[key]
+    assert summary['languages_detected'] == sorted(expected['languages_detected'])
+    assert sum(len(samples) for samples in aggregator.samples.values()) <= 6
+
+def test_aggregator_counts_batch_dedup():
+    """Test duplicates collapsed within micro-batches are reported."""
+    aggregator = SummaryAggregator()
+    for batch in stream_batches(["Good", "Good", "Bad", "Good"], fake_engine(), batch_size=2):
+        aggregator.add_batch(batch)
+
+    with patch('pipeline.summarize.Config.GEMINI_API_KEY', ''):
+        summary = aggregator.summary()
+    assert summary['dedup']['duplicate_reviews'] == 1
+    assert SummaryAggregator().summary()['total_reviews'] == 0
+
+def test_run_streaming_exports_csv():
+    """Test results stream to CSV in the export_to_csv layout."""
+    output = io.StringIO()
+    exporter = CsvStreamExporter(output)
+    done = []
+    with patch('pipeline.summarize.Config.GEMINI_API_KEY', ''):
+        summary = run_streaming(reviews(9), exporter, fake_engine(), batch_size=4, progress=done.append)
+    exporter.close()
+
+    results = list(stream_results(reviews(9), fake_engine(), batch_size=4))
+    assert output.getvalue().replace('\r\n', '\n') == export_to_csv(results).decode('utf-8')
+    assert summary['total_reviews'] == 9
+    assert done == [4, 8, 9]
+
+def test_json_stream_exporter():
+    """Test streamed JSON holds the same data as export_to_json."""
+    results = list(stream_results(reviews(5), fake_engine(), batch_size=2))
+    output = io.StringIO()
+    exporter = JsonStreamExporter(output)
+    exporter.write(results[:2])
+    exporter.write(results[2:])
+    exporter.close()
+
+    assert json.loads(output.getvalue()) == json.loads(export_to_json(results))
+
+def test_iter_reviews_from_path(tmp_path):
+    """Test reviews are read from CSV and text files lazily."""
+    csv_path = tmp_path / 'reviews.csv'
+    csv_path.write_text("id,Review\n1,Great\n2,\n3, Bad \n", encoding='utf-8')
+    text_path = tmp_path / 'reviews.txt'
+    text_path.write_text("Great\n\n Bad \n", encoding='utf-8')
+
+    assert list(iter_reviews_from_path(str(csv_path), chunk_size=1)) == ['Great', 'Bad']
+    assert list(iter_reviews_from_path(str(text_path))) == ['Great', 'Bad']
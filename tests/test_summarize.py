@@ -35,6 +35,18 @@ def test_generate_summary_with_results():
     assert 'en' in summary['languages_detected']
     assert 'es' in summary['languages_detected']
     assert 'fr' in summary['languages_detected']
+    assert summary['dedup']['duplicate_reviews'] == 0
+
+def test_generate_summary_counts_triage():
+    """Test triage decisions are summarised when present."""
+    results = [
+        {'sentiment_label': 'Positive', 'detected_language': 'en', 'original_text': 'Good', 'triage': {'action': 'passthrough'}},
+        {'sentiment_label': 'Positive', 'detected_language': 'es', 'original_text': 'Bueno', 'triage': {'action': 'translate'}}
+    ]
+    
+    summary = generate_summary(results)
+    assert summary['triage']['translations_saved'] == 1
+    assert summary['triage']['translate'] == 1
 
 def test_generate_basic_insights():
     """Test basic insights generation."""
@@ -1,6 +1,9 @@
 import pytest
 from unittest.mock import patch, MagicMock
-from pipeline.translate import translate_text, translate_with_huggingface
+import json
+from pipeline.translate import translate_text, translate_texts, translate_with_huggingface, translate_with_huggingface_batch, fill_translations, load_translation_model, request_gemini_translations_packed, get_generation_kwargs, quantize_translator
+from pipeline.model_pool import ModelPool
+from pipeline.cache import TranslationMemory
 
 def test_translate_english_text():
     """Test that English text is returned unchanged."""
@@ -41,4 +44,280 @@ def test_huggingface_translation_failure(mock_pipeline):
     mock_pipeline.side_effect = Exception("Translation failed")
     
     result = translate_with_huggingface("Texto original", 'es')
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+@patch('pipeline.translate.translation_cache', ModelPool(load_translation_model, 1024 ** 3))
+@patch('pipeline.translate.pipeline')
+def test_huggingface_batch_translation(mock_pipeline):
+    """Test batched HuggingFace translation keeps input order."""
+    mock_translator = MagicMock(side_effect=lambda texts, **kwargs: [
+        {'translation_text': text.upper()} for text in texts
+    ])
+    mock_pipeline.return_value = mock_translator
+    
+    texts = ["uno dos tres cuatro cinco", "hola", "buenos dias"]
+    result = translate_with_huggingface_batch(texts, 'es', max_tokens=8)
+    assert result == [text.upper() for text in texts]
+    mock_pipeline.assert_called_once()
+
+@patch('pipeline.translate.translation_memory', TranslationMemory())
+@patch('pipeline.translate.load_translator')
+def test_huggingface_batch_uses_translation_memory(mock_load):
+    """Test known translations are served from memory and only new texts are decoded."""
+    mock_translator = MagicMock(side_effect=lambda texts, **kwargs: [
+        {'translation_text': text.upper()} for text in texts
+    ])
+    mock_load.return_value = mock_translator
+    
+    assert translate_with_huggingface_batch(["hola", "adiós"], 'es') == ["HOLA", "ADIÓS"]
+    assert translate_with_huggingface_batch(["adiós", "gracias"], 'es') == ["ADIÓS", "GRACIAS"]
+    assert mock_translator.call_args_list[-1][0][0] == ["gracias"]
+    
+    mock_translator.reset_mock()
+    mock_load.reset_mock()
+    assert translate_with_huggingface_batch(["hola", "gracias"], 'es') == ["HOLA", "GRACIAS"]
+    mock_load.assert_not_called()
+
+@patch('pipeline.translate.translation_memory', None)
+@patch('pipeline.translate.Config.TRANSLATION_CACHE_SIZE', 0)
+@patch('pipeline.translate.get_breaker')
+@patch('pipeline.translate.load_translator')
+def test_huggingface_batch_fallback_uses_probe(mock_load, mock_get_breaker):
+    """Test a half-open probe whose batch fails still retries items and records one outcome."""
+    from pipeline.circuit import CircuitBreaker
+    now = [0]
+    breaker = CircuitBreaker('marian', failure_threshold=1, cooldown=10, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 10
+    mock_get_breaker.return_value = breaker
+    def translator(texts, **kwargs):
+        if isinstance(texts, list):
+            raise RuntimeError("batch failed")
+        if texts == "roto":
+            raise RuntimeError("item failed")
+        return [{'translation_text': texts.upper()}]
+    mock_load.return_value = MagicMock(side_effect=translator)
+    
+    assert translate_with_huggingface_batch(["hola", "roto"], 'es') == ["HOLA", None]
+    assert breaker.status()['state'] == 'closed'
+    
+    breaker.record_failure()
+    now[0] = 20
+    mock_load.return_value = MagicMock(side_effect=RuntimeError("down"))
+    assert translate_with_huggingface_batch(["hola", "adiós"], 'es') == [None, None]
+    # Only the batch's own failure is counted, not one per retried item
+    assert breaker.status()['state'] == 'open'
+    assert breaker.failures == 2
+
+@patch('pipeline.translate.translation_memory', TranslationMemory())
+@patch('pipeline.translate.load_translator')
+def test_translation_memory_is_per_profile(mock_load):
+    """Test translations made under the fast profile are not served under the default one."""
+    mock_load.return_value = MagicMock(side_effect=lambda texts, **kwargs: [
+        {'translation_text': f"fast:{text}"} for text in texts
+    ])
+    with patch('pipeline.translate.Config.TRANSLATION_PROFILE', 'fast'):
+        assert translate_with_huggingface_batch(["hola"], 'es') == ["fast:hola"]
+    
+    mock_load.return_value = MagicMock(side_effect=lambda texts, **kwargs: [
+        {'translation_text': f"default:{text}"} for text in texts
+    ])
+    with patch('pipeline.translate.Config.TRANSLATION_PROFILE', 'default'):
+        assert translate_with_huggingface_batch(["hola"], 'es') == ["default:hola"]
+        assert translate_with_huggingface("hola", 'es') == "default:hola"
+
+@patch('pipeline.translate.translation_memory', TranslationMemory())
+@patch('pipeline.translate.Config.GEMINI_API_KEY', 'test-key')
+@patch('pipeline.translate.request_gemini_translations')
+def test_translate_texts_caches_gemini(mock_request):
+    """Test Gemini translations are stored and reused across calls."""
+    mock_request.side_effect = lambda texts, langs: [f"en:{text}" for text in texts]
+    
+    assert translate_texts(["Hola", "Bonjour"], ['es', 'fr']) == ["en:Hola", "en:Bonjour"]
+    assert translate_texts(["Bonjour", "Hola", "Danke"], ['fr', 'es', 'de']) == ["en:Bonjour", "en:Hola", "en:Danke"]
+    assert mock_request.call_args_list[-1][0] == (["Danke"], ['de'])
+
+def fake_packed_client(drop=()):
+    """Build a client stub answering packed prompts, leaving out the given IDs."""
+    def answer(prompt):
+        items = json.loads(prompt[prompt.index('\n\n[') + 2:])
+        return json.dumps([
+            {'id': item['id'], 'translation': item['text'].upper()}
+            for item in items if item['id'] not in drop
+        ])
+    
+    client = MagicMock()
+    client.map.side_effect = lambda prompts, **kwargs: [answer(prompt) for prompt in prompts]
+    return client
+
+def test_packed_gemini_translation():
+    """Test several reviews are translated per request."""
+    client = fake_packed_client()
+    texts = ["uno", "dos", "tres", "cuatro", "cinco"]
+    
+    result = request_gemini_translations_packed(client, texts, ['es'] * 5, max_items=3, max_tokens=1000)
+    assert result == ["UNO", "DOS", "TRES", "CUATRO", "CINCO"]
+    assert len(client.map.call_args[0][0]) == 2
+
+def test_packed_gemini_retries_only_missing():
+    """Test reviews missing from a response are retried in smaller packets."""
+    answered = fake_packed_client(drop={1, 2})
+    client = MagicMock()
+    calls = []
+    
+    def map_prompts(prompts, **kwargs):
+        calls.append(prompts)
+        # Only the first round drops items
+        stub = answered if len(calls) == 1 else fake_packed_client()
+        return stub.map(prompts)
+    
+    client.map.side_effect = map_prompts
+    result = request_gemini_translations_packed(client, ["a", "b", "c", "d"], ['es'] * 4, max_items=4, max_tokens=1000)
+    
+    assert result == ["A", "B", "C", "D"]
+    assert len(calls) == 2
+    retried = [json.loads(prompt[prompt.index('\n\n[') + 2:]) for prompt in calls[1]]
+    assert [[item['id'] for item in items] for items in retried] == [[1], [2]]
+
+def test_packed_gemini_gives_up_on_failed_requests():
+    """Test a failed request is not split and its reviews stay untranslated."""
+    client = MagicMock()
+    client.map.side_effect = lambda prompts, **kwargs: [None] * len(prompts)
+    
+    result = request_gemini_translations_packed(client, ["a", "b"], ['es', 'es'], max_items=2, max_tokens=1000)
+    assert result == [None, None]
+    client.map.assert_called_once()
+
+@patch('pipeline.translate.get_breaker')
+@patch('pipeline.translate.translate_with_gemini')
+@patch('pipeline.translate.translate_with_huggingface')
+def test_translate_text_skips_open_circuit(mock_hf, mock_gemini, mock_get_breaker):
+    """Test translate_text goes straight to HuggingFace while Gemini's circuit is open."""
+    mock_get_breaker.return_value.available.return_value = False
+    mock_hf.return_value = "Translated"
+    
+    assert translate_text("Hola", 'es') == "Translated"
+    mock_gemini.assert_not_called()
+    mock_get_breaker.assert_called_with('gemini')
+
+def test_generation_kwargs_default_profile():
+    """Test the default profile keeps the fixed length cap."""
+    assert get_generation_kwargs(MagicMock(), ["hola"], 'default') == {'max_length': 512}
+
+@patch('pipeline.translate.Config.TRANSLATION_NUM_BEAMS', 2)
+def test_generation_kwargs_fast_profile():
+    """Test the fast profile scales max_new_tokens with the longest input."""
+    translator = MagicMock(tokenizer=None)
+    short = get_generation_kwargs(translator, ["hola"], 'fast')
+    long = get_generation_kwargs(translator, ["hola", "una reseña bastante larga " * 10], 'fast')
+    
+    assert short['num_beams'] == 2
+    assert 'max_length' not in short
+    assert short['max_new_tokens'] < long['max_new_tokens'] <= 512
+
+def test_quantize_translator():
+    """Test linear layers are swapped for dynamic int8 layers."""
+    torch = pytest.importorskip('torch')
+    translator = MagicMock()
+    translator.model = torch.nn.Sequential(torch.nn.Linear(8, 4))
+    
+    quantize_translator(translator)
+    assert 'quantized' in type(translator.model[0]).__module__
+    assert translator.model(torch.ones(1, 8)).shape == (1, 4)
+
+@patch('pipeline.translate.translate_texts')
+def test_fill_translations(mock_translate):
+    """Test only untranslated non-English results are translated."""
+    mock_translate.return_value = ["Great product"]
+    results = [
+        {'original_text': 'Gran producto', 'detected_language': 'es', 'translated_text': None},
+        {'original_text': 'Great product', 'detected_language': 'en', 'translated_text': None},
+        {'original_text': 'Bon produit', 'detected_language': 'fr', 'translated_text': 'Good product'}
+    ]
+    
+    fill_translations(results)
+    assert results[0]['translated_text'] == "Great product"
+    assert results[1]['translated_text'] is None
+    assert results[2]['translated_text'] == 'Good product'
+    mock_translate.assert_called_once_with(['Gran producto'], ['es'])
+
+@patch('pipeline.translate.translate_texts')
+def test_fill_translations_follows_triage(mock_translate):
+    """Test results triaged as not needing translation are left alone."""
+    mock_translate.return_value = ["Very good"]
+    results = [
+        {'original_text': 'Good', 'detected_language': 'so', 'translated_text': None, 'triage': {'action': 'passthrough'}},
+        {'original_text': '很好', 'detected_language': 'zh-cn', 'translated_text': None,
+         'triage': {'action': 'translate', 'translation_lang': 'zh'}}
+    ]
+    
+    fill_translations(results)
+    assert results[0]['translated_text'] is None
+    assert results[1]['translated_text'] == "Very good"
+    mock_translate.assert_called_once_with(['很好'], ['zh'])
+
+@patch('pipeline.translate.Config.GEMINI_API_KEY', '')
+@patch('pipeline.translate.translate_with_huggingface_batch')
+def test_translate_texts_groups_by_language(mock_batch):
+    """Test texts are batched per source language and mapped back."""
+    mock_batch.side_effect = lambda texts, lang: [f"{lang}:{text}" for text in texts]
+    
+    texts = ["Hola", "Hello", "Bonjour", "Adiós", "Salut"]
+    langs = ['es', 'en', 'fr', 'es', 'fr']
+    result = translate_texts(texts, langs)
+    
+    assert result == ["es:Hola", "Hello", "fr:Bonjour", "es:Adiós", "fr:Salut"]
+    assert mock_batch.call_count == 2
+
+@patch('pipeline.translate.Config.GEMINI_API_KEY', '')
+@patch('pipeline.translate.translate_with_huggingface_batch')
+def test_translate_texts_keeps_original_on_failure(mock_batch):
+    """Test failed translations fall back to the original text."""
+    mock_batch.return_value = [None]
+    assert translate_texts(["Hola"], ['es']) == ["Hola"]
+
+@patch('pipeline.translate.Config.GEMINI_API_KEY', '')
+@patch('pipeline.translate.Config.TRANSLATION_SPLIT_MIN_CHARS', 20)
+@patch('pipeline.translate.translate_with_huggingface_batch')
+def test_translate_texts_splits_long_reviews(mock_batch):
+    """Test long reviews are translated sentence by sentence in shared batches."""
+    mock_batch.side_effect = lambda texts, lang: [f"<{text}>" for text in texts]
+    
+    texts = ["Muy bueno. Llegó tarde.\nVolveré.", "Hola", "Está bien. No me gustó nada."]
+    result = translate_texts(texts, ['es', 'es', 'es'])
+    
+    assert result == [
+        "<Muy bueno.> <Llegó tarde.>\n<Volveré.>",
+        "<Hola>",
+        "<Está bien.> <No me gustó nada.>"
+    ]
+    mock_batch.assert_called_once()
+    assert len(mock_batch.call_args[0][0]) == 6
+
+@patch('pipeline.translate.translation_memory', None)
+@patch('pipeline.translate.Config.TRANSLATION_CACHE_SIZE', 0)
+@patch('pipeline.translate.Config.GEMINI_API_KEY', 'test-key')
+@patch('pipeline.translate.Config.TRANSLATION_SPLIT_MIN_CHARS', 20)
+@patch('pipeline.translate.translate_with_huggingface_batch')
+@patch('pipeline.translate.request_gemini_translations')
+def test_translate_texts_splits_only_for_marian(mock_request, mock_batch):
+    """Test Gemini gets whole reviews and only its failures are split for Marian."""
+    mock_request.side_effect = lambda texts, langs: [None if 'tarde' in text else f"en:{text}" for text in texts]
+    mock_batch.side_effect = lambda texts, lang: [f"<{text}>" for text in texts]
+    
+    texts = ["Muy bueno. Llegó tarde.", "Está bien. No me gustó nada."]
+    result = translate_texts(texts, ['es', 'es'])
+    
+    assert mock_request.call_args[0] == (texts, ['es', 'es'])
+    assert mock_batch.call_args[0] == (["Muy bueno.", "Llegó tarde."], 'es')
+    assert result == ["<Muy bueno.> <Llegó tarde.>", "en:Está bien. No me gustó nada."]
+
+@patch('pipeline.translate.Config.GEMINI_API_KEY', '')
+@patch('pipeline.translate.Config.TRANSLATION_SPLIT_MIN_CHARS', 20)
+@patch('pipeline.translate.translate_with_huggingface_batch')
+def test_translate_text_splits_long_input(mock_batch):
+    """Test translate_text routes long input through the sentence splitter."""
+    mock_batch.side_effect = lambda texts, lang: [text.upper() for text in texts]
+    
+    assert translate_text("Sehr gut. Schnelle Lieferung!", 'de') == "SEHR GUT. SCHNELLE LIEFERUNG!"
+    assert mock_batch.call_args[0] == (["Sehr gut.", "Schnelle Lieferung!"], 'de')
@@ -0,0 +1,107 @@
+import pytest
+from unittest.mock import patch
+from pipeline.triage import ascii_share, english_share, english_marker_count, triage_translation, triage_reviews, translate_triaged, get_triage_stats
+
+@pytest.fixture(autouse=True)
+def healthy_breakers():
+    """Start every test with no translation backend marked as failing."""
+    with patch('pipeline.circuit.breakers', {}):
+        yield
+
+def test_ascii_share():
+    """Test ASCII share ignores whitespace."""
+    assert ascii_share("Good product") == 1.0
+    assert ascii_share("配送が遅い") == 0.0
+    assert ascii_share("") == 1.0
+
+def test_english_share():
+    """Test English function and sentiment words are counted."""
+    assert english_share("this is the best product") >= 0.6
+    assert english_share("este producto es muy bueno") == 0.0
+
+def test_english_marker_count():
+    """Test only distinct English function words are counted, not lexicon or shared words."""
+    assert english_marker_count("The box and the manual were fine") == 3
+    assert english_marker_count("Kein Problem") == 0
+    assert english_marker_count("Het is geweldig") == 0
+
+def test_english_is_not_translated():
+    """Test English reviews need no translation."""
+    decision = triage_translation("Great product", 'en', 0.99)
+    assert decision['action'] == 'none'
+
+def test_mislabeled_english_passes_through():
+    """Test ASCII text full of English words passes through despite the detected language."""
+    decision = triage_translation("The product is good and they were very quick", 'so', 0.99)
+    assert decision['action'] == 'passthrough'
+    assert decision['reason'] == 'english_words'
+    assert decision['detected_language'] == 'so'
+    
+    assert triage_translation("Good", 'so', 0.6)['reason'] == 'english_words'
+
+def test_confident_short_foreign_text_is_translated():
+    """Test confidently detected short reviews sharing words with English are still translated."""
+    for text, lang in [("Dit is slecht", 'nl'), ("Het is geweldig", 'nl'), ("Kein Problem", 'de'),
+                       ("Das ist ein Problem für mich", 'de'), ("Det er perfekt for oss", 'da')]:
+        decision = triage_translation(text, lang, 0.99)
+        assert decision['action'] == 'translate', text
+        assert decision['route'] == 'marian'
+
+def test_low_confidence_short_ascii_passes_through():
+    """Test short ASCII text the detector is unsure about passes through."""
+    decision = triage_translation("Super produit", 'ro', 0.57)
+    assert decision['action'] == 'passthrough'
+    assert decision['reason'] == 'low_confidence_ascii'
+
+def test_short_ascii_in_unknown_language_passes_through():
+    """Test short ASCII text tagged with a language without a known model passes through."""
+    assert triage_translation("Kiitos paljon", 'so', 0.99)['reason'] == 'unlikely_language'
+
+def test_confident_foreign_text_is_translated():
+    """Test confident non-English text is routed to a translation backend."""
+    decision = triage_translation("Este producto es increíble. Lo recomiendo mucho.", 'es', 0.99)
+    assert decision['action'] == 'translate'
+    assert decision['route'] == 'marian'
+
+    decision = triage_translation("这个产品质量很好", 'zh-cn', 0.99, gemini_ready=True)
+    assert decision['translation_lang'] == 'zh'
+    assert decision['route'] == 'gemini+marian'
+
+def test_failing_marian_model_is_skipped():
+    """Test languages whose Marian model keeps failing are skipped without Gemini."""
+    from pipeline.circuit import get_breaker
+    text = "O produto chegou rápido e funciona perfeitamente."
+    breaker = get_breaker('Helsinki-NLP/opus-mt-pt-en')
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    assert triage_translation(text, 'pt', 0.99)['action'] == 'skip'
+    assert triage_translation(text, 'pt', 0.99, gemini_ready=True)['route'] == 'gemini'
+
+@patch('pipeline.triage.Config.TRIAGE_ENABLED', False)
+def test_triage_disabled():
+    """Test every non-English review is translated when triage is off."""
+    decisions = triage_reviews(["Good", "Great"], [('so', 0.99), ('en', 0.99)])
+    assert [decision['action'] for decision in decisions] == ['translate', 'none']
+
+@patch('pipeline.triage.translate_texts')
+def test_translate_triaged(mock_translate):
+    """Test only reviews triaged for translation are sent, using the model language code."""
+    mock_translate.return_value = ["Very good product"]
+    texts = ["Good", "这个产品很好", "Great"]
+    decisions = triage_reviews(texts, [('so', 0.99), ('zh-cn', 0.99), ('en', 0.99)])
+
+    assert translate_triaged(texts, decisions) == [None, "Very good product", None]
+    mock_translate.assert_called_once_with(["这个产品很好"], ['zh'])
+
+def test_get_triage_stats():
+    """Test decisions are counted and avoided translations totalled."""
+    results = [
+        {'triage': {'action': 'passthrough'}},
+        {'triage': {'action': 'translate'}},
+        {'triage': {'action': 'skip'}},
+        {'triage': {'action': 'none'}},
+        {}
+    ]
+    stats = get_triage_stats(results)
+    assert stats == {'passthrough': 1, 'translate': 1, 'skip': 1, 'none': 1, 'translations_saved': 2}
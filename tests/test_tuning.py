@@ -0,0 +1,140 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import pipeline.tuning as tuning
+from config import Config
+
+def test_load_missing_profile(tmp_path):
+    """Test a missing profile is ignored."""
+    assert tuning.load_inference_profile(str(tmp_path / 'missing.json')) is None
+
+def test_apply_inference_profile(tmp_path, monkeypatch):
+    """Test the saved profile sets threads and batch sizes once."""
+    path = str(tmp_path / 'profile.json')
+    tuning.save_inference_profile({
+        'intra_op_threads': 2,
+        'inter_op_threads': 1,
+        'sentiment_batch_size': 8,
+        'translation_batch_size': 4
+    }, path)
+    monkeypatch.delenv('SENTIMENT_BATCH_SIZE', raising=False)
+    monkeypatch.delenv('TRANSLATION_BATCH_SIZE', raising=False)
+    monkeypatch.delenv('INTRA_OP_THREADS', raising=False)
+    monkeypatch.delenv('INTER_OP_THREADS', raising=False)
+    
+    with patch.object(tuning, 'profile_applied', False), \
+         patch.object(tuning, 'set_torch_threads') as mock_threads, \
+         patch.object(Config, 'SENTIMENT_BATCH_SIZE', 32), \
+         patch.object(Config, 'TRANSLATION_BATCH_SIZE', 16), \
+         patch.object(Config, 'INTRA_OP_THREADS', 0), \
+         patch.object(Config, 'INTER_OP_THREADS', 0):
+        tuning.apply_inference_profile(path)
+        tuning.apply_inference_profile(path)
+        
+        assert Config.SENTIMENT_BATCH_SIZE == 8
+        assert Config.TRANSLATION_BATCH_SIZE == 4
+        mock_threads.assert_called_once_with(2, 1)
+
+def test_environment_overrides_profile(tmp_path, monkeypatch):
+    """Test batch sizes set in the environment win over the profile."""
+    path = str(tmp_path / 'profile.json')
+    tuning.save_inference_profile({'sentiment_batch_size': 8}, path)
+    monkeypatch.setenv('SENTIMENT_BATCH_SIZE', '64')
+    
+    with patch.object(tuning, 'profile_applied', False), \
+         patch.object(tuning, 'set_torch_threads'), \
+         patch.object(Config, 'SENTIMENT_BATCH_SIZE', 64):
+        tuning.apply_inference_profile(path)
+        assert Config.SENTIMENT_BATCH_SIZE == 64
+
+def test_environment_overrides_profile_threads(tmp_path, monkeypatch):
+    """Test thread counts set in the environment win over the profile."""
+    path = str(tmp_path / 'profile.json')
+    tuning.save_inference_profile({'intra_op_threads': 8, 'inter_op_threads': 4}, path)
+    monkeypatch.setenv('INTRA_OP_THREADS', '2')
+    monkeypatch.delenv('INTER_OP_THREADS', raising=False)
+    
+    with patch.object(tuning, 'profile_applied', False), \
+         patch.object(tuning, 'set_torch_threads') as mock_threads, \
+         patch.object(Config, 'INTRA_OP_THREADS', 2), \
+         patch.object(Config, 'INTER_OP_THREADS', 0):
+        tuning.apply_inference_profile(path)
+        mock_threads.assert_called_once_with(2, 4)
+
+def test_threads_applied_without_profile(tmp_path):
+    """Test configured thread counts reach torch when no profile has been saved."""
+    with patch.object(tuning, 'profile_applied', False), \
+         patch.object(tuning, 'set_torch_threads') as mock_threads, \
+         patch.object(Config, 'INTRA_OP_THREADS', 3), \
+         patch.object(Config, 'INTER_OP_THREADS', 0):
+        tuning.apply_inference_profile(str(tmp_path / 'missing.json'))
+        mock_threads.assert_called_once_with(3, 0)
+
+def test_run_trial_times_the_models(monkeypatch):
+    """Test every timed run reaches the translator instead of the translation memory."""
+    import pipeline.sentiment as sentiment
+    import pipeline.translate as translate
+    from pipeline.cache import TranslationMemory
+    translator = MagicMock(side_effect=lambda texts, **kwargs: [{'translation_text': text.upper()} for text in texts])
+    translator.tokenizer = None
+    for name in ('SENTIMENT_CACHE_SIZE', 'TRANSLATION_CACHE_SIZE'):
+        monkeypatch.setattr(Config, name, getattr(Config, name))
+    monkeypatch.setattr(translate, 'translation_memory', TranslationMemory())
+    monkeypatch.setattr(sentiment, 'sentiment_cache', None)
+    
+    with patch.object(tuning, 'profile_applied', False), \
+         patch.object(tuning, 'set_torch_threads'), \
+         patch('pipeline.sentiment.initialize_sentiment_analyzer'), \
+         patch('pipeline.sentiment.analyze_sentiment_batch'), \
+         patch('pipeline.translate.load_translator', return_value=translator):
+        timings = tuning.run_trial(0, 0, [1, 2], ['good'], {'es': ['hola', 'adiós']}, repeat=2)
+    
+    assert set(timings) == {1, 2}
+    # Warm-up plus two timed runs per batch size, each decoding both texts
+    decoded = [text for call in translator.call_args_list for text in call[0][0]]
+    assert len(decoded) == 2 * 3 * 2
+
+def test_benchmark_translation_profiles():
+    """Test both profiles are timed and their outputs compared."""
+    def make_translator(profile):
+        suffix = '' if profile == 'default' else ' !'
+        translator = MagicMock(side_effect=lambda texts, **kwargs: [
+            {'translation_text': text.upper() + (suffix if text == 'b' else '')} for text in texts
+        ])
+        translator.tokenizer = None
+        translator.model.state_dict.return_value = {}
+        return translator
+
+    with patch('pipeline.translate.load_translation_model', side_effect=lambda name, profile: make_translator(profile)):
+        report = tuning.benchmark_translation_profiles(['a', 'b', 'c', 'd'], 'es', batch_size=2, repeat=1)
+
+    assert report['texts'] == 4
+    assert report['default']['seconds'] >= 0
+    assert report['fast']['tokens_per_second'] is not None
+    assert report['agreement']['exact_match'] == 0.75
+    assert report['agreement']['word_similarity'] == pytest.approx(0.917, abs=0.001)
+
+def test_benchmark_language_detection():
+    """Test both detectors are timed and their labels compared."""
+    with patch('pipeline.detect.detect_language', side_effect=['es', 'fr', 'es']), \
+         patch('pipeline.detect.get_batch_detector'), \
+         patch('pipeline.detect.detect_languages_batch', return_value=['es', 'fr', 'it']):
+        report = tuning.benchmark_language_detection(['a', 'b', 'c'], repeat=1)
+
+    assert report['texts'] == 3
+    assert report['batch']['seconds'] >= 0
+    assert report['agreement']['overall'] == pytest.approx(0.667, abs=0.001)
+    assert report['agreement']['by_language']['es'] == {'texts': 2, 'agreement': 0.5}
+    assert report['agreement']['confusions'] == {'es->it': 1}
+
+def test_benchmark_parallel_detection():
+    """Test each pool size is warmed up, timed and compared with one worker."""
+    with patch('pipeline.detect_pool.detect_languages_parallel') as mock_detect, \
+         patch('pipeline.detect_pool.shutdown_detection_pool') as mock_shutdown:
+        report = tuning.benchmark_parallel_detection(['a'] * 10, [1, 2], chunk_size=4)
+
+    assert set(report['workers']) == {1, 2}
+    assert report['workers'][1]['scaling'] == 1.0
+    assert mock_detect.call_args_list[0][0] == (['a'] * 4, 1, 4)
+    assert mock_detect.call_args_list[3][0] == (['a'] * 10, 2, 4)
+    assert Config.DETECT_PARALLEL_MIN_TEXTS != 0
+    mock_shutdown.assert_called_once()
@@ -1,7 +1,29 @@
 import pandas as pd
+import csv
 import json
 import io
 
+CSV_COLUMNS = ['ID', 'Original_Text', 'Detected_Language', 'Translated_Text', 'Sentiment_Label', 'Confidence']
+
+def csv_row(result):
+    """
+    Map a result record to its CSV columns.
+    
+    Args:
+        result (dict): Sentiment analysis result
+        
+    Returns:
+        dict: Value per CSV column
+    """
+    return {
+        'ID': result['id'],
+        'Original_Text': result['original_text'],
+        'Detected_Language': result['detected_language'],
+        'Translated_Text': result.get('translated_text', ''),
+        'Sentiment_Label': result['sentiment_label'],
+        'Confidence': result['confidence']
+    }
+
 def export_to_csv(results):
     """
     Export results to CSV format.
@@ -13,16 +35,7 @@ def export_to_csv(results):
         bytes: CSV data as bytes
     """
     # Prepare data for CSV
-    csv_data = []
-    for result in results:
-        csv_data.append({
-            'ID': result['id'],
-            'Original_Text': result['original_text'],
-            'Detected_Language': result['detected_language'],
-            'Translated_Text': result.get('translated_text', ''),
-            'Sentiment_Label': result['sentiment_label'],
-            'Confidence': result['confidence']
-        })
+    csv_data = [csv_row(result) for result in results]
     
     # Create DataFrame and convert to CSV
     df = pd.DataFrame(csv_data)
@@ -49,4 +62,66 @@ def export_to_json(results):
         'results': results
     }
     
-    return json.dumps(export_data, indent=2, ensure_ascii=False).encode('utf-8')
\ No newline at end of file
+    return json.dumps(export_data, indent=2, ensure_ascii=False).encode('utf-8')
+
+class CsvStreamExporter:
+    """
+    Write results to a CSV file batch by batch, in the export_to_csv layout.
+    """
+    
+    def __init__(self, file):
+        """
+        Args:
+            file: Text file object opened for writing (newline='')
+        """
+        self.writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
+        self.writer.writeheader()
+        self.count = 0
+    
+    def write(self, results):
+        """
+        Append a batch of results.
+        
+        Args:
+            results (list): Sentiment analysis results
+        """
+        self.writer.writerows(csv_row(result) for result in results)
+        self.count += len(results)
+    
+    def close(self):
+        """Finish the export (nothing left to write for CSV)."""
+
+class JsonStreamExporter:
+    """
+    Write results to a JSON file batch by batch, in the export_to_json layout.
+    
+    The results array is written as results arrive; the metadata follows it
+    once the total is known.
+    """
+    
+    def __init__(self, file):
+        """
+        Args:
+            file: Text file object opened for writing
+        """
+        self.file = file
+        self.count = 0
+        self.file.write('{\n  "results": [')
+    
+    def write(self, results):
+        """
+        Append a batch of results.
+        
+        Args:
+            results (list): Sentiment analysis results
+        """
+        for result in results:
+            self.file.write(',\n    ' if self.count else '\n    ')
+            self.file.write(json.dumps(result, ensure_ascii=False))
+            self.count += 1
+    
+    def close(self):
+        """Close the results array and write the metadata."""
+        metadata = json.dumps({'total_reviews': self.count, 'export_format': 'json'})
+        self.file.write(f'\n  ],\n  "metadata": {metadata}\n}}\n')
+
@@ -94,4 +94,36 @@ def process_text_file(file):
     except Exception as e:
         logging.error(f"Text file processing failed: {e}")
     
-    return reviews
\ No newline at end of file
+    return reviews
+
+def iter_reviews_from_path(path, chunk_size=10000):
+    """
+    Read reviews from a CSV or text file without loading it all at once.
+    
+    Args:
+        path (str): Path to a .csv file (review column found as in
+            process_csv_file) or a text file with one review per line
+        chunk_size (int): CSV rows read at a time
+        
+    Yields:
+        str: Each non-empty review
+    """
+    if path.lower().endswith('.csv'):
+        review_column = None
+        for chunk in pd.read_csv(path, chunksize=chunk_size):
+            if review_column is None:
+                review_column = next(
+                    (col for col in chunk.columns
+                     if col.lower() in ['review', 'reviews', 'text', 'comment', 'feedback', 'content']),
+                    chunk.columns[0]
+                )
+            for review in chunk[review_column].dropna():
+                review = str(review).strip()
+                if review:
+                    yield review
+    else:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+